@@ -0,0 +1 @@
+"""Benchmarks of the test method generation, run as "python -m benchmarks.<name>"."""
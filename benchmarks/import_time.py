@@ -0,0 +1,74 @@
+"""Benchmark of the import time of the test modules with thousands of decorated methods.
+
+Run from the repository root as "python -m benchmarks.import_time".  The
+"--baseline" option measures the inspect module based introspection instead.
+"""
+
+
+import argparse
+import inspect
+import statistics
+import sys
+import time
+import types
+from unittest import mock
+
+
+def generate_source(classes, methods, values):
+    """Return the source of a test module with the given numbers of decorated methods."""
+    lines = ['import tcm', '']
+    for i in range(classes):
+        lines.append(f'class GeneratedTestCase{i}(tcm.TestCase):')
+        for j in range(methods):
+            lines.append(f'    @tcm.values(*range({values}))')
+            lines.append(f'    def test_{j}(self, value):')
+            lines.append('        pass')
+            lines.append('')
+    return '\n'.join(lines)
+
+
+def measure(source, repeat):
+    """Return the seconds it takes to execute the compiled module, one per repetition."""
+    code = compile(source, '<benchmark>', 'exec')
+    timings = []
+    for _ in range(repeat):
+        module = types.ModuleType('tcm_benchmark')
+        started = time.perf_counter()
+        exec(code, vars(module))  # pylint: disable=exec-used
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _inspect_has_single_test_param(func):
+    params = inspect.signature(func).parameters
+    if len(params) != 2:
+        return False
+    _, test_param = params.values()
+    return test_param.kind == test_param.POSITIONAL_OR_KEYWORD
+
+
+def main(argv=None):
+    """Print the import time statistics."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.import_time', description=__doc__)
+    parser.add_argument('--classes', type=int, default=10)
+    parser.add_argument('--methods', type=int, default=500)
+    parser.add_argument('--values', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    source = generate_source(args.classes, args.methods, args.values)
+    if args.baseline:
+        with mock.patch('tcm.metaclass.has_single_test_param', _inspect_has_single_test_param):
+            timings = measure(source, args.repeat)
+    else:
+        timings = measure(source, args.repeat)
+
+    decorated = args.classes * args.methods
+    print(f'{decorated} decorated methods, {decorated * args.values} test methods')
+    print(f'best {min(timings) * 1000:.1f} ms, median {statistics.median(timings) * 1000:.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
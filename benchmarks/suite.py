@@ -0,0 +1,173 @@
+"""Benchmark suite of the test method generation, writing machine-readable JSON results.
+
+Run from the repository root as "python -m benchmarks.suite [--output PATH]".
+Every result holds the benchmark name, its parameters and its measurements:
+
+- "class_creation": TestCaseMeta.__new__() seconds, peak and retained bytes,
+  as a function of the number of decorated methods and cases per method, with
+  and without the "fast" class keyword;
+- "wrapper_call": nanoseconds per call of the generated test method in each of
+  its forms ("as_is", "args", "kwargs") along with those of its "fast" copy and
+  of the direct call;
+- "end_to_end": seconds to load the tests through unittest.TestLoader and to run them.
+"""
+
+
+import argparse
+import functools
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+import types
+import unittest
+
+import tcm
+from tcm.fastpath import bound_copy
+from tcm.metaclass import _generate_test_method
+from .import_time import generate_source
+
+
+def _sample(self, value):  # pylint: disable=unused-argument
+    pass  # pragma: no cover
+
+
+def _make_mapping(methods, cases):
+    """Return the class namespace with freshly decorated copies of the sample method."""
+    mapping = {'__module__': __name__, '__qualname__': 'GeneratedTestCase'}
+    for i in range(methods):
+        name = f'test_{i}'
+        func = types.FunctionType(_sample.__code__, globals(), name)
+        mapping[name] = tcm.values(*range(cases))(func)
+    return mapping
+
+
+def bench_class_creation(methods, cases, repeat, fast=False):
+    """Return the measurements of the class creation out of the decorated methods."""
+    timings = []
+    for _ in range(repeat):
+        mapping = _make_mapping(methods, cases)
+        started = time.perf_counter()
+        tcm.TestCaseMeta('GeneratedTestCase', (unittest.TestCase,), mapping, fast=fast)
+        timings.append(time.perf_counter() - started)
+
+    mapping = _make_mapping(methods, cases)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        klass = tcm.TestCaseMeta('GeneratedTestCase', (unittest.TestCase,), mapping, fast=fast)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del klass
+    return {
+        'seconds': min(timings),
+        'peak_bytes': peak - before,
+        'retained_bytes': after - before,
+    }
+
+
+def bench_wrapper_call(number):
+    """Return the nanoseconds per call of the generated test methods and of the direct calls.
+
+    The overhead is that of the wrapper over the direct call.
+    """
+    def one(self, value):  # pylint: disable=unused-argument
+        pass
+
+    def two(self, x, y):  # pylint: disable=unused-argument
+        pass
+
+    forms = (
+        ('as_is', one, 1, True, functools.partial(one, None, 1)),
+        ('args', two, (1, 2), False, functools.partial(two, None, 1, 2)),
+        ('kwargs', two, {'x': 1, 'y': 2}, False, functools.partial(two, None, x=1, y=2)),
+    )
+    results = []
+    for form, func, arg, as_is, direct in forms:
+        wrapper = _generate_test_method(func, arg, as_is)
+        wrapped = min(timeit.repeat(functools.partial(wrapper, None), number=number, repeat=5))
+        copy = bound_copy(func, arg, as_is)
+        copied = min(timeit.repeat(functools.partial(copy, None), number=number, repeat=5))
+        baseline = min(timeit.repeat(direct, number=number, repeat=5))
+        results.append(({'form': form}, {
+            'wrapper_ns': wrapped / number * 1e9,
+            'fast_ns': copied / number * 1e9,
+            'direct_ns': baseline / number * 1e9,
+            'overhead_ns': (wrapped - baseline) / number * 1e9,
+        }))
+    return results
+
+
+def bench_end_to_end(classes, methods, cases, repeat):
+    """Return the measurements of loading the tests through unittest.TestLoader and running them."""
+    code = compile(generate_source(classes, methods, cases), '<benchmark>', 'exec')
+    load_timings = []
+    run_timings = []
+    for _ in range(repeat):
+        module = types.ModuleType('tcm_benchmark')
+        started = time.perf_counter()
+        exec(code, vars(module))  # pylint: disable=exec-used
+        suite = unittest.TestLoader().loadTestsFromModule(module)
+        load_timings.append(time.perf_counter() - started)
+
+        result = unittest.TestResult()
+        started = time.perf_counter()
+        suite.run(result)
+        run_timings.append(time.perf_counter() - started)
+        assert result.testsRun == classes * methods * cases and result.wasSuccessful()
+    return {'load_seconds': min(load_timings), 'run_seconds': min(run_timings)}
+
+
+def run_suite(quick=False):
+    """Return the results of all benchmarks, fewer and smaller ones if "quick" is set."""
+    repeat = 1 if quick else 5
+    sizes = ((10, 10), (100, 10)) if quick else (
+        (10, 10), (100, 10), (1000, 10), (100, 100), (10, 1000))
+    results = []
+    for methods, cases in sizes:
+        for fast in (False, True):
+            results.append(_result(
+                'class_creation', {'methods': methods, 'cases': cases, 'fast': fast},
+                bench_class_creation(methods, cases, repeat, fast)))
+    for params, measurements in bench_wrapper_call(1000 if quick else 1000000):
+        results.append(_result('wrapper_call', params, measurements))
+    for classes, methods, cases in ((1, 10, 10),) if quick else ((1, 10, 10), (10, 100, 10)):
+        results.append(_result(
+            'end_to_end', {'classes': classes, 'methods': methods, 'cases': cases},
+            bench_end_to_end(classes, methods, cases, repeat)))
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'tcm': tcm.__version__,
+        'results': results,
+    }
+
+
+def _result(name, params, measurements):
+    return {'name': name, 'params': params, 'measurements': measurements}
+
+
+def main(argv=None):
+    """Write the JSON results to the file or the standard output."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', metavar='PATH', help='write the results to the file')
+    parser.add_argument('--quick', action='store_true', help='run fewer and smaller benchmarks')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.quick)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
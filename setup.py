@@ -77,5 +77,8 @@ setup(
     ],
     python_requires='>=3.6',
     packages=[PACKAGE_NAME],
+    extras_require={
+        'pytest': ['pytest>=8.2'],
+    },
     zip_safe=True,
 )
@@ -4,13 +4,58 @@
 __version__ = '2.0.0'
 
 
-import unittest
+import importlib
+import sys
 
+from .case import TestCase                  # noqa: F401
+from .combinations import nwise             # noqa: F401
+from .combinations import pairwise          # noqa: F401
+from .combinations import product           # noqa: F401
 from .decorator import DecoratorException   # noqa: F401
+from .decorator import options              # noqa: F401
 from .decorator import values               # noqa: F401
 from .metaclass import MetaclassException   # noqa: F401
-from .metaclass import TestCaseMeta
+from .metaclass import TestCaseMeta         # noqa: F401
+from .randomized import randomized          # noqa: F401
+from .sources import columns                # noqa: F401
+from .sources import IndexedSource          # noqa: F401
+from .sources import lazy                   # noqa: F401
+from .sources import Source                 # noqa: F401
+from .timeouts import TimeoutException      # noqa: F401
 
 
-class TestCase(unittest.TestCase, metaclass=TestCaseMeta):
-    """Base class to automatically employ the TestCaseMeta metaclass."""
+# The optional parts of the package along with their modules, imported upon first
+# use not to slow down the import of the package (by asyncio, multiprocessing, ...).
+_LAZY_NAMES = {
+    'AsyncTestCase': 'async_case',
+    'binary_file': 'files',
+    'csv_file': 'files',
+    'jsonl_file': 'files',
+    'ParallelSuite': 'runner',
+    'StreamingResult': 'reporting',
+}
+
+
+def __getattr__(name):
+    """Import the optional part of the package upon its first use."""
+    try:
+        module_name = _LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'") from None
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Lacking the module __getattr__() support, import the optional parts upfront.
+    from .files import binary_file          # noqa: F401
+    from .files import csv_file             # noqa: F401
+    from .files import jsonl_file           # noqa: F401
+    from .reporting import StreamingResult  # noqa: F401
+    from .runner import ParallelSuite       # noqa: F401
+    try:
+        from .async_case import AsyncTestCase  # noqa: F401
+    except ImportError:
+        # It requires unittest.IsolatedAsyncioTestCase of Python 3.8.
+        pass
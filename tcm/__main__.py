@@ -0,0 +1,9 @@
+"""Entry point running the tests in parallel: python -m tcm."""
+
+
+import sys
+
+from .runner import main
+
+
+sys.exit(main())
@@ -0,0 +1,11 @@
+"""This module provides the base class of the test cases with coroutine test methods."""
+
+
+import unittest
+
+from .case import TestCase
+
+
+if hasattr(unittest, 'IsolatedAsyncioTestCase'):  # pragma: no branch
+    class AsyncTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
+        """Base class to run the generated coroutine test methods on an event loop."""
@@ -0,0 +1,60 @@
+"""This module provides a batched run of a vectorized sample method over column slices."""
+
+
+import functools
+
+
+class BatchedFamily():
+    """Runner of a vectorized sample method over the chunks of the rows of a "columns" source.
+
+    The test method generated for a row calls the sample method with the column
+    slices of the chunk of "size" rows containing it, and remembers the outcomes of
+    the other rows of the chunk for their test methods.  The sample method returns
+    one outcome per row: None or a true value if the row passed, a false value or
+    a message if it failed, or an exception to be raised for the row.  An exception
+    raised by the sample method itself is reported for every row of the chunk.
+    """
+
+    def __init__(self, func, source, size):
+        """Start with no outcomes."""
+        self.func = func
+        self.source = source
+        self.size = size
+        self.__chunk = None
+
+    def method(self, index):
+        """Return the test method reporting the outcome of the row."""
+        family = self
+
+        def _batched(self):
+            family.run(self, index)
+
+        functools.update_wrapper(_batched, self.func)
+        return _batched
+
+    def run(self, test, index):
+        """Raise the failure of the row, running the sample method over its chunk if needed."""
+        start = index - index % self.size
+        klass = type(test)
+        if self.__chunk is None or self.__chunk[:2] != (klass, start) or \
+                index not in self.__chunk[2]:
+            self.__chunk = klass, start, self.__outcomes(test, start)
+        outcome = self.__chunk[2].pop(index)
+
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if isinstance(outcome, str):
+            raise test.failureException(outcome)
+        if outcome is not None and not outcome:
+            raise test.failureException(f'Row {self.source.name_at(index)} failed')
+
+    def __outcomes(self, test, start):
+        stop = min(start + self.size, len(self.source))
+        try:
+            outcomes = list(self.func(test, **self.source.slices(start, stop)))
+        except Exception as exc:  # pylint: disable=broad-except
+            outcomes = [exc] * (stop - start)
+        if len(outcomes) != stop - start:
+            error = ValueError(f'Expected {stop - start} outcomes, got {len(outcomes)}')
+            outcomes = [error] * (stop - start)
+        return dict(zip(range(start, stop), outcomes))
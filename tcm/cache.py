@@ -0,0 +1,136 @@
+"""This module provides an opt-in cache of the generated test methods which passed."""
+
+
+import atexit
+import functools
+import os
+import time
+
+from .fingerprint import case_fingerprint
+from .outcomes import listen
+
+
+CACHE_ENV_NAME = 'TCM_CACHE'
+CACHE_SIZE_ENV_NAME = 'TCM_CACHE_SIZE'
+CACHED_PASS = 'cached pass'
+
+
+class ResultCache():
+    """Size-bounded LRU store of the keys of the generated test methods which passed.
+
+    A key combines the fingerprints of the sample method and of the argument, so
+    changing either of them makes the test method run again.
+    """
+
+    def __init__(self, path, max_entries=100000):
+        """Remember the path of the database file, which may not exist yet."""
+        self.path = path
+        self.max_entries = max_entries
+        self.__connection = None
+        self.__pid = None
+        self.__added = 0
+
+    def __contains__(self, key):
+        """Return True if the key is stored, marking it as recently used."""
+        connection = self.__connect()
+        with connection:
+            cursor = connection.execute(
+                'UPDATE results SET used = ? WHERE key = ?', (time.time(), key))
+        return cursor.rowcount > 0
+
+    def add(self, key):
+        """Store the key, evicting the least recently used ones if there are too many."""
+        connection = self.__connect()
+        with connection:
+            connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?)', (key, time.time()))
+        self.__added += 1
+        if self.__added % 1000 == 0:
+            self.evict()
+
+    def evict(self):
+        """Delete the least recently used keys exceeding the size limit."""
+        connection = self.__connect()
+        with connection:
+            connection.execute(
+                'DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used DESC'
+                ' LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+    def close(self):
+        """Evict the excess keys and close the database."""
+        if self.__connection is not None and self.__pid == os.getpid():
+            self.evict()
+            self.__connection.close()
+        self.__connection = None
+
+    def instrument(self, method, class_name, func, arg):
+        """Return the test method marked as skipped if it passed before, recording it otherwise.
+
+        The class name is qualified by the module name.
+        """
+        if getattr(func, '__unittest_expecting_failure__', False):
+            return method
+        key = case_fingerprint(class_name, method.__name__, func, arg)
+        if key in self:
+            method.__unittest_skip__ = True
+            method.__unittest_skip_why__ = CACHED_PASS
+            return method
+        listen(method, functools.partial(self.record, key))
+        return method
+
+    def record(self, key, passed):
+        """Store the key of the test method if it passed."""
+        if passed:
+            self.add(key)
+
+    def __connect(self):
+        if self.__connection is None or self.__pid != os.getpid():
+            # Do not share the connection with the parent process.
+            self.__pid = os.getpid()
+            # Imported upon use, as the cache is opt-in.
+            import sqlite3  # pylint: disable=import-outside-toplevel
+            self.__connection = sqlite3.connect(self.path, timeout=60)
+            self.__connection.execute('PRAGMA journal_mode=WAL')
+            self.__connection.execute('PRAGMA synchronous=NORMAL')
+            self.__connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key BLOB PRIMARY KEY, used REAL NOT NULL) WITHOUT ROWID')
+        return self.__connection
+
+
+_CACHE = None
+
+
+def enable(path, max_entries=100000):
+    """Skip the test methods of the classes created from now on if they passed before.
+
+    Return the cache.
+    """
+    global _CACHE  # pylint: disable=global-statement
+    disable()
+    _CACHE = ResultCache(path, max_entries)
+    atexit.register(_CACHE.close)
+    return _CACHE
+
+
+def disable():
+    """Run the test methods of the classes created from now on unconditionally."""
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE is not None:
+        _CACHE.close()
+        atexit.unregister(_CACHE.close)
+    _CACHE = None
+
+
+def active_cache():
+    """Return the cache if enabled, None otherwise."""
+    return _CACHE
+
+
+def _enable_from_environment():
+    """Enable the cache if asked by the environment."""
+    path = os.environ.get(CACHE_ENV_NAME)
+    if path:
+        enable(os.path.abspath(path), int(os.environ.get(CACHE_SIZE_ENV_NAME) or 100000))
+
+
+_enable_from_environment()
@@ -0,0 +1,54 @@
+"""This module provides the base class of the test cases generating test methods."""
+
+
+import sys
+import unittest
+
+from .fixtures import enter_family
+from .metaclass import TestCaseMeta
+from .outcomes import run_notifying
+
+
+class TestCase(unittest.TestCase, metaclass=TestCaseMeta):
+    """Base class to automatically employ the TestCaseMeta metaclass."""
+
+    @classmethod
+    def setUpFamily(cls, family):  # noqa: N802 / pylint: disable=invalid-name
+        """Set up the fixture shared by the test methods generated from the sample method.
+
+        It is called with the name of the sample method before the first of them runs
+        (after the fixture of another family of the class, if any, is torn down).
+        """
+
+    @classmethod
+    def tearDownFamily(cls, family):  # noqa: N802 / pylint: disable=invalid-name
+        """Tear down the fixture shared by the test methods generated from the sample method.
+
+        It is called when a test method of another family is about to run, or along
+        with the class fixture.  In a worker process, that is at the end of a chunk.
+        """
+
+    def run(self, result=None):
+        """Run the test after setting up the fixture of its family, reporting its errors.
+
+        The outcome of the test is passed to the listeners of its test method.
+        """
+        try:
+            enter_family(self)
+        except Exception:  # pylint: disable=broad-except
+            if result is None:
+                result = self.defaultTestResult()
+            result.startTest(self)
+            result.addError(self, sys.exc_info())
+            result.stopTest(self)
+            return result
+        return run_notifying(self, result, super().run)
+
+    def __getattr__(self, name):
+        """Look up the test methods not yet generated in the deferred mode."""
+        try:
+            getattr(type(self), name)
+        except AttributeError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        return object.__getattribute__(self, name)
@@ -0,0 +1,202 @@
+"""This module provides the listing of the test ids without generating the test methods."""
+
+
+import contextlib
+import fnmatch
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import unittest
+
+from .durations import DURATIONS_ENV_NAME
+from .manifest import MANIFEST_ENV_NAME
+from .randomized import SEED_ENV_NAME
+from .shard import SHARD_ENV_NAME
+
+
+# The environment variables (and the files they point to) the selection depends on.
+_ENVIRONMENT_NAMES = (SHARD_ENV_NAME, SEED_ENV_NAME, MANIFEST_ENV_NAME, DURATIONS_ENV_NAME)
+_CACHE_VERSION = 1
+_COLLECTING = False
+
+
+class CollectionException(Exception):
+    """Exception raised when the tests to list cannot be found."""
+
+
+def collect(names=(), start_directory='.', pattern='test*.py', top_level_directory=None,
+            cache_path=None):
+    """Return the list of the ids of the tests in the named or discovered modules.
+
+    The tests are named like on the unittest command line: by the module, the class
+    or the test method names.  Absent the names, the modules are discovered the way
+    unittest does it (the load_tests protocol aside).  The test case classes are
+    created in the deferred mode, so only the names of the test methods are made
+    from the captured arguments, and no test method is generated.
+
+    With the cache path, the test ids are stored in the JSON file per module, and
+    the modules not modified since (nor the selection environment variables) are
+    not even imported.  The cache does not notice the changes of the other modules
+    or the data files the module reads.
+    """
+    cache = _CollectionCache(cache_path) if cache_path else None
+    if names:
+        targets = [(*_find_module(name), name) for name in names]
+    else:
+        start = os.path.abspath(start_directory)
+        top = os.path.abspath(top_level_directory or start_directory)
+        if top not in sys.path:
+            sys.path.insert(0, top)
+        targets = [(module_name, path, None) for module_name, path
+                   in _discover(start, pattern, top)]
+    test_ids = []
+    for module_name, path, name in targets:
+        module_ids = cache.get(module_name, path) if cache is not None else None
+        if module_ids is None:
+            module_ids = _module_test_ids(module_name)
+            if cache is not None:
+                cache.put(module_name, path, module_ids)
+        if name is not None and name != module_name:
+            module_ids = [test_id for test_id in module_ids
+                          if test_id == name or test_id.startswith(name + '.')]
+        test_ids.extend(module_ids)
+    if cache is not None:
+        cache.dump()
+    return test_ids
+
+
+@contextlib.contextmanager
+def collection_only():
+    """Create the test case classes in the deferred mode within the context."""
+    global _COLLECTING  # pylint: disable=global-statement
+    previous, _COLLECTING = _COLLECTING, True
+    try:
+        yield
+    finally:
+        _COLLECTING = previous
+
+
+def collecting():
+    """Return True if the test case classes are created just to list their tests."""
+    return _COLLECTING
+
+
+def _module_test_ids(module_name):
+    """Import the module to list the ids of the tests of its test case classes."""
+    with collection_only():
+        module = importlib.import_module(module_name)
+    loader = unittest.TestLoader()
+    test_ids = []
+    for name in dir(module):
+        obj = getattr(module, name)
+        if isinstance(obj, type) and issubclass(obj, unittest.TestCase):
+            class_id = f'{obj.__module__}.{obj.__qualname__}'
+            test_ids.extend(f'{class_id}.{method_name}'
+                            for method_name in _test_method_names(obj, loader.testMethodPrefix))
+    return test_ids
+
+
+def _test_method_names(cls, prefix):
+    """Return the sorted names of the test methods, looking up only the existing ones."""
+    names = []
+    for name in dir(cls):
+        if not name.startswith(prefix):
+            continue
+        try:
+            inspect.getattr_static(cls, name)
+        except AttributeError:
+            # A pending test method, listed by the metaclass but not generated yet.
+            names.append(name)
+        else:
+            if callable(getattr(cls, name)):
+                names.append(name)
+    return sorted(names)
+
+
+def _discover(directory, pattern, top):
+    """Iterate the names and the paths of the test modules in the directory, recursively."""
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            stem, extension = os.path.splitext(name)
+            if extension == '.py' and stem.isidentifier() and fnmatch.fnmatch(name, pattern):
+                relative = os.path.relpath(os.path.join(directory, stem), top)
+                yield relative.replace(os.sep, '.'), path
+        elif os.path.isfile(os.path.join(path, '__init__.py')):
+            yield from _discover(path, pattern, top)
+
+
+def _find_module(name):
+    """Return the name and the path of the module the test name starts with."""
+    parts = name.split('.')
+    for count in range(len(parts), 0, -1):
+        module_name = '.'.join(parts[:count])
+        try:
+            # Finding the spec imports the parent module (and creates its classes).
+            with collection_only():
+                spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is not None and spec.has_location:
+            return module_name, spec.origin
+    raise CollectionException(f'No module found for "{name}"')
+
+
+def _environment_key():
+    """Return the values of the selection environment variables along with their files."""
+    key = []
+    for env_name in _ENVIRONMENT_NAMES:
+        value = os.environ.get(env_name)
+        try:
+            mtime = os.stat(value).st_mtime_ns if value else None
+        except OSError:
+            mtime = None
+        key.append([value, mtime])
+    return key
+
+
+class _CollectionCache():
+    """JSON file of the test ids per module, valid while the module file stays the same."""
+
+    def __init__(self, path):
+        self.path = path
+        self.changed = False
+        self.__environment = _environment_key()
+        self.modules = {}
+        try:
+            with open(path, encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == _CACHE_VERSION:
+            self.modules = data.get('modules', {})
+
+    def get(self, module_name, path):
+        """Return the cached test ids of the module, None if they are missing or stale."""
+        entry = self.modules.get(module_name)
+        if entry is None or entry.get('key') != self.__key(path):
+            return None
+        return entry['ids']
+
+    def put(self, module_name, path, test_ids):
+        """Cache the test ids of the module."""
+        self.modules[module_name] = {'key': self.__key(path), 'ids': test_ids}
+        self.changed = True
+
+    def dump(self):
+        """Write the cache file if anything changed."""
+        if not self.changed:
+            return
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as cache_file:
+            json.dump({'version': _CACHE_VERSION, 'modules': self.modules}, cache_file)
+        os.replace(temporary, self.path)
+        self.changed = False
+
+    def __key(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        return [path, stat.st_mtime_ns, stat.st_size, self.__environment]
@@ -0,0 +1,175 @@
+"""This module provides the value sources combining the values of several named axes."""
+
+
+from collections import OrderedDict
+import itertools
+import re
+
+from .sources import IndexedSource
+
+
+class _Axes(IndexedSource):  # pylint: disable=abstract-method
+    """Base class for the sources of the combinations of the values of the named axes.
+
+    Every combination is a dict of the axis names to the values, named after the
+    1-based indexes of its values, e.g. "a1_b3", each index padded with leading
+    zeroes to the length of the number of the values on its axis.
+    """
+
+    def __init__(self, axes):
+        """Remember the values of every axis, raise ValueError if there are no axes."""
+        if not axes:
+            raise ValueError('At least one axis is required')
+        self.axes = OrderedDict((name, tuple(values)) for name, values in axes.items())
+        self.__widths = [len(str(len(values))) for values in self.axes.values()]
+        self.__pattern = re.compile('_'.join(
+            f'{re.escape(name)}(\\d{{{width}}})' for name, width in zip(self.axes, self.__widths)))
+
+    def _combination(self, indexes):
+        """Return the combination of the values by their 0-based indexes."""
+        return {name: values[index]
+                for (name, values), index in zip(self.axes.items(), indexes)}
+
+    def _name(self, indexes):
+        """Return the name of the combination of the values by their 0-based indexes."""
+        return '_'.join(f'{name}{str(index + 1).zfill(width)}'
+                        for name, index, width in zip(self.axes, indexes, self.__widths))
+
+    def _indexes(self, name):
+        """Return the 0-based indexes of the values by the name, raise KeyError if invalid."""
+        match = self.__pattern.fullmatch(name)
+        if match is None:
+            raise KeyError(name)
+        indexes = tuple(int(group) - 1 for group in match.groups())
+        if not all(0 <= index < len(values)
+                   for index, values in zip(indexes, self.axes.values())):
+            raise KeyError(name)
+        return indexes
+
+
+class product(_Axes):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of all combinations of the values of the named axes.
+
+    The combinations are ordered like itertools.product() would, and computed from
+    their indexes upon lookup rather than stored.
+    """
+
+    def __init__(self, **axes):
+        """Remember the values of every axis."""
+        super().__init__(axes)
+
+    def __len__(self):
+        """Return the number of the combinations."""
+        length = 1
+        for values in self.axes.values():
+            length *= len(values)
+        return length
+
+    def argument_at(self, index):
+        """Return the combination by its 0-based index."""
+        return self._combination(self.__indexes_at(index))
+
+    def name_at(self, index):
+        """Return the name of the combination by its 0-based index."""
+        return self._name(self.__indexes_at(index))
+
+    def index_of(self, name):
+        """Return the 0-based index of the named combination, raise KeyError if there is no such."""
+        index = 0
+        for i, values in zip(self._indexes(name), self.axes.values()):
+            index = index * len(values) + i
+        return index
+
+    def __indexes_at(self, index):
+        indexes = []
+        for values in reversed(self.axes.values()):
+            index, i = divmod(index, len(values))
+            indexes.append(i)
+        return indexes[::-1]
+
+
+class nwise(_Axes):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of the combinations covering every combination of the values of any "strength" axes.
+
+    The covering array is built greedily upon the first use: every combination
+    starts with the first uncovered tuple of values and picks the value covering
+    the most uncovered tuples on each of the other axes.  The build is
+    deterministic, so are the names.
+    """
+
+    def __init__(self, strength, **axes):
+        """Remember the strength and the values of every axis."""
+        super().__init__(axes)
+        if strength < 1:
+            raise ValueError(f'The strength must be positive, got {strength}')
+        self.strength = min(strength, len(self.axes))
+        self.__rows = None
+        self.__row_indexes = None
+
+    def __len__(self):
+        """Return the number of the combinations."""
+        return len(self.__covering_array())
+
+    def argument_at(self, index):
+        """Return the combination by its 0-based index."""
+        return self._combination(self.__covering_array()[index])
+
+    def name_at(self, index):
+        """Return the name of the combination by its 0-based index."""
+        return self._name(self.__covering_array()[index])
+
+    def index_of(self, name):
+        """Return the 0-based index of the named combination, raise KeyError if there is no such."""
+        self.__covering_array()
+        return self.__row_indexes[self._indexes(name)]
+
+    def __covering_array(self):
+        if self.__rows is None:
+            self.__rows = _covering_array([len(values) for values in self.axes.values()],
+                                          self.strength)
+            self.__row_indexes = {row: index for index, row in enumerate(self.__rows)}
+        return self.__rows
+
+
+def pairwise(**axes):
+    """Return the source of the combinations covering every pair of the values of any two axes."""
+    return nwise(2, **axes)
+
+
+def _covering_array(sizes, strength):
+    """Return the list of the rows of value indexes covering every "strength"-tuple of values.
+
+    A tuple is represented by the pairs of the axis and the value indexes.
+    """
+    if 0 in sizes:
+        return []
+    uncovered = set()
+    for axes in itertools.combinations(range(len(sizes)), strength):
+        for values in itertools.product(*(range(sizes[axis]) for axis in axes)):
+            uncovered.add(tuple(zip(axes, values)))
+
+    rows = []
+    while uncovered:
+        row = [None] * len(sizes)
+        for axis, value in min(uncovered):
+            row[axis] = value
+        for axis, size in enumerate(sizes):
+            if row[axis] is None:
+                row[axis] = max(range(size), key=lambda value, axis=axis: (
+                    _covered_count(row, axis, value, strength, uncovered), -value))
+        row = tuple(row)
+        for axes in itertools.combinations(range(len(sizes)), strength):
+            uncovered.discard(tuple((axis, row[axis]) for axis in axes))
+        rows.append(row)
+    return rows
+
+
+def _covered_count(row, axis, value, strength, uncovered):
+    """Return the number of the uncovered tuples the value would cover with the fixed axes."""
+    fixed = [other for other, other_value in enumerate(row) if other_value is not None]
+    count = 0
+    for others in itertools.combinations(fixed, strength - 1):
+        pairs = sorted([(other, row[other]) for other in others] + [(axis, value)])
+        if tuple(pairs) in uncovered:
+            count += 1
+    return count
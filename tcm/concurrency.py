@@ -0,0 +1,89 @@
+"""This module provides a concurrent run of the coroutine test methods of a family."""
+
+
+from collections import OrderedDict
+import functools
+import os
+import weakref
+
+from .introspection import test_method_of
+
+
+CONCURRENT_ATTR_NAME = 'tcm concurrent'
+
+# The test case instances created to run the concurrent test methods, by their ids.
+_SCHEDULED = weakref.WeakValueDictionary()
+if hasattr(os, 'register_at_fork'):  # pragma: no branch
+    # A forked worker process runs only the tests loaded there, not those of its parent.
+    os.register_at_fork(after_in_child=_SCHEDULED.clear)
+
+
+class ConcurrentFamily():
+    """Runner of the coroutine test methods generated from one sample method.
+
+    The first of them to run starts those scheduled to run (that is, those whose
+    test case instances exist, as created by the test loader) on its event loop, at
+    most "limit" at a time, and remembers their outcomes; the others just report
+    theirs.  All of them share the test case instance (and thus the fixtures) of the
+    first one.  Note that the test methods spread across several worker processes
+    run as a family in each of the latter.
+    """
+
+    def __init__(self, limit):
+        """Start with no test methods."""
+        self.limit = limit
+        self.__methods = OrderedDict()
+        self.__outcomes = {}
+
+    def wrap(self, method):
+        """Return the coroutine test method reporting its outcome from the family run."""
+        name = method.__name__
+        if not getattr(method, '__unittest_skip__', False):
+            self.__methods[name] = method
+        family = self
+
+        @functools.wraps(method)
+        async def _concurrent(self):
+            await family.run(self, name)
+
+        setattr(_concurrent, CONCURRENT_ATTR_NAME, True)
+        return _concurrent
+
+    async def run(self, test, name):
+        """Raise the exception the test method raised, running the family first if needed."""
+        # The event loop running the test has imported asyncio, which is slow to import.
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        klass = type(test)
+        if (klass, name) not in self.__outcomes:
+            semaphore = asyncio.Semaphore(self.limit)
+
+            async def _limited(method):
+                async with semaphore:
+                    await method(test)
+
+            names = self.__take_scheduled(klass, name)
+            outcomes = await asyncio.gather(
+                *(_limited(self.__methods[other]) for other in names), return_exceptions=True)
+            self.__outcomes.update(
+                ((klass, other), outcome) for other, outcome in zip(names, outcomes))
+
+        outcome = self.__outcomes.pop((klass, name), None)
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+    def __take_scheduled(self, klass, name):
+        """Return the names of the test methods of the class to run along with the named one."""
+        scheduled = set()
+        for key, test in list(_SCHEDULED.items()):
+            # pylint: disable=protected-access
+            if test.__class__ is klass and test._testMethodName in self.__methods:
+                scheduled.add(test._testMethodName)
+                del _SCHEDULED[key]
+        return [other for other in self.__methods if other == name or other in scheduled]
+
+
+def schedule(test):
+    """Register the test case instance if its test method belongs to a concurrent family."""
+    if hasattr(test_method_of(test), CONCURRENT_ATTR_NAME):
+        _SCHEDULED[id(test)] = test
@@ -3,8 +3,11 @@
 
 from collections import namedtuple
 
+from .sources import Source
+
 
 ATTR_NAME = 'tcm values'
+OPTIONS_ATTR_NAME = 'tcm options'
 TEST_METHOD_PREFIX = 'test'
 
 
@@ -20,6 +23,9 @@ class values():  # noqa: N801 / pylint: disable=invalid-name,too-few-public-meth
         if len(args) == 1 and callable(args[0]) and not kwargs:
             raise DecoratorException(
                 'Invalid use without parentheses or with a callable as the only argument')
+        if any(isinstance(arg, Source) for arg in (*args, *kwargs.values())):
+            if len(args) != 1 or kwargs:
+                raise DecoratorException('A value source must be the only argument')
         self.__captured_arguments = _CapturedArguments(args, kwargs)
 
     def __call__(self, func):
@@ -41,6 +47,57 @@ class values():  # noqa: N801 / pylint: disable=invalid-name,too-few-public-meth
         return func
 
 
+class options():  # noqa: N801 / pylint: disable=invalid-name,too-few-public-methods
+    """Parameterized decorator which stores the options of the generated test methods.
+
+    The "concurrency" option runs the test methods generated from a coroutine sample
+    method and loaded to run concurrently on a single event loop, at most that many
+    at a time.
+
+    The "batch" option makes the sample method consuming a "columns" source vectorized:
+    it gets the column slices of that many rows and returns one outcome per row.
+
+    The "fail_fast" option skips the rest of the generated test methods once that
+    many of them failed (TCM_FAIL_FAST environment variable sets it for all).
+
+    The "timeout" option makes every generated test method fail with
+    TimeoutException if it runs longer than that many seconds, and the
+    "case_timeouts" option overrides it for the cases named in the mapping.
+
+    The "budget" option skips the rest of the generated test methods once they
+    took that many seconds in total.
+    """
+
+    def __init__(self, **kwargs):
+        """Capture the options."""
+        try:
+            self.__options = _DEFAULT_OPTIONS._replace(**kwargs)
+        except ValueError:
+            unknown = ', '.join(sorted(set(kwargs) - set(_Options._fields)))
+            raise DecoratorException(f'Unknown option(s): {unknown}') from None
+        for name in ('concurrency', 'batch', 'fail_fast'):
+            value = getattr(self.__options, name)
+            if value is not None and not _is_positive_integer(value):
+                raise DecoratorException(f'The "{name}" option must be a positive integer')
+        for name in ('timeout', 'budget'):
+            value = getattr(self.__options, name)
+            if value is not None and not _is_positive_number(value):
+                raise DecoratorException(f'The "{name}" option must be a positive number')
+        case_timeouts = self.__options.case_timeouts
+        if case_timeouts is not None and not _is_mapping_to_positive_numbers(case_timeouts):
+            raise DecoratorException(
+                'The "case_timeouts" option must map the case names to positive numbers')
+
+    def __call__(self, func):
+        """Store the options in the decorated object."""
+        if not callable(func):
+            raise DecoratorException('The object must be callable')
+        if hasattr(func, OPTIONS_ATTR_NAME):
+            raise DecoratorException(f'The object already has the "{OPTIONS_ATTR_NAME}" attribute')
+        setattr(func, OPTIONS_ATTR_NAME, self.__options)
+        return func
+
+
 def extract_captured_arguments(func):
     """Raise AttributeError for non-decorated "func", return the captured arguments otherwise."""
     captured_arguments = getattr(func, ATTR_NAME)
@@ -51,4 +108,37 @@ def extract_captured_arguments(func):
     return captured_arguments
 
 
+def extract_options(func):
+    """Return the options stored in the decorated "func", the default options if none."""
+    stored = getattr(func, OPTIONS_ATTR_NAME, None)
+    if type(stored) is not _Options:  # pylint: disable=unidiomatic-typecheck
+        return _DEFAULT_OPTIONS
+    delattr(func, OPTIONS_ATTR_NAME)
+    return stored
+
+
+def get_source(captured_arguments):
+    """Return the value source if it was captured, None otherwise."""
+    args, kwargs = captured_arguments
+    if len(args) == 1 and not kwargs and isinstance(args[0], Source):
+        return args[0]
+    return None
+
+
 _CapturedArguments = namedtuple('CapturedArguments', 'args, kwargs')
+_Options = namedtuple(
+    'Options', 'concurrency, batch, fail_fast, timeout, case_timeouts, budget')
+_DEFAULT_OPTIONS = _Options(
+    concurrency=None, batch=None, fail_fast=None, timeout=None, case_timeouts=None, budget=None)
+
+
+def _is_positive_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _is_positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _is_mapping_to_positive_numbers(value):
+    return isinstance(value, dict) and all(map(_is_positive_number, value.values()))
@@ -0,0 +1,79 @@
+"""This module provides an on-disk database of the test durations."""
+
+
+import contextlib
+import os
+
+
+DURATIONS_ENV_NAME = 'TCM_DURATIONS'
+
+
+class Durations():
+    """Database of the test durations keyed by the qualified class and test method names.
+
+    SQLite takes care of the concurrent updates from several worker processes.
+    """
+
+    def __init__(self, path):
+        """Remember the path of the database file, which may not exist yet."""
+        self.path = path
+
+    def load(self):
+        """Return the mapping of the class/test method name pairs to their durations."""
+        if not os.path.exists(self.path):
+            return {}
+        with contextlib.closing(self.__connect()) as connection:
+            rows = connection.execute('SELECT class, name, seconds FROM durations')
+            return {(class_name, name): seconds for class_name, name, seconds in rows}
+
+    def update(self, durations):
+        """Store the class name/test method name/seconds triples.
+
+        The stored durations are averaged with the new ones to smooth out the noise.
+        """
+        # Update then insert in one transaction rather than upsert, which requires
+        # SQLite 3.24 or later.
+        with contextlib.closing(self.__connect()) as connection:
+            with connection:
+                for class_name, name, seconds in durations:
+                    connection.execute(
+                        'UPDATE durations SET seconds = (seconds + ?) / 2'
+                        ' WHERE class = ? AND name = ?', (seconds, class_name, name))
+                    connection.execute(
+                        'INSERT OR IGNORE INTO durations VALUES (?, ?, ?)',
+                        (class_name, name, seconds))
+
+    def __connect(self):
+        # Imported upon use, as the shards look only up the loaded durations.
+        import sqlite3  # pylint: disable=import-outside-toplevel
+        connection = sqlite3.connect(self.path, timeout=60)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS durations ('
+            'class TEXT NOT NULL, name TEXT NOT NULL, seconds REAL NOT NULL,'
+            ' PRIMARY KEY (class, name)) WITHOUT ROWID')
+        return connection
+
+
+def key_of(test):
+    """Return the class (qualified by the module) and test method names of the test."""
+    cls = type(test)
+    # pylint: disable=protected-access
+    return f'{cls.__module__}.{cls.__qualname__}', test._testMethodName
+
+
+_LOADED = {}
+
+
+def current_durations():
+    """Return the durations from the database specified by the environment variable.
+
+    Return None if the environment variable is not set.  The database is loaded
+    only once per process.
+    """
+    path = os.environ.get(DURATIONS_ENV_NAME)
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    if path not in _LOADED:
+        _LOADED[path] = Durations(path).load()
+    return _LOADED[path]
@@ -0,0 +1,98 @@
+"""This module provides a circuit breaker skipping the test methods of a failing family."""
+
+
+import contextlib
+import os
+import unittest
+import weakref
+
+from .introspection import test_method_of
+from .introspection import wrap_within
+
+
+FAIL_FAST_ENV_NAME = 'TCM_FAIL_FAST'
+FAMILY_ATTR_NAME = 'tcm family'
+
+
+class FamilyBreaker():
+    """Counter of the failed test methods of a family skipping the rest after the limit.
+
+    The breakers are registered by the family name (the qualified name of the sample
+    method) for the failures in the worker processes to be accounted for.
+    """
+
+    def __init__(self, family, limit):
+        """Start with no failures."""
+        self.family = family
+        self.limit = limit
+        self.failures = 0
+        _BREAKERS[family] = self
+
+    @property
+    def tripped(self):
+        """Return True if the family failed too many times."""
+        return self.failures >= self.limit
+
+    def guard(self, method):
+        """Return the test method skipped once the breaker trips, counting its failure."""
+        if getattr(method, '__unittest_expecting_failure__', False):
+            return method
+        guarded = wrap_within(method, self.counting)
+        setattr(guarded, FAMILY_ATTR_NAME, self.family)
+        return guarded
+
+    def check(self):
+        """Raise SkipTest if the breaker tripped."""
+        if self.tripped:
+            raise unittest.SkipTest(
+                f'{self.failures} test methods generated from "{self.family}" failed')
+
+    @contextlib.contextmanager
+    def counting(self, test):
+        """Raise SkipTest if the breaker tripped, count the failure within the context otherwise."""
+        self.check()
+        try:
+            yield
+        except unittest.SkipTest:
+            raise
+        except BaseException:
+            self.failures += 1
+            raise
+        # Failed subtests do not raise but spoil the outcome.
+        # pylint: disable=protected-access
+        if not getattr(getattr(test, '_outcome', None), 'success', True):
+            self.failures += 1
+
+
+_BREAKERS = weakref.WeakValueDictionary()
+
+
+def family_of(test):
+    """Return the family name of the test if its family has a breaker, None otherwise."""
+    return getattr(test_method_of(test), FAMILY_ATTR_NAME, None)
+
+
+def record_failure(family):
+    """Count the failure of a test method of the family (which failed in another process)."""
+    breaker = _BREAKERS.get(family)
+    if breaker is not None:
+        breaker.failures += 1
+
+
+def tripped_families():
+    """Return the list of the names of the families whose breakers tripped."""
+    return sorted(family for family, breaker in _BREAKERS.items() if breaker.tripped)
+
+
+def trip(families):
+    """Trip the breakers of the families (whose breakers tripped in another process)."""
+    for family in families:
+        breaker = _BREAKERS.get(family)
+        if breaker is not None:
+            breaker.failures = max(breaker.failures, breaker.limit)
+
+
+def current_limit():
+    """Return the failure limit of every family specified by the environment variable, if any."""
+    text = os.environ.get(FAIL_FAST_ENV_NAME)
+    return int(text) if text else None
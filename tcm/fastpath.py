@@ -0,0 +1,67 @@
+"""This module provides the test methods generated as copies of the sample methods."""
+
+
+import types
+
+from .introspection import CO_VARIADIC
+
+
+def bound_copy(func, arg, as_is):
+    """Return the copy of the sample method with the argument bound as its defaults.
+
+    Calling the copy costs the same as calling the sample method directly, with no
+    wrapper in between.  Return None if the argument does not fit the signature
+    (or the sample method is not a plain function), in which case a wrapper is to
+    report the mismatch when the test method runs.
+    """
+    if not isinstance(func, types.FunctionType) or hasattr(func, '__wrapped__'):
+        return None
+    code = func.__code__
+    if code.co_flags & CO_VARIADIC or code.co_argcount < 1:
+        return None
+
+    if as_is:
+        defaults, kwdefaults = (arg,), func.__kwdefaults__
+    elif isinstance(arg, (tuple, list)):
+        defaults, kwdefaults = _positional_defaults(func, arg), func.__kwdefaults__
+    elif isinstance(arg, dict):
+        defaults, kwdefaults = _keyword_defaults(func, arg)
+    else:
+        return None
+    if defaults is None or kwdefaults is None and code.co_kwonlyargcount:
+        return None
+
+    copy = types.FunctionType(code, func.__globals__, func.__name__, defaults, func.__closure__)
+    copy.__kwdefaults__ = kwdefaults
+    copy.__qualname__ = func.__qualname__
+    copy.__doc__ = func.__doc__
+    copy.__dict__.update(func.__dict__)
+    return copy
+
+
+def _positional_defaults(func, arg):
+    """Return the defaults of all parameters but the first one, None if they do not fit."""
+    count = func.__code__.co_argcount - 1
+    missing = count - len(arg)
+    own = func.__defaults__ or ()
+    if missing < 0 or missing > len(own):
+        return None
+    return tuple(arg) + own[len(own) - missing:]
+
+
+def _keyword_defaults(func, arg):
+    """Return the positional and keyword-only defaults taken from the mapping."""
+    code = func.__code__
+    if getattr(code, 'co_posonlyargcount', 0) > 1:
+        return None, None
+    names = code.co_varnames[1:code.co_argcount]
+    kwonly_names = code.co_varnames[code.co_argcount:code.co_argcount + code.co_kwonlyargcount]
+    if not set(arg) <= set(names) | set(kwonly_names):
+        return None, None
+
+    own = dict(zip(names[len(names) - len(func.__defaults__ or ()):], func.__defaults__ or ()))
+    own.update(func.__kwdefaults__ or {})
+    own.update(arg)
+    if not all(name in own for name in names + kwonly_names):
+        return None, None
+    return tuple(own[name] for name in names), {name: own[name] for name in kwonly_names}
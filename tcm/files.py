@@ -0,0 +1,215 @@
+"""This module provides the value sources reading the rows of memory-mapped files."""
+
+
+import abc
+from array import array
+import bisect
+import csv
+import json
+import mmap
+import struct
+
+from .sources import IndexedSource
+
+
+class _MappedFile(IndexedSource):
+    """Base class for the sources reading the rows of a read-only memory-mapped file.
+
+    Upon the first use, only the offsets of the rows (and their names if any) are
+    indexed, and every row is read from the mapping when its test method runs.
+    The read-only mapping shares the page cache, and thus the memory, with the
+    forked worker processes.
+    """
+
+    def __init__(self, path, key=None):
+        """Remember the path and the key naming the rows, if any, without reading the file."""
+        self.path = path
+        self.key = key
+        self.__mapping = None
+        self.__index = None
+        self.__key_indexes = None
+
+    def __len__(self):
+        """Return the number of the rows."""
+        return len(self._index()[0])
+
+    def argument_at(self, index):
+        """Return the row by its 0-based index."""
+        starts, ends, _ = self._index()
+        return self._parse(self._mapping()[starts[index]:ends[index]])
+
+    def name_at(self, index):
+        """Return the name of the row: its key if any, its padded line number otherwise."""
+        _, _, names = self._index()
+        if isinstance(names, list):
+            return names[index]
+        return str(names[index]).zfill(len(str(names[-1])))
+
+    def index_of(self, name):
+        """Return the 0-based index of the named row, raise KeyError if there is no such."""
+        _, _, names = self._index()
+        if isinstance(names, list):
+            return self.__key_indexes[name]
+        try:
+            number = int(name)
+        except ValueError:
+            raise KeyError(name) from None
+        index = bisect.bisect_left(names, number)
+        if index == len(names) or names[index] != number or self.name_at(index) != name:
+            raise KeyError(name)
+        return index
+
+    def _mapping(self):
+        """Return the read-only mapping of the file, or empty bytes for an empty file."""
+        if self.__mapping is None:
+            with open(self.path, 'rb') as file:
+                try:
+                    self.__mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # The file is empty.
+                    self.__mapping = b''
+        return self.__mapping
+
+    def _index(self):
+        """Return the arrays of the start and end offsets and the names (or line numbers)."""
+        if self.__index is None:
+            starts, ends, numbers = array('Q'), array('Q'), array('Q')
+            for start, end, number in self._records():
+                starts.append(start)
+                ends.append(end)
+                numbers.append(number)
+            names = numbers
+            if self.key is not None:
+                names = [self._key_of(self._parse(self._mapping()[start:end]))
+                         for start, end in zip(starts, ends)]
+                self.__key_indexes = {name: index for index, name in enumerate(names)}
+                if len(self.__key_indexes) != len(names):
+                    raise ValueError(f'Duplicate "{self.key}" keys in "{self.path}"')
+            self.__index = starts, ends, names
+        return self.__index
+
+    def _records(self):
+        """Iterate the start and end offsets and the line numbers of the non-empty lines."""
+        mapping = self._mapping()
+        size = len(mapping)
+        start = 0
+        number = 0
+        while start < size:
+            number += 1
+            end = mapping.find(b'\n', start)
+            if end < 0:
+                end = size
+            stop = end - 1 if end > start and mapping[end - 1] == ord('\r') else end
+            if stop > start:
+                yield start, stop, number
+            start = end + 1
+
+    def _key_of(self, row):
+        """Return the name of the row from its key."""
+        return str(row[self.key])
+
+    @abc.abstractmethod
+    def _parse(self, data):
+        """Return the row parsed from its bytes."""
+
+
+class jsonl_file(_MappedFile):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of the JSON values, one per line, of a file.
+
+    The rows are named by their line numbers, or by the values of the "key" field.
+    """
+
+    def _parse(self, data):
+        """Return the JSON value."""
+        return json.loads(data)
+
+
+class csv_file(_MappedFile):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of the CSV records, one per line, of a file.
+
+    With "header" set, the first line holds the field names and the rows are dicts,
+    otherwise they are lists.  The rows are named by their line numbers, or by the
+    values of the "key" field (or column index).  The values are strings.
+    """
+
+    def __init__(self, path, key=None, header=True, encoding='utf-8', **fmtparams):
+        """Remember the path and the CSV settings without reading the file."""
+        super().__init__(path, key)
+        self.header = header
+        self.encoding = encoding
+        self.fmtparams = fmtparams
+        self.__fieldnames = None
+
+    def _records(self):
+        """Iterate the records past the header line, if any."""
+        records = super()._records()
+        if self.header:
+            for start, end, _ in records:
+                self.__fieldnames = self.__split(self._mapping()[start:end])
+                break
+        return records
+
+    def _parse(self, data):
+        """Return the record as a dict if there is a header, as a list otherwise."""
+        values = self.__split(data)
+        if self.__fieldnames is None:
+            return values
+        return dict(zip(self.__fieldnames, values))
+
+    def __split(self, data):
+        return next(csv.reader([data.decode(self.encoding)], **self.fmtparams))
+
+
+class binary_file(_MappedFile):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of the fixed-width records of a file, described by a struct format.
+
+    The records start at "offset" and are tuples, or dicts if the "fields" are named.
+    They are named by their padded 1-based numbers, or by the values of the "key"
+    field (or tuple index).  The offsets are computed, so only the keys are indexed.
+    """
+
+    def __init__(self, path, fmt, fields=None, key=None, offset=0):
+        """Remember the path and the record layout without reading the file."""
+        super().__init__(path, key)
+        self.struct = struct.Struct(fmt)
+        self.fields = fields
+        self.offset = offset
+
+    def __len__(self):
+        """Return the number of the records."""
+        size = len(self._mapping()) - self.offset
+        if size % self.struct.size:
+            raise ValueError(
+                f'The size of "{self.path}" past the offset is not a multiple of'
+                f' {self.struct.size} bytes')
+        return max(size, 0) // self.struct.size
+
+    def argument_at(self, index):
+        """Return the record by its 0-based index."""
+        start = self.offset + index * self.struct.size
+        return self._parse(self._mapping()[start:start + self.struct.size])
+
+    def name_at(self, index):
+        """Return the name of the record: its key if any, its padded number otherwise."""
+        if self.key is None:
+            return IndexedSource.name_at(self, index)
+        return super().name_at(index)
+
+    def index_of(self, name):
+        """Return the 0-based index of the named record, raise KeyError if there is no such."""
+        if self.key is None:
+            return IndexedSource.index_of(self, name)
+        return super().index_of(name)
+
+    def _records(self):
+        """Iterate the offsets and the 1-based numbers of the records (to index their keys)."""
+        for index in range(len(self)):
+            start = self.offset + index * self.struct.size
+            yield start, start + self.struct.size, index + 1
+
+    def _parse(self, data):
+        """Return the record as a dict if the fields are named, as a tuple otherwise."""
+        values = self.struct.unpack(data)
+        if self.fields is None:
+            return values
+        return dict(zip(self.fields, values))
@@ -0,0 +1,84 @@
+"""This module provides content fingerprints of the sample methods and their arguments."""
+
+
+import hashlib
+import pickle
+import weakref
+
+
+DIGEST_SIZE = 16
+
+
+def function_fingerprint(func):
+    """Return the digest of the code, the default values, and the closure of the function.
+
+    The digest is computed once per function object.  The globals the function looks
+    up (such as the functions it calls) are not taken into account.
+    """
+    try:
+        return _FUNCTION_FINGERPRINTS[func]
+    except KeyError:
+        pass
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    _update_with_code(digest, func.__code__)
+    digest.update(_dumps(func.__defaults__))
+    digest.update(_dumps(func.__kwdefaults__))
+    for cell in func.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            # The cell is empty.
+            contents = None
+        digest.update(_dumps(contents))
+    _FUNCTION_FINGERPRINTS[func] = fingerprint = digest.digest()
+    return fingerprint
+
+
+def value_fingerprint(value):
+    """Return the digest of the pickled (or, failing that, represented) value."""
+    return hashlib.blake2b(_dumps(value), digest_size=DIGEST_SIZE).digest()
+
+
+def combined_fingerprint(*parts):
+    """Return the digest of the strings and the byte strings."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(4, 'little'))
+        digest.update(part)
+    return digest.digest()
+
+
+def case_fingerprint(class_name, name, func, arg):
+    """Return the digest identifying the generated test method along with its content.
+
+    The class name is qualified by the module name, so the test methods of the
+    same-named classes differ even if their sample methods (resolving the globals
+    of their own modules) do not.
+    """
+    return combined_fingerprint(
+        class_name, name, function_fingerprint(func), value_fingerprint(arg))
+
+
+_FUNCTION_FINGERPRINTS = weakref.WeakKeyDictionary()
+
+
+def _update_with_code(digest, code):
+    """Update the digest with the code object, excluding the line numbers."""
+    digest.update(code.co_code)
+    digest.update(repr((code.co_names, code.co_varnames, code.co_argcount)).encode('utf-8'))
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            _update_with_code(digest, const)
+        else:
+            digest.update(_dumps(const))
+
+
+def _dumps(value):
+    try:
+        return pickle.dumps(value, protocol=4)
+    except Exception:  # pylint: disable=broad-except
+        # Note: the default repr() is unique per object, which makes the digest
+        # differ from run to run, erring on the safe side.
+        return repr(value).encode('utf-8', 'backslashreplace')
@@ -0,0 +1,68 @@
+"""This module provides the fixtures shared by the test methods generated from a sample method."""
+
+
+import atexit
+from collections import namedtuple
+
+from .introspection import test_method_of
+from .metaclass import SAMPLE_ATTR_NAME
+
+
+FAMILY_STATE_ATTR_NAME = 'tcm family state'
+
+
+def family_of(test):
+    """Return the name of the sample method the test method was generated from, if any."""
+    cls = type(test)
+    method = test_method_of(test)
+    if getattr(cls, '__unittest_skip__', False) or getattr(method, '__unittest_skip__', False):
+        # Do not set the fixture up for nothing.
+        return None
+    return getattr(method, SAMPLE_ATTR_NAME, None)
+
+
+def enter_family(test):
+    """Set up the fixture of the family of the test unless it is set up already.
+
+    The fixture of the previous family of the class is torn down first.  Once the
+    family fixture fails to set up, the same exception is raised for the rest of
+    the family.
+    """
+    family = family_of(test)
+    if family is None:
+        return
+    cls = type(test)
+    current = vars(cls).get(FAMILY_STATE_ATTR_NAME)
+    if current is not None and current.family == family:
+        if current.error is not None:
+            raise current.error
+        return
+
+    if current is None:
+        # Tear the last fixture down along with the class fixture.
+        add_class_cleanup = getattr(cls, 'addClassCleanup', None)
+        if add_class_cleanup is not None:
+            add_class_cleanup(leave_family, cls)
+        else:  # pragma: no cover
+            atexit.register(leave_family, cls)
+    else:
+        leave_family(cls)
+    try:
+        cls.setUpFamily(family)
+    except Exception as exc:
+        type.__setattr__(cls, FAMILY_STATE_ATTR_NAME, _FamilyState(family, exc))
+        raise
+    type.__setattr__(cls, FAMILY_STATE_ATTR_NAME, _FamilyState(family, None))
+
+
+def leave_family(cls):
+    """Tear down the fixture of the current family of the class, if any."""
+    current = vars(cls).get(FAMILY_STATE_ATTR_NAME)
+    if current is None:
+        return
+    type.__setattr__(cls, FAMILY_STATE_ATTR_NAME, None)
+    if current.error is None:
+        cls.tearDownFamily(current.family)
+
+
+_FamilyState = namedtuple('FamilyState', 'family, error')
@@ -0,0 +1,95 @@
+"""This module provides the introspection of the sample and the test methods."""
+
+
+import functools
+import inspect
+
+
+CO_VARIADIC = inspect.CO_VARARGS | inspect.CO_VARKEYWORDS  # pylint: disable=no-member
+
+
+def has_single_test_param(func):
+    """Return True if the function takes a single positional-or-keyword test parameter.
+
+    The first parameter (normally "self") does not count.
+    """
+    code = _plain_code(func)
+    if code is None:
+        return _has_single_test_param_by_signature(func)
+    return _code_has_single_test_param(code)
+
+
+def is_coroutine_function(func):
+    """Return True if the function is defined with "async def"."""
+    code = _plain_code(func)
+    if code is None:
+        return inspect.iscoroutinefunction(func)
+    return bool(code.co_flags & inspect.CO_COROUTINE)  # pylint: disable=no-member
+
+
+def test_method_of(test):
+    """Return the test method the test case instance runs, None if there is no such."""
+    # pylint: disable=protected-access
+    return getattr(type(test), getattr(test, '_testMethodName', ''), None)
+
+
+def wrap_within(method, context):
+    """Return the test method running within the context returned by context(test).
+
+    The test case instance is passed as "test".  A coroutine test method is wrapped
+    by a coroutine function.
+    """
+    if is_coroutine_function(method):
+        @functools.wraps(method)
+        async def _wrapped_coroutine(self):
+            with context(self):
+                return await method(self)
+
+        return _wrapped_coroutine
+
+    @functools.wraps(method)
+    def _wrapped(self):
+        with context(self):
+            return method(self)
+
+    return _wrapped
+
+
+def starting_line_number(func):
+    """Return the starting line number of the function (including its decorators)."""
+    code = _plain_code(inspect.unwrap(func))
+    if code is None:
+        _, start_line_number = inspect.getsourcelines(func)
+        return start_line_number
+    # Note: since Python 3.8, co_firstlineno is the line of the first decorator,
+    # same as inspect.getsourcelines() returns.
+    return code.co_firstlineno
+
+
+def _plain_code(func):
+    """Return the code object if it reflects the signature of the function, None otherwise."""
+    if not inspect.isfunction(func):
+        return None
+    if hasattr(func, '__wrapped__') or hasattr(func, '__signature__'):
+        # Let inspect.signature() follow the wrapped function.
+        return None
+    return func.__code__
+
+
+@functools.lru_cache(maxsize=None)
+def _code_has_single_test_param(code):
+    if code.co_flags & CO_VARIADIC:
+        return False
+    if code.co_argcount != 2 or code.co_kwonlyargcount:
+        return False
+    # The test parameter must not be positional-only.
+    return getattr(code, 'co_posonlyargcount', 0) < 2
+
+
+def _has_single_test_param_by_signature(func):
+    sig = inspect.signature(func)
+    params = sig.parameters
+    if len(params) != 2:
+        return False
+    _, test_param = params.values()
+    return test_param.kind == test_param.POSITIONAL_OR_KEYWORD
@@ -0,0 +1,121 @@
+"""This module provides an opt-in selection of the generated test methods affected by changes."""
+
+
+import atexit
+import functools
+import os
+
+from .fingerprint import DIGEST_SIZE
+from .outcomes import listen
+
+
+MANIFEST_ENV_NAME = 'TCM_MANIFEST'
+
+_MAGIC = b'TCMMANI1'
+
+
+class Manifest():
+    """Set of the fingerprints of the generated test methods which passed.
+
+    A fingerprint combines the class and the test method names with the digests of
+    the sample method and of the argument, so the test methods whose sample method
+    or argument changed, the new ones and the ones which did not pass are selected
+    to run.  The file holds the sorted fingerprints after a short header, 16 bytes
+    per test method.
+    """
+
+    def __init__(self, path):
+        """Remember the path of the file, which may not exist yet."""
+        self.path = path
+        self.passed = set()
+        self.failed = set()
+        self.__previous = None
+
+    def selects(self, key):
+        """Return True unless the test method passed before."""
+        return key not in self.__load()
+
+    def instrument(self, method, key):
+        """Return the test method made to record whether it passed."""
+        listen(method, functools.partial(self.record, key))
+        return method
+
+    def record(self, key, passed):
+        """Record whether the test method passed."""
+        if passed:
+            self.passed.add(key)
+        else:
+            self.failed.add(key)
+
+    def update(self, passed, failed):
+        """Merge the outcomes (of the test methods which ran in another process)."""
+        self.passed.update(passed)
+        self.passed.difference_update(failed)
+        self.failed.update(failed)
+
+    def flush(self):
+        """Return the passed and the failed fingerprints recorded so far, forgetting them."""
+        outcomes = self.passed, self.failed
+        self.passed, self.failed = set(), set()
+        return outcomes
+
+    def dump(self):
+        """Write the fingerprints which passed before or now, unless they failed now."""
+        keys = (self.__load() | self.passed) - self.failed
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(_MAGIC)
+            file.write(b''.join(sorted(keys)))
+        os.replace(temporary, self.path)
+
+    def __load(self):
+        if self.__previous is None:
+            try:
+                with open(self.path, 'rb') as file:
+                    data = file.read()
+            except FileNotFoundError:
+                data = b''
+            if not data.startswith(_MAGIC) or (len(data) - len(_MAGIC)) % DIGEST_SIZE:
+                # Select everything rather than trust a foreign or truncated file.
+                data = _MAGIC
+            self.__previous = frozenset(
+                data[i:i + DIGEST_SIZE] for i in range(len(_MAGIC), len(data), DIGEST_SIZE))
+        return self.__previous
+
+
+_MANIFEST = None
+
+
+def enable(path):
+    """Generate only the test methods affected by changes in the classes created from now on.
+
+    Return the manifest, which is written when the process exits.
+    """
+    global _MANIFEST  # pylint: disable=global-statement
+    disable()
+    _MANIFEST = Manifest(path)
+    atexit.register(_MANIFEST.dump)
+    return _MANIFEST
+
+
+def disable():
+    """Generate all test methods of the classes created from now on, not writing the manifest."""
+    global _MANIFEST  # pylint: disable=global-statement
+    if _MANIFEST is not None:
+        atexit.unregister(_MANIFEST.dump)
+    _MANIFEST = None
+
+
+def active_manifest():
+    """Return the manifest if enabled, None otherwise."""
+    return _MANIFEST
+
+
+def _enable_from_environment():
+    """Enable the manifest if asked by the environment."""
+    path = os.environ.get(MANIFEST_ENV_NAME)
+    if path:
+        enable(os.path.abspath(path))
+
+
+_enable_from_environment()
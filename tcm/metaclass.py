@@ -1,11 +1,44 @@
 """This module provides a metaclass for generating test methods at runtime."""
 
 
+from collections import namedtuple
 from collections import OrderedDict
+import contextlib
 import functools
-import inspect
 
+from .batch import BatchedFamily
+from .cache import active_cache
+from .collection import collecting
+from .concurrency import ConcurrentFamily
+from .concurrency import schedule
 from .decorator import extract_captured_arguments
+from .decorator import extract_options
+from .decorator import get_source
+from .durations import current_durations
+from .failfast import current_limit
+from .failfast import FamilyBreaker
+from .fastpath import bound_copy
+from .fingerprint import case_fingerprint
+from .introspection import has_single_test_param
+from .introspection import is_coroutine_function
+from .introspection import starting_line_number
+from .manifest import active_manifest
+from .profiling import active_profiler
+from .shard import balanced_selection
+from .shard import current_shard
+from .sources import columns
+from .sources import IndexedSource
+from .tables import intern_table
+from .tables import TableOwner
+from .timeouts import FamilyBudget
+from .timeouts import limit as limit_time
+
+
+PENDING_ATTR_NAME = 'tcm pending'
+TABLES_ATTR_NAME = 'tcm tables'
+SAMPLE_ATTR_NAME = 'tcm sample'
+SOURCE_ERROR_SUFFIX = 'source_error'
+_PENDING_HIDDEN = False
 
 
 class MetaclassException(Exception):
@@ -22,21 +55,130 @@ class TestCaseMeta(type):
         # mapping while prior versions would stick with a regular dict().
         return OrderedDict()
 
-    def __new__(cls, name, bases, mapping):
-        """Create the class after expanding the original mapping."""
+    def __new__(cls, name, bases, mapping, *,  # pylint: disable=too-many-arguments
+                deferred=False, fast=False, shared=False, **kwargs):
+        """Create the class after expanding the original mapping.
+
+        With "deferred" set, only the sample methods and their arguments are stored
+        in the class, and each test method is generated when it is first looked up.
+        Note that unittest.TestLoader.getTestCaseNames() looks up every name dir()
+        lists, so loading the tests of the class generates all of them.  All classes
+        are deferred while the tests are just being listed.
+
+        With "fast" set, the test methods are generated as copies of the sample
+        methods with the arguments bound as the parameter defaults, rather than as
+        wrappers, wherever the arguments fit the signatures.
+
+        With "shared" set, the argument tables of 16 cases or more whose items pickle
+        the same as those of another class with "shared" set are stored once, so the
+        classes get the same (possibly mutable) argument objects.  The tables holding
+        the same objects are stored once regardless.
+
+        If a shard is specified by the TCM_SHARD environment variable, only the test
+        methods which belong to the shard are generated.  The shards are balanced by
+        the durations from the database specified by TCM_DURATIONS, if any.
+        """
+        settings = _settings(mapping.get('__qualname__', name), mapping.get('__module__'),
+                             deferred or collecting(), fast, shared)
         new_mapping = dict()
-        for key, value in _expanded_mapping(mapping):
+        pending = OrderedDict()
+        for key, value in _expanded_mapping(mapping, pending, settings):
             if key in new_mapping:
-                existing = _get_starting_line_number(new_mapping[key])
-                current = _get_starting_line_number(value)
-                raise MetaclassException(
-                    f'Duplicate "{key}" attribute at lines {existing} and {current}')
+                _raise_duplicate(key, new_mapping[key], value)
             new_mapping[key] = value
-        return super().__new__(cls, name, bases, new_mapping)
+        _check_deferred_duplicates(new_mapping, pending)
+        if pending:
+            new_mapping[PENDING_ATTR_NAME] = pending
+        if settings.tables.keys:
+            # Keep the tables registered as long as the class lives.
+            new_mapping[TABLES_ATTR_NAME] = settings.tables
+        return super().__new__(cls, name, bases, new_mapping, **kwargs)
+
+    def __getattr__(cls, name):
+        """Generate the pending test method(s) which the missing attribute may belong to."""
+        for klass, pending in _pending_families(cls):
+            for key, family in list(pending.items()):
+                if not name.startswith(key + '_'):
+                    continue
+                if family.deferred:
+                    generated = family.find(name)
+                    if generated is not None:
+                        type.__setattr__(klass, name, generated)
+                        return generated
+                else:
+                    _expand_family(klass, family)
+                    del pending[key]
+                    if name in vars(klass):
+                        return getattr(cls, name)
+        raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'")
+
+    def __dir__(cls):
+        """List the attributes along with all pending test methods (unless they are hidden)."""
+        _expand_pending(cls)
+        names = set(super().__dir__())
+        if not _PENDING_HIDDEN:
+            names.update(name for name, _, _ in pending_test_methods(cls))
+        return sorted(names)
+
+    def __call__(cls, *args, **kwargs):
+        """Make sure the test method exists before creating an instance to run it.
+
+        The instance is scheduled with the concurrent family of the test method, if any.
+        """
+        _expand_pending(cls)
+        method_name = kwargs.get('methodName', args[0] if args else None)
+        if isinstance(method_name, str):
+            getattr(cls, method_name, None)
+        test = super().__call__(*args, **kwargs)
+        schedule(test)
+        return test
+
 
+def pending_test_methods(cls):
+    """Iterate the names of the test methods not generated yet along with their sample methods.
 
-def _expanded_mapping(mapping):
-    """Iterate the mapping while generating new test methods from decorated ones."""
+    Every name comes with the name of the sample method and the latter.  The deferred
+    families are not expanded, so no test method is generated.
+    """
+    for _, pending in _pending_families(cls):
+        for key, family in pending.items():
+            for name in family.names():
+                yield name, key, family.func
+
+
+@contextlib.contextmanager
+def pending_hidden():
+    """Leave the test methods not generated yet out of dir() of the classes within the context."""
+    global _PENDING_HIDDEN  # pylint: disable=global-statement
+    previous, _PENDING_HIDDEN = _PENDING_HIDDEN, True
+    try:
+        yield
+    finally:
+        _PENDING_HIDDEN = previous
+
+
+_Settings = namedtuple(
+    'Settings',
+    'class_name, qualified_name, deferred, fast, shared, shard, durations, fail_fast, tables')
+
+
+def _settings(class_name, module_name, deferred, fast, shared):
+    """Return the settings of the class along with those picked up from the environment."""
+    shard = current_shard()
+    qualified_name = f'{module_name}.{class_name}'
+    return _Settings(
+        class_name, qualified_name, deferred, fast, shared, shard,
+        current_durations() if shard is not None else None, current_limit(),
+        TableOwner(qualified_name))
+
+
+def _expanded_mapping(mapping, pending, settings):
+    """Iterate the mapping while generating new test methods from decorated ones.
+
+    The decorated test methods to be expanded later are moved to the "pending"
+    mapping instead: all at once upon the first use if they have a lazy value
+    source, or one at a time upon lookup in the "deferred" mode.
+    """
     for key, value in mapping.items():
         try:
             captured_arguments = extract_captured_arguments(value)
@@ -44,22 +186,306 @@ def _expanded_mapping(mapping):
             # Pass non-decorated items unchanged.
             yield key, value
         else:
-            # Use the decorated test method as a sample and generate a distinct
-            # test method for every captured argument.
-            as_is = _has_single_test_param(value)
-            for suffix, arg in _uniformly_named_arguments(captured_arguments):
-                generated = _generate_test_method(value, arg, as_is)
-                generated.__name__ = key + '_' + suffix
-                yield generated.__name__, generated
+            family = _Family(key, value, captured_arguments, extract_options(value), settings)
+            if settings.deferred or family.source is not None:
+                pending[key] = family
+            else:
+                yield from family.generated_methods()
+
+
+class _Family():  # pylint: disable=too-many-instance-attributes
+    """Decorated sample method along with the arguments and the options captured for it."""
+
+    def __init__(self, key, func, captured_arguments, options, settings):
+        self.key = key
+        self.func = func
+        self.options = options
+        self.settings = settings
+        if get_source(captured_arguments) is None:
+            # Share the arguments with the identical tables of the other classes.
+            captured_arguments = intern_table(
+                captured_arguments, settings.tables, settings.shared)
+        self.__captured_arguments = captured_arguments
+        self.__table = None
+        self.__error = None
+        self.__as_is = None
+        self.__selected = None
+        self.__concurrent = None
+        self.__batched = None
+        if options.concurrency is not None:
+            if not is_coroutine_function(func):
+                raise MetaclassException(
+                    f'The "concurrency" option of "{key}" requires a coroutine function')
+            self.__concurrent = ConcurrentFamily(options.concurrency)
+        if options.batch is not None:
+            if not isinstance(self.source, columns) or is_coroutine_function(func):
+                raise MetaclassException(
+                    f'The "batch" option of "{key}" requires a regular function'
+                    ' with a tcm.columns source')
+            self.__batched = BatchedFamily(func, self.source, options.batch)
+        family = f'{func.__module__}.{func.__qualname__}'
+        limit = options.fail_fast or settings.fail_fast
+        self.__breaker = None
+        if limit:
+            self.__breaker = FamilyBreaker(family, limit)
+        self.__budget = None
+        if options.budget is not None:
+            self.__budget = FamilyBudget(family, options.budget)
+        # The generated test methods copy the attributes of the sample method (which
+        # belongs to a single family, its captured arguments being extracted once).
+        setattr(func, SAMPLE_ATTR_NAME, key)
+        self.__manifest = None if self.__expecting_failure() else active_manifest()
+        self.__steps = self.__enabled_steps()
+
+    @property
+    def deferred(self):
+        """Return True if the test methods are to be generated one at a time."""
+        return self.settings.deferred
+
+    @property
+    def source(self):
+        """Return the lazy value source if any, None otherwise."""
+        return get_source(self.__captured_arguments)
+
+    def names(self):
+        """Iterate the names of the generated test methods."""
+        for suffix, _ in self.__named_arguments():
+            yield self.key + '_' + suffix
+        if self.__error is not None:
+            yield self.key + '_' + SOURCE_ERROR_SUFFIX
+
+    def generated_methods(self):
+        """Iterate the generated test methods along with their names.
+
+        If the value source raises, the test methods generated so far are followed
+        by one raising the same error when it runs.
+        """
+        for suffix, arg in self.__named_arguments():
+            generated = self.generate(suffix, arg)
+            yield generated.__name__, generated
+        if self.__error is not None:
+            yield self.key + '_' + SOURCE_ERROR_SUFFIX, self.__failed_test_method()
+
+    def find(self, name):
+        """Return the test method generated for the name, None if there is no such."""
+        suffix = name[len(self.key) + 1:]
+        try:
+            arg = self.__argument(suffix)
+        except KeyError:
+            if self.__error is not None and suffix == SOURCE_ERROR_SUFFIX:
+                return self.__failed_test_method()
+            return None
+        if not self.__selects(suffix) or not self.__changed(suffix, arg):
+            return None
+        return self.generate(suffix, arg)
+
+    def generate(self, suffix, arg):
+        """Return the test method generated for the named argument.
+
+        For an indexed source, the argument is its index, and the test method looks
+        the argument up only when it runs.
+        """
+        if self.__batched is not None:
+            generated = self.__batched.method(arg)
+        else:
+            if self.__as_is is None:
+                self.__as_is = has_single_test_param(self.func)
+            if isinstance(self.source, IndexedSource):
+                generated = self.source.wrap_test_method(
+                    _generate_indexed_test_method(self.func, self.source, arg, self.__as_is),
+                    arg, functools.partial(_run_test_method, self.func, self.__as_is))
+            else:
+                generated = None
+                if self.settings.fast:
+                    generated = bound_copy(self.func, arg, self.__as_is)
+                if generated is None:
+                    generated = _generate_test_method(self.func, arg, self.__as_is)
+        generated.__name__ = self.key + '_' + suffix
+        for step in self.__steps:
+            generated = step(generated, suffix, arg)
+        return generated
+
+    def __enabled_steps(self):
+        """Return the steps of the generation of every test method for the enabled features.
+
+        The features are resolved once per family, so the test methods of the
+        families using none of them are generated without further checks.
+        """
+        steps = []
+        if self.options.timeout is not None or self.options.case_timeouts:
+            steps.append(self.__limit_time)
+        cache = active_cache()
+        if cache is not None:
+            steps.append(functools.partial(self.__cached, cache))
+        if self.__manifest is not None:
+            steps.append(self.__recorded)
+        profiler = active_profiler()
+        if profiler is not None:
+            steps.append(_whole_method_step(
+                functools.partial(profiler.instrument, family=self.func.__qualname__)))
+        if self.__concurrent is not None:
+            steps.append(_whole_method_step(self.__concurrent.wrap))
+        for guard in (self.__budget, self.__breaker):
+            if guard is not None:
+                steps.append(_whole_method_step(guard.guard))
+        return steps
+
+    def __limit_time(self, generated, suffix, arg):  # pylint: disable=unused-argument
+        seconds = (self.options.case_timeouts or {}).get(suffix, self.options.timeout)
+        if seconds is None:
+            return generated
+        return limit_time(generated, seconds)
+
+    def __cached(self, cache, generated, suffix, arg):  # pylint: disable=unused-argument
+        return cache.instrument(
+            generated, self.settings.qualified_name, self.func, self.__case_argument(arg))
+
+    def __recorded(self, generated, suffix, arg):  # pylint: disable=unused-argument
+        return self.__manifest.instrument(generated, case_fingerprint(
+            self.settings.qualified_name, generated.__name__, self.func,
+            self.__case_argument(arg)))
+
+    def __case_argument(self, arg):
+        # For an indexed source, look the argument up by its index.
+        if isinstance(self.source, IndexedSource):
+            return self.source.argument_at(arg)
+        return arg
+
+    def __named_arguments(self):
+        # Skip the arguments of other shards (and the unchanged ones which passed)
+        # before any test method is generated.
+        return ((suffix, arg) for suffix, arg in self.__all_named_arguments()
+                if self.__selects(suffix) and self.__changed(suffix, arg))
+
+    def __all_named_arguments(self):
+        if self.source is None:
+            return _uniformly_named_arguments(self.__captured_arguments)
+        if isinstance(self.source, IndexedSource):
+            return self.__guarded(lambda: (
+                (self.source.name_at(index), index) for index in range(len(self.source))))
+        if not self.deferred and self.settings.durations is None:
+            return self.__guarded(self.source.named_arguments)
+        return self.__load_table().items()
+
+    def __load_table(self):
+        # Consume the lazy source only once, keeping just the arguments.
+        if self.__table is None:
+            self.__table = intern_table(
+                OrderedDict(self.__guarded(self.source.named_arguments)), self.settings.tables,
+                self.settings.shared)
+        return self.__table
+
+    def __guarded(self, named_arguments):
+        # Stop at the error of the source, leaving it to a failing test method
+        # rather than to whatever looks the test methods up.
+        self.__error = None
+        try:
+            yield from named_arguments()
+        except Exception as error:  # pylint: disable=broad-except
+            self.__error = error
+
+    def __failed_test_method(self):
+        error = self.__error
+
+        def _failed(self):  # pylint: disable=unused-argument
+            raise error
+
+        _failed.__name__ = self.key + '_' + SOURCE_ERROR_SUFFIX
+        setattr(_failed, SAMPLE_ATTR_NAME, self.key)
+        return _failed
+
+    def __selects(self, suffix):
+        shard = self.settings.shard
+        if shard is None:
+            return True
+        if self.settings.durations is None:
+            return shard.selects(self.settings.class_name, self.key + '_' + suffix)
+        if self.__selected is None:
+            names = [self.key + '_' + suffix for suffix, _ in self.__all_named_arguments()]
+            self.__selected = balanced_selection(
+                shard, self.settings.qualified_name, self.key, names, self.settings.durations)
+        return self.key + '_' + suffix in self.__selected
+
+    def __changed(self, suffix, arg):
+        if self.__manifest is None:
+            return True
+        return self.__manifest.selects(case_fingerprint(
+            self.settings.qualified_name, self.key + '_' + suffix, self.func,
+            self.__case_argument(arg)))
+
+    def __expecting_failure(self):
+        return getattr(self.func, '__unittest_expecting_failure__', False)
+
+    def __argument(self, suffix):
+        if isinstance(self.source, IndexedSource):
+            # Index the source first, noting its error if any.
+            tuple(self.__guarded(lambda: (len(self.source),)))
+            if self.__error is not None:
+                raise KeyError(suffix)
+            return self.source.index_of(suffix)
+        if self.source is not None:
+            return self.__load_table()[suffix]
+
+        args, kwargs = self.__captured_arguments
+        try:
+            index = int(suffix)
+        except ValueError:
+            pass
+        else:
+            # Accept only the names _uniformly_named_arguments() would produce.
+            width = len(str(len(args)))
+            if 0 < index <= len(args) and str(index).zfill(width) == suffix:
+                return args[index - 1]
+        return kwargs[suffix]
 
 
-def _has_single_test_param(func):
-    sig = inspect.signature(func)
-    params = sig.parameters
-    if len(params) != 2:
-        return False
-    _, test_param = params.values()
-    return test_param.kind == test_param.POSITIONAL_OR_KEYWORD
+def _pending_families(cls):
+    """Iterate the classes in the MRO having pending families along with the latter."""
+    for klass in cls.__mro__:
+        pending = vars(klass).get(PENDING_ATTR_NAME)
+        if pending:
+            yield klass, pending
+
+
+def _expand_pending(cls):
+    """Expand the pending families other than the deferred ones."""
+    for klass, pending in _pending_families(cls):
+        for key, family in list(pending.items()):
+            if not family.deferred:
+                _expand_family(klass, family)
+                del pending[key]
+
+
+def _expand_family(klass, family):
+    """Stream the generated test methods into the class one at a time."""
+    for generated_name, generated in family.generated_methods():
+        if generated_name in vars(klass):
+            _raise_duplicate(generated_name, vars(klass)[generated_name], generated)
+        type.__setattr__(klass, generated_name, generated)
+
+
+def _check_deferred_duplicates(mapping, pending):
+    """Raise if a deferred test method with a captured table clashes with another attribute.
+
+    That is, either with an attribute of the class, or with a deferred test method
+    of another family.  Only the families whose key (followed by an underscore)
+    starts the key of another family may clash, so only their names are listed.
+    """
+    families = [family for family in pending.values() if family.source is None]
+    for family in families:
+        prefix = family.key + '_'
+        for key, value in mapping.items():
+            if key.startswith(prefix):
+                generated = family.find(key)
+                if generated is not None:
+                    _raise_duplicate(key, generated, value)
+        for other in families:
+            if not other.key.startswith(prefix):
+                continue
+            for name in other.names():
+                if family.find(name) is not None:
+                    _raise_duplicate(
+                        name, *sorted((family.func, other.func), key=starting_line_number))
 
 
 def _uniformly_named_arguments(captured_arguments):
@@ -77,8 +503,19 @@ def _uniformly_named_arguments(captured_arguments):
     yield from kwargs.items()
 
 
+def _whole_method_step(wrap):
+    """Adapt the wrapper of a test method to a step of the generation."""
+    def _step(generated, suffix, arg):  # pylint: disable=unused-argument
+        return wrap(generated)
+
+    return _step
+
+
 def _generate_test_method(func, arg, as_is):
     """Wrap the original test method by supplying the (possibly unpacked) "arg"."""
+    if is_coroutine_function(func):
+        return _generate_coroutine_test_method(func, arg, as_is)
+
     if as_is:
         def _wrapper(self):
             return func(self, arg)
@@ -96,7 +533,46 @@ def _generate_test_method(func, arg, as_is):
     return _wrapper
 
 
-def _get_starting_line_number(func):
-    """Return the starting line number of the test method definition."""
-    _, start_line_number = inspect.getsourcelines(func)
-    return start_line_number
+def _generate_indexed_test_method(func, source, index, as_is):
+    """Wrap the original test method by supplying the argument looked up when it runs."""
+    if is_coroutine_function(func):
+        async def _wrapper(self):
+            return await _generate_test_method(func, source.argument_at(index), as_is)(self)
+    else:
+        def _wrapper(self):
+            return _generate_test_method(func, source.argument_at(index), as_is)(self)
+
+    functools.update_wrapper(_wrapper, func)
+
+    return _wrapper
+
+
+def _run_test_method(func, as_is, test, arg):
+    """Run the original test method with the (possibly unpacked) "arg"."""
+    return _generate_test_method(func, arg, as_is)(test)
+
+
+def _generate_coroutine_test_method(func, arg, as_is):
+    """Wrap the original coroutine test method by supplying the (possibly unpacked) "arg"."""
+    if as_is:
+        args, kwargs = (arg,), {}
+    elif isinstance(arg, (tuple, list)):
+        args, kwargs = arg, {}
+    elif isinstance(arg, dict):
+        args, kwargs = (), arg
+    else:
+        raise MetaclassException(f'Invalid test arg: {arg!r}')
+
+    async def _wrapper(self):
+        return await func(self, *args, **kwargs)
+
+    functools.update_wrapper(_wrapper, func)
+
+    return _wrapper
+
+
+def _raise_duplicate(key, existing, current):
+    """Raise the exception reporting where the duplicate attributes are defined."""
+    existing = starting_line_number(existing)
+    current = starting_line_number(current)
+    raise MetaclassException(f'Duplicate "{key}" attribute at lines {existing} and {current}')
@@ -0,0 +1,45 @@
+"""This module provides the listeners of the outcomes of the generated test methods."""
+
+
+from .introspection import test_method_of
+
+
+LISTENERS_ATTR_NAME = 'tcm outcome listeners'
+
+
+def listen(method, listener):
+    """Make the listener be called with True if the test method passes, False otherwise.
+
+    The listener is called once the test has completed, that is, after its tearDown()
+    and its cleanups, as the test result learns the outcome.
+    """
+    listeners = getattr(method, LISTENERS_ATTR_NAME, ())
+    setattr(method, LISTENERS_ATTR_NAME, listeners + (listener,))
+
+
+def run_notifying(test, result, run):
+    """Run the test by calling run(result), notifying the listeners of its test method."""
+    listeners = getattr(test_method_of(test), LISTENERS_ATTR_NAME, ())
+    if not listeners or result is None:
+        return run(result)
+    watched = _WatchedResult(result)
+    run(watched)
+    for listener in listeners:
+        listener(watched.passed)
+    return result
+
+
+class _WatchedResult():
+    """Test result proxy noting whether the test passed."""
+
+    def __init__(self, result):
+        self.passed = False
+        self.__result = result
+
+    def __getattr__(self, name):
+        return getattr(self.__result, name)
+
+    def addSuccess(self, test):  # noqa: N802 / pylint: disable=invalid-name
+        """Note the success, then report it."""
+        self.passed = True
+        self.__result.addSuccess(test)
@@ -0,0 +1,125 @@
+"""This module provides an opt-in instrumentation of the generated test methods."""
+
+
+import atexit
+from collections import namedtuple
+from collections import OrderedDict
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+
+from .introspection import wrap_within
+
+
+PROFILE_ENV_NAME = 'TCM_PROFILE'
+PROFILE_MEMORY_ENV_NAME = 'TCM_PROFILE_MEMORY'
+
+
+Record = namedtuple('Record', 'family, name, wall_time, cpu_time, peak_memory')
+
+
+class Profiler():
+    """Collector of the time (and memory) spent by every generated test method."""
+
+    def __init__(self):
+        """Start with no records."""
+        self.records = []
+
+    def instrument(self, method, family):
+        """Return the test method wrapped to record its measurements."""
+        name = method.__name__
+        return wrap_within(method, lambda _: _recording(self.records, family, name))
+
+    def slowest(self, count=10):
+        """Return the mapping of every sample method to its slowest generated test methods."""
+        families = OrderedDict()
+        for record in sorted(self.records, key=lambda record: -record.wall_time):
+            slowest = families.setdefault(record.family, [])
+            if len(slowest) < count:
+                slowest.append(record)
+        return families
+
+    def format_slowest(self, count=10):
+        """Return the text reporting the slowest generated test methods."""
+        lines = [f'Slowest {count} cases per sample method (wall/CPU seconds, peak bytes):']
+        for family, records in sorted(self.slowest(count).items()):
+            lines.append(f'{family}:')
+            for record in records:
+                peak_memory = '-' if record.peak_memory is None else record.peak_memory
+                lines.append(
+                    f'    {record.wall_time:.6f} {record.cpu_time:.6f} {peak_memory} {record.name}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Write the records to the file as CSV if its name ends with ".csv", as JSON otherwise."""
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            if path.endswith('.csv'):
+                import csv  # pylint: disable=import-outside-toplevel
+                writer = csv.writer(file)
+                writer.writerow(Record._fields)
+                writer.writerows(self.records)
+            else:
+                json.dump([record._asdict() for record in self.records], file, indent=1)
+
+
+@contextlib.contextmanager
+def _recording(records, family, name):
+    """Append the record of the time (and memory) spent within the context."""
+    tracing = tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak')
+    if tracing:
+        start_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    start_cpu = time.process_time()
+    start_wall = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall_time = time.perf_counter() - start_wall
+        cpu_time = time.process_time() - start_cpu
+        peak_memory = tracemalloc.get_traced_memory()[1] - start_memory if tracing else None
+        records.append(Record(family, name, wall_time, cpu_time, peak_memory))
+
+
+_PROFILER = None
+
+
+def enable(memory=False):
+    """Instrument the test methods of the classes created from now on, return the profiler.
+
+    With "memory" set, tracemalloc is started to record peak allocations as well.
+    """
+    global _PROFILER  # pylint: disable=global-statement
+    if _PROFILER is None:
+        _PROFILER = Profiler()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _PROFILER
+
+
+def disable():
+    """Generate non-instrumented test methods in the classes created from now on.
+
+    Return the profiler if any.
+    """
+    global _PROFILER  # pylint: disable=global-statement
+    profiler, _PROFILER = _PROFILER, None
+    return profiler
+
+
+def active_profiler():
+    """Return the profiler if enabled, None otherwise."""
+    return _PROFILER
+
+
+def _enable_from_environment():
+    """Enable the profiler writing the records upon exit if asked by the environment."""
+    path = os.environ.get(PROFILE_ENV_NAME)
+    if path:
+        profiler = enable(memory=bool(os.environ.get(PROFILE_MEMORY_ENV_NAME)))
+        # Note: the atexit handlers do not run in multiprocessing worker processes.
+        atexit.register(profiler.dump, os.path.abspath(path))
+
+
+_enable_from_environment()
@@ -0,0 +1,107 @@
+"""This module provides the pytest plugin collecting the generated test methods by family."""
+
+
+import inspect
+
+from _pytest.unittest import TestCaseFunction
+from _pytest.unittest import UnitTestCase
+import pytest
+
+from .collection import collection_only
+from .metaclass import pending_hidden
+from .metaclass import pending_test_methods
+from .metaclass import SAMPLE_ATTR_NAME
+from .metaclass import TestCaseMeta
+
+
+# The test case instance of an item has been created by this method since pytest 8.2.
+if not hasattr(TestCaseFunction, '_getinstance'):  # pragma: no cover
+    raise ImportError('tcm.pytest_plugin requires pytest 8.2 or higher')
+
+
+def pytest_configure(config):
+    """Register the marker grouping the test methods of a family (even without pytest-xdist)."""
+    config.addinivalue_line(
+        'markers', 'xdist_group(name): run the tests of the group in the same xdist worker')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Import the test modules creating the test case classes in the deferred mode."""
+    if isinstance(collector, pytest.Module):
+        with collection_only():
+            yield
+    else:
+        yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pycollect_makeitem(collector, name, obj):
+    """Collect the test case classes of tcm, leaving the other objects to pytest."""
+    if isinstance(obj, TestCaseMeta) and not inspect.isabstract(obj):
+        return FamilyTestCase.from_parent(collector, name=name, obj=obj)
+    return None
+
+
+class FamilyTestCase(UnitTestCase):
+    """Collector of a test case class listing its families as the parametrized test methods.
+
+    The test method generated from the "test_value" sample method for the "03" case
+    is collected as "test_value[03]", and marked to be run (along with the family
+    fixture) in the same worker as the rest of the family under the "--dist loadgroup"
+    option of pytest-xdist, unless the class has the "xdist_group" marker of its own.
+    The test methods not generated yet are left to be generated when they run.
+    """
+
+    def collect(self):
+        """Return the items of the plain test methods and of the generated ones."""
+        cls = self.obj
+        if not getattr(cls, '__test__', True):
+            return []
+        with pending_hidden():
+            items = list(super().collect())
+        cases = {}
+        for item in items[:]:
+            method = inspect.getattr_static(cls, item.name, None)
+            key = getattr(method, SAMPLE_ATTR_NAME, None)
+            if key is not None:
+                items.remove(item)
+                cases[item.name] = key, method
+        for method_name, key, func in pending_test_methods(cls):
+            cases[method_name] = key, func
+        items.extend(_family_case(self, method_name, key, func)
+                     for method_name, (key, func) in cases.items())
+        return sorted(items, key=lambda item: item.originalname)
+
+
+class FamilyCaseFunction(TestCaseFunction):
+    """Item of a generated test method named after its family and its case.
+
+    The item takes the markers and the keywords of the sample method, and the test
+    method is looked up (generated if need be) only when the item runs.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Create the item without the test case instance."""
+        super().__init__(*args, **kwargs)
+        # Unlike that of the sample method, the instance is created when the item runs.
+        del self._instance
+
+    def teardown(self):
+        """Forget the test case instance, if any."""
+        # The setup may fail before the instance is created.
+        vars(self).setdefault('_instance', None)
+        super().teardown()
+
+    def _getinstance(self):
+        return self.parent.obj(self.originalname)
+
+
+def _family_case(parent, method_name, key, func):
+    """Return the item of the test method generated from the sample method named by the key."""
+    item = FamilyCaseFunction.from_parent(
+        parent, name=f'{key}[{method_name[len(key) + 1:]}]', originalname=method_name,
+        callobj=func)
+    if item.get_closest_marker('xdist_group') is None:
+        item.add_marker(pytest.mark.xdist_group(name=f'{parent.nodeid}::{key}'))
+    return item
@@ -0,0 +1,161 @@
+"""This module provides the value source of the random arguments drawn from a strategy."""
+
+
+import functools
+import math
+import os
+import random
+import re
+import unittest
+
+from .introspection import is_coroutine_function
+from .sources import IndexedSource
+
+
+SEED_ENV_NAME = 'TCM_SEED'
+
+
+class randomized(IndexedSource):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of "count" random arguments, each drawn by the strategy from its own generator.
+
+    The strategy is called with a random.Random instance seeded by the seed and the
+    index of the argument, so any argument is drawn again alone, in any process.
+    The arguments are named after the seed and their 1-based indexes, e.g.
+    "seed7_03".  The seed defaults to the TCM_SEED environment variable, or 0.
+
+    With "shrink" set, the failing argument is minimized by trying the simpler
+    candidates in turn (up to "max_shrinks" runs of the sample method), and the
+    failure of the simplest one is reported as a subtest.  A callable "shrink"
+    returns the candidates simpler than its argument, in the order to try them;
+    True stands for the built-in one which simplifies numbers, strings, bytes,
+    lists, tuples and dicts.
+    """
+
+    def __init__(self, strategy, count, seed=None, shrink=False, max_shrinks=100):
+        """Remember the strategy without drawing any argument."""
+        if seed is None:
+            seed = int(os.environ.get(SEED_ENV_NAME) or 0)
+        self.strategy = strategy
+        self.count = count
+        self.seed = seed
+        self.shrink = _shrink_candidates if shrink is True else shrink or None
+        self.max_shrinks = max_shrinks
+        self.__pattern = re.compile(f'seed{seed}_(\\d{{{len(str(count))}}})')
+
+    def __len__(self):
+        """Return the number of the arguments."""
+        return self.count
+
+    def argument_at(self, index):
+        """Return the argument drawn for the 0-based index."""
+        return self.strategy(random.Random(f'{self.seed}/{index}'))
+
+    def name_at(self, index):
+        """Return the name made of the seed and the padded 1-based index."""
+        return f'seed{self.seed}_{super().name_at(index)}'
+
+    def index_of(self, name):
+        """Return the 0-based index of the named argument, raise KeyError if there is no such."""
+        match = self.__pattern.fullmatch(name)
+        if match is None:
+            raise KeyError(name)
+        return super().index_of(match.group(1))
+
+    def wrap_test_method(self, method, index, run):
+        """Return the test method shrinking the failing argument if asked to."""
+        if self.shrink is None or is_coroutine_function(method):
+            return method
+        source = self
+
+        @functools.wraps(method)
+        def _shrinking(self):
+            try:
+                return method(self)
+            except unittest.SkipTest:
+                raise
+            except Exception as exc:  # pylint: disable=broad-except
+                error = exc
+            # Shrink outside of the handler not to chain the exceptions.
+            argument = source.argument_at(index)
+            simplest = source.minimize(argument, functools.partial(_fails, run, self))
+            if simplest is not argument:
+                with self.subTest(shrunk=simplest):
+                    run(self, simplest)
+            raise error
+
+        return _shrinking
+
+    def minimize(self, argument, fails):
+        """Return the simplest argument found to fail, the argument itself if there is none."""
+        runs = 0
+        while runs < self.max_shrinks:
+            for candidate in self.shrink(argument):
+                runs += 1
+                if fails(candidate):
+                    argument = candidate
+                    break
+                if runs >= self.max_shrinks:
+                    break
+            else:
+                break
+        return argument
+
+
+def _fails(run, test, argument):
+    """Return True if the sample method fails with the argument."""
+    try:
+        run(test, argument)
+    except unittest.SkipTest:
+        return False
+    except Exception:  # pylint: disable=broad-except
+        return True
+    return False
+
+
+def _shrink_candidates(value):
+    """Iterate the values simpler than the value, the simplest first."""
+    if isinstance(value, (bool, int, float)):
+        yield from _shrink_number(value)
+    elif isinstance(value, (str, bytes, list, tuple)):
+        yield from _shrink_sequence(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            for candidate in _shrink_candidates(item):
+                yield {**value, key: candidate}
+
+
+def _shrink_number(value):
+    """Iterate the numbers closer to zero."""
+    if isinstance(value, bool):
+        if value:
+            yield False
+    elif isinstance(value, int):
+        # Bisect towards zero.
+        delta = value
+        while delta:
+            yield value - delta
+            delta = delta // 2 if delta > 0 else -(-delta // 2)
+    elif value:
+        yield 0.0
+        if math.isfinite(value):
+            if value != int(value):
+                yield float(int(value))
+            yield value / 2
+
+
+def _shrink_sequence(value):
+    """Iterate the shorter sequences, then the ones with a simpler item."""
+    length = len(value)
+    half = length // 2
+    # Remove all the items, either half, then every item in turn.
+    removed = [(0, length), (half, length), (0, half)]
+    removed.extend((i, i + 1) for i in range(length))
+    seen = set()
+    for start, stop in removed:
+        if start < stop and (start, stop) not in seen:
+            seen.add((start, stop))
+            yield value[:start] + value[stop:]
+    if isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            for candidate in _shrink_candidates(item):
+                yield value[:i] + type(value)([candidate]) + value[i + 1:]
@@ -0,0 +1,265 @@
+"""This module provides a test result streaming the outcomes with bounded memory."""
+
+
+from collections import Counter
+from collections import OrderedDict
+import hashlib
+import json
+import time
+import unittest
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+from .introspection import test_method_of
+from .metaclass import SAMPLE_ATTR_NAME
+
+
+class StreamingResult(unittest.TextTestResult):
+    """Text test result writing every outcome to a JSONL (or JUnit XML) file as it comes.
+
+    Instead of the lists of all the failures and the skipped tests, only their
+    counts are kept along with the first "kept" ones of each kind to print, the
+    outcome counts per sample method and the "top" most frequent failure
+    signatures (the exception type and the innermost frame).  The identical
+    tracebacks of a sample method are written in full only once, the later ones
+    referring to the first by its digest.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, stream, descriptions, verbosity, *,  # pylint: disable=too-many-arguments
+                 output=None, junit=False, top=10, kept=100, **kwargs):
+        """Write to the output file object (or nothing), keeping up to "kept" outcomes of a kind."""
+        super().__init__(stream, descriptions, verbosity, **kwargs)
+        self.output = output
+        self.junit = junit
+        self.top = top
+        self.errors = _Tally(kept)
+        self.failures = _Tally(kept)
+        self.skipped = _Tally(kept)
+        self.expectedFailures = _Tally(kept)
+        self.unexpectedSuccesses = _Tally(kept)
+        self.families = OrderedDict()
+        self.signatures = _TopCounter(top * 10)
+        self.__digests = OrderedDict()
+        self.__max_digests = kept * 100
+        self.__started = None
+
+    def startTestRun(self):  # noqa: N802
+        """Start the file."""
+        super().startTestRun()
+        if self.output is not None and self.junit:
+            self.output.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                              '<testsuites>\n<testsuite name="tcm">\n')
+
+    def stopTestRun(self):  # noqa: N802
+        """Finish the file with the summary."""
+        super().stopTestRun()
+        if self.output is None:
+            return
+        if self.junit:
+            self.output.write('</testsuite>\n</testsuites>\n')
+        else:
+            self.output.write(json.dumps({'summary': self.summary()}) + '\n')
+        self.output.flush()
+
+    def startTest(self, test):  # noqa: N802
+        """Start timing the test."""
+        super().startTest(test)
+        self.__started = time.perf_counter()
+
+    def addDuration(self, test, elapsed):  # noqa: N802 / pylint: disable=invalid-name
+        """Do not collect the durations, which the outcomes hold."""
+
+    def addSuccess(self, test):  # noqa: N802
+        """Write the success."""
+        super().addSuccess(test)
+        self.__write(test, 'success')
+
+    def addError(self, test, err):  # noqa: N802
+        """Write the error along with its traceback."""
+        super().addError(test, err)
+        self.__write(test, 'error', self.errors.last[1])
+
+    def addFailure(self, test, err):  # noqa: N802
+        """Write the failure along with its traceback."""
+        super().addFailure(test, err)
+        self.__write(test, 'failure', self.failures.last[1])
+
+    def addSkip(self, test, reason):  # noqa: N802
+        """Write the skip along with its reason."""
+        super().addSkip(test, reason)
+        self.__write(test, 'skipped', reason=reason)
+
+    def addExpectedFailure(self, test, err):  # noqa: N802
+        """Write the expected failure along with its traceback."""
+        super().addExpectedFailure(test, err)
+        self.__write(test, 'expected failure', self.expectedFailures.last[1])
+
+    def addUnexpectedSuccess(self, test):  # noqa: N802
+        """Write the unexpected success."""
+        super().addUnexpectedSuccess(test)
+        self.__write(test, 'unexpected success')
+
+    def addSubTest(self, test, subtest, err):  # noqa: N802
+        """Write the failed subtest along with its traceback."""
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            if issubclass(err[0], test.failureException):
+                self.__write(subtest, 'failure', self.failures.last[1], family_test=test)
+            else:
+                self.__write(subtest, 'error', self.errors.last[1], family_test=test)
+
+    def printErrors(self):  # noqa: N802
+        """Print the kept errors and failures followed by the summary of the failures."""
+        super().printErrors()
+        self.stream.write(self.format_summary())
+        self.stream.flush()
+
+    def summary(self):
+        """Return the dict of the outcome counts per sample method and the top signatures."""
+        signatures = self.signatures.most_common(self.top)
+        return {'families': self.families, 'signatures': [list(item) for item in signatures]}
+
+    def format_summary(self):
+        """Return the text listing the sample methods which failed and the top signatures."""
+        lines = []
+        for family, counts in self.families.items():
+            failed = counts['error'] + counts['failure']
+            if failed:
+                lines.append(f'{family}: {failed} of {sum(counts.values())} failed')
+        if lines:
+            lines.insert(0, 'Failures per sample method:')
+        signatures = self.signatures.most_common(self.top)
+        if signatures:
+            lines.append(f'Top {len(signatures)} failure signatures:')
+            lines.extend(f'{count:8} {signature}' for signature, count in signatures)
+        hidden = sum(tally.hidden for tally in (self.errors, self.failures))
+        if hidden:
+            lines.append(f'{hidden} errors and failures not shown')
+        return ''.join(line + '\n' for line in lines)
+
+    def __write(self, test, outcome, text=None, reason=None, family_test=None):
+        seconds = time.perf_counter() - self.__started if self.__started is not None else 0.0
+        family = _family_of(family_test or test)
+        if family is not None:
+            self.families.setdefault(family, Counter())[outcome] += 1
+        digest = duplicate = None
+        if text is not None:
+            digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+            duplicate = self.__seen(family, digest, test.id())
+            if outcome in ('error', 'failure'):
+                self.signatures.add(_signature(text))
+        if self.output is None:
+            return
+        if self.junit:
+            if duplicate is not None:
+                text = f'Same traceback as {duplicate}'
+            self.output.write(_junit_record(test, outcome, seconds, text, reason))
+            return
+        record = {'test': test.id(), 'family': family, 'outcome': outcome,
+                  'seconds': round(seconds, 6)}
+        if reason is not None:
+            record['reason'] = reason
+        if digest is not None:
+            record['digest'] = digest
+            if duplicate is None:
+                record['traceback'] = text
+        self.output.write(json.dumps(record) + '\n')
+
+    def __seen(self, family, digest, test_id):
+        """Return the id of the test which had the same traceback first, None if it is new."""
+        key = family, digest
+        first = self.__digests.get(key)
+        if first is not None:
+            self.__digests.move_to_end(key)
+            return first
+        self.__digests[key] = test_id
+        if len(self.__digests) > self.__max_digests:
+            self.__digests.popitem(last=False)
+        return None
+
+
+class _Tally():
+    """Append-only list standing for all the items appended but keeping the first ones."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.items = []
+        self.last = None
+        self.count = 0
+
+    @property
+    def hidden(self):
+        """Return the number of the items appended but not kept."""
+        return self.count - len(self.items)
+
+    def append(self, item):
+        """Count the item, keeping it if there is room."""
+        self.count += 1
+        self.last = item
+        if len(self.items) < self.limit:
+            self.items.append(item)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class _TopCounter():
+    """Counter of at most "capacity" keys approximating the most frequent ones.
+
+    A new key evicts the least frequent one and inherits its count (the
+    Space-Saving algorithm), so the frequent keys are never undercounted.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = Counter()
+
+    def add(self, key):
+        """Count the key."""
+        if key not in self.counts and len(self.counts) >= self.capacity:
+            evicted, count = min(self.counts.items(), key=lambda item: item[1])
+            del self.counts[evicted]
+            self.counts[key] = count
+        self.counts[key] += 1
+
+    def most_common(self, count):
+        """Return the list of the most frequent keys along with their counts."""
+        return self.counts.most_common(count)
+
+
+def _family_of(test):
+    """Return the qualified name of the sample method the test method was generated from."""
+    key = getattr(test_method_of(test), SAMPLE_ATTR_NAME, None)
+    return None if key is None else f'{type(test).__qualname__}.{key}'
+
+
+def _signature(text):
+    """Return the exception type and the innermost frame of the formatted traceback."""
+    lines = text.rstrip().splitlines()
+    frames = [line.strip() for line in lines if line.lstrip().startswith('File "')]
+    exceptions = [line for line in lines
+                  if line[:1].strip() and not line.startswith('Traceback')]
+    exception = exceptions[-1].split(':', 1)[0] if exceptions else ''
+    return f'{exception} ({frames[-1]})' if frames else exception
+
+
+def _junit_record(test, outcome, seconds, text, reason):
+    """Return the JUnit XML testcase element of the outcome."""
+    case = getattr(test, 'test_case', test)
+    class_name = case.id().rsplit('.', 1)[0]
+    name = test.id()[len(class_name) + 1:]
+    element = (f'<testcase classname={quoteattr(class_name)} name={quoteattr(name)}'
+               f' time="{seconds:.6f}"')
+    if outcome in ('error', 'failure'):
+        message = text.rstrip().splitlines()[-1] if text.strip() else ''
+        return (f'{element}>\n<{outcome} message={quoteattr(message)}>{escape(text)}'
+                f'</{outcome}>\n</testcase>\n')
+    if outcome == 'unexpected success':
+        return f'{element}>\n<failure message="unexpected success"/>\n</testcase>\n'
+    if outcome in ('skipped', 'expected failure'):
+        return f'{element}>\n<skipped message={quoteattr(reason or outcome)}/>\n</testcase>\n'
+    return element + '/>\n'
@@ -0,0 +1,621 @@
+"""This module provides a runner spreading the tests over a pool of worker processes."""
+
+
+import argparse
+import collections
+import contextlib
+import functools
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import sys
+import time
+import unittest
+
+from . import cache
+from . import collection
+from . import failfast
+from . import fixtures
+from . import manifest
+from . import profiling
+from . import timeouts
+from .durations import Durations
+from .durations import DURATIONS_ENV_NAME
+from .durations import key_of
+from .randomized import SEED_ENV_NAME
+from .reporting import StreamingResult
+from .shard import parse_shard
+from .shard import SHARD_ENV_NAME
+
+
+# The time a worker gets past the timeout of its test to fail it on its own.
+_KILL_GRACE_SECONDS = 1
+
+
+class RemoteError(Exception):
+    """Exception standing for an error which occurred in a worker process."""
+
+    def __str__(self):
+        """Return the traceback formatted in the worker process."""
+        return '\n' + self.args[0]
+
+
+class RemoteFailure(AssertionError):
+    """Exception standing for a failure which occurred in a worker process."""
+
+    def __str__(self):
+        """Return the traceback formatted in the worker process."""
+        return '\n' + self.args[0]
+
+
+class ParallelSuite(unittest.TestSuite):
+    """Test suite running its tests in a pool of worker processes.
+
+    The tests are dispatched by name in chunks of consecutive tests, and their
+    outcomes are replayed into the result in the original order of the tests.
+    The tests which cannot be loaded by name in a worker run in this process
+    first, before the outcomes of the dispatched ones are replayed.
+    The families whose failures (in all workers) tripped their fail-fast breakers,
+    or whose tests (in all workers) took their time budgets, are skipped in the
+    chunks dispatched afterwards.  A worker stuck in a test past its timeout (and
+    a grace period) is killed and replaced.
+
+    Given the mapping of the class/test method name pairs to the expected
+    durations, the longest tests are dispatched first.
+    """
+
+    def __init__(self, tests=(), processes=None, chunksize=None, durations=None):
+        """Create the suite to run in the specified number of processes."""
+        super().__init__(tests)
+        self.processes = processes or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.durations = durations
+
+    def run(self, result, debug=False):
+        """Run the tests while replaying their outcomes into the result."""
+        tests = list(_iterate_tests(self))
+        local = unittest.TestSuite(test for test in tests if not _is_addressable(test))
+        local.run(result, debug)
+
+        remote = collections.OrderedDict(
+            (test.id(), test) for test in tests if _is_addressable(test))
+        test_ids = list(remote)
+        if self.durations:
+            test_ids = _longest_first(remote, self.durations)
+        units = _split(test_ids, self.processes, self.chunksize)
+        order = iter(remote)
+        next_id = next(order, None)
+        outcomes = {}
+        with _Pool(self.processes) as pool:
+            for index, events in pool.run(units):
+                _record_failures(events, remote)
+                outcomes.update(_group_events(events, units[index]))
+                # Replay the contiguous run of the completed tests.
+                while next_id in outcomes:
+                    _replay(result, outcomes.pop(next_id), remote)
+                    next_id = next(order, None)
+                if result.shouldStop:
+                    break
+        return result
+
+
+def main(argv=None):
+    """Discover the tests and run them in parallel, return the exit status."""
+    args = _parse_args(argv)
+    if args.collect_only:
+        return _list_tests(args)
+    profiler, selection, durations = _enable_options(args)
+
+    loader = unittest.TestLoader()
+    if args.tests:
+        tests = loader.loadTestsFromNames(args.tests)
+    else:
+        tests = loader.discover(args.start_directory, args.pattern, args.top_level_directory)
+
+    with contextlib.ExitStack() as stack:
+        resultclass = None
+        if args.report:
+            output = stack.enter_context(open(args.report, 'w', encoding='utf-8'))
+            resultclass = functools.partial(
+                StreamingResult, output=output, junit=args.report.endswith('.xml'))
+        runner = unittest.TextTestRunner(
+            verbosity=args.verbosity, failfast=args.failfast, resultclass=resultclass)
+        result = runner.run(ParallelSuite(tests, args.processes, args.chunksize, durations))
+    if profiler is not None:
+        profiler.dump(args.profile)
+        sys.stderr.write(profiler.format_slowest(args.slowest))
+    if selection is not None:
+        selection.dump()
+    return 0 if result.wasSuccessful() else 1
+
+
+def _parse_args(argv):
+    """Return the parsed command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m tcm',
+        description='Run the tests spreading them over a pool of worker processes.')
+    parser.add_argument('tests', nargs='*',
+                        help='modules, classes, or test methods to run instead of discovery')
+    parser.add_argument('-j', '--processes', type=int,
+                        help='number of worker processes (defaults to the number of CPUs)')
+    parser.add_argument('-c', '--chunksize', type=int,
+                        help='number of tests to dispatch to a worker at once')
+    parser.add_argument('-s', '--start-directory', default='.',
+                        help='directory to start discovery (defaults to ".")')
+    parser.add_argument('-p', '--pattern', default='test*.py',
+                        help='pattern to match test files (defaults to "test*.py")')
+    parser.add_argument('-t', '--top-level-directory',
+                        help='top level directory of the project')
+    parser.add_argument('-v', '--verbose', dest='verbosity', action='store_const', const=2,
+                        default=1, help='verbose output')
+    parser.add_argument('-q', '--quiet', dest='verbosity', action='store_const', const=0,
+                        help='quiet output')
+    parser.add_argument('-f', '--failfast', action='store_true',
+                        help='stop on the first error or failure')
+    parser.add_argument('--fail-fast-family', type=int, metavar='K',
+                        help='skip the rest of the generated test methods of a sample method '
+                             'once K of them failed')
+    parser.add_argument('--shard', type=parse_shard, metavar='INDEX/COUNT',
+                        help='run only the generated test methods of the shard')
+    parser.add_argument('--seed', type=int, metavar='N',
+                        help='seed of the tcm.randomized arguments (defaults to 0)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='record the timings of the generated test methods to the JSON '
+                             '(or CSV if PATH ends with ".csv") file')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='record the peak allocations as well (slow)')
+    parser.add_argument('--slowest', type=int, default=10, metavar='N',
+                        help='number of the slowest cases per sample method to report')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='database of the generated test methods which passed to skip '
+                             'them while their sample methods and arguments stay the same')
+    parser.add_argument('--manifest', metavar='PATH',
+                        help='file of the generated test methods which passed to run only '
+                             'the new, changed or failed ones, updated after the run')
+    parser.add_argument('--report', metavar='PATH',
+                        help='stream the outcomes to the JSONL (or JUnit XML if PATH ends '
+                             'with ".xml") file, keeping only the summary in memory')
+    parser.add_argument('--durations', metavar='PATH',
+                        help='database of the test durations to dispatch the longest tests '
+                             'first and balance the shards by, updated after the run')
+    parser.add_argument('--collect-only', action='store_true',
+                        help='list the test ids, one per line, without generating the test '
+                             'methods or running the tests')
+    parser.add_argument('--collection-cache', metavar='PATH',
+                        help='JSON file of the test ids of the modules to list them again '
+                             'without importing the modules not modified since')
+    return parser.parse_args(argv)
+
+
+def _list_tests(args):
+    """Print the ids of the tests, return the exit status."""
+    _export_options(args)
+    test_ids = collection.collect(
+        args.tests, args.start_directory, args.pattern, args.top_level_directory,
+        args.collection_cache)
+    sys.stdout.write(''.join(test_id + '\n' for test_id in test_ids))
+    return 0
+
+
+def _export_options(args):
+    """Export the options as the environment variables.
+
+    The test modules, imported in the worker processes too, and the worker processes
+    themselves pick them up.
+    """
+    if args.fail_fast_family:
+        os.environ[failfast.FAIL_FAST_ENV_NAME] = str(args.fail_fast_family)
+    if args.shard:
+        os.environ[SHARD_ENV_NAME] = '/'.join(map(str, args.shard))
+    if args.seed is not None:
+        os.environ[SEED_ENV_NAME] = str(args.seed)
+    if args.profile:
+        os.environ[profiling.PROFILE_ENV_NAME] = args.profile
+        if args.profile_memory:
+            os.environ[profiling.PROFILE_MEMORY_ENV_NAME] = '1'
+    if args.cache:
+        os.environ[cache.CACHE_ENV_NAME] = args.cache
+    if args.manifest:
+        os.environ[manifest.MANIFEST_ENV_NAME] = args.manifest
+    if args.durations:
+        os.environ[DURATIONS_ENV_NAME] = args.durations
+
+
+def _enable_options(args):
+    """Enable the options for this process and the worker ones, return the enabled objects.
+
+    Return the profiler, the manifest and the durations, each of them None unless enabled.
+    """
+    _export_options(args)
+    profiler = None
+    if args.profile:
+        profiler = profiling.enable(memory=args.profile_memory)
+    if args.cache:
+        cache.enable(os.path.abspath(args.cache))
+    selection = None
+    if args.manifest:
+        selection = manifest.enable(os.path.abspath(args.manifest))
+    durations = None
+    if args.durations:
+        durations = Durations(args.durations).load()
+    return profiler, selection, durations
+
+
+def _iterate_tests(suite):
+    """Iterate the tests of the (possibly nested) suite."""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iterate_tests(test)
+        else:
+            yield test
+
+
+def _is_addressable(test):
+    """Return True if the test can be loaded by its id in another process."""
+    if not isinstance(test, unittest.TestCase):
+        return False
+    cls = type(test)
+    if cls.__module__ == '__main__' or cls.__module__.startswith('unittest.'):
+        return False
+    if '<locals>' in cls.__qualname__:
+        return False
+    # pylint: disable=protected-access
+    return test.id() == f'{cls.__module__}.{cls.__qualname__}.{test._testMethodName}'
+
+
+def _split(test_ids, processes, chunksize):
+    """Return the list of consecutive chunks of the test ids."""
+    if not chunksize:
+        # Make several chunks per process to even out the load.
+        chunksize = max(1, -(-len(test_ids) // (processes * 4)))
+    return [test_ids[i:i + chunksize] for i in range(0, len(test_ids), chunksize)]
+
+
+def _longest_first(tests, durations):
+    """Return the test ids sorted by the expected duration in the descending order.
+
+    The test methods generated from a sample method stay together (for the fixture
+    of their family to be set up once per chunk), sorted by their total duration.
+    """
+    keys = {test_id: key_of(test) for test_id, test in tests.items()}
+    known = [durations[key] for key in keys.values() if key in durations]
+    # Expect the tests with no recorded duration to take the average time.
+    default = sum(known) / len(known) if known else 0.0
+    expected = {test_id: durations.get(key, default) for test_id, key in keys.items()}
+    families = collections.OrderedDict()
+    for test_id, test in tests.items():
+        family = fixtures.family_of(test)
+        group = test_id if family is None else (type(test), family)
+        families.setdefault(group, []).append(test_id)
+    groups = sorted(families.values(), key=lambda group: -sum(map(expected.get, group)))
+    return [test_id for group in groups
+            for test_id in sorted(group, key=lambda test_id: -expected[test_id])]
+
+
+def _group_events(events, test_ids):
+    """Return the mapping of the test ids to the events to replay for every test.
+
+    The events preceding a test (such as class fixture errors) go with the test,
+    and the events following the last test go with the last one.
+    """
+    groups = collections.OrderedDict((test_id, []) for test_id in test_ids)
+    pending = []
+    for event in events:
+        pending.append(event)
+        method_name, test_id, _ = event
+        if method_name == 'stopTest' and test_id in groups:
+            groups[test_id].extend(pending)
+            pending = []
+    if pending and test_ids:
+        groups[test_ids[-1]].extend(pending)
+    return groups
+
+
+def _record_failures(events, tests):
+    """Count the failed tests to the breakers of their families."""
+    failed = {test_id for method_name, test_id, _ in events
+              if method_name in ('addError', 'addFailure', 'addSubTest')}
+    for test_id in failed:
+        family = failfast.family_of(tests.get(test_id))
+        if family is not None:
+            failfast.record_failure(family)
+
+
+def _replay(result, events, tests):
+    """Replay the events recorded in a worker process into the result."""
+    for method_name, test_id, detail in events:
+        test = tests.get(test_id) or _RemoteTest(test_id)
+        method = getattr(result, method_name)
+        if method_name in ('addError', 'addExpectedFailure'):
+            method(test, (RemoteError, RemoteError(detail), None))
+        elif method_name == 'addFailure':
+            method(test, (RemoteFailure, RemoteFailure(detail), None))
+        elif method_name == 'addSubTest':
+            subtest_id, exc_type, text = detail
+            method(test, _RemoteTest(subtest_id), (exc_type, exc_type(text), None))
+        elif method_name == 'addSkip':
+            method(test, detail)
+        else:
+            method(test)
+
+
+class _RemoteTest():
+    """Stand-in for a test (or a test fixture) which exists in a worker process only."""
+
+    failureException = AssertionError
+
+    def __init__(self, test_id):
+        self.__test_id = test_id
+
+    def id(self):  # pylint: disable=invalid-name
+        """Return the id of the test in the worker process."""
+        return self.__test_id
+
+    def shortDescription(self):  # noqa: N802 / pylint: disable=invalid-name
+        """Return no description as the docstring is not available."""
+        return None
+
+    def __str__(self):
+        return self.__test_id
+
+
+class _RecordingResult(unittest.TestResult):
+    """Result sending the outcomes of the tests from a worker process to the parent one."""
+
+    def __init__(self, conn):
+        super().__init__()
+        self.events = []
+        self.durations = []
+        self.__conn = conn
+        self.__started = None
+
+    def startTest(self, test):  # noqa: N802
+        super().startTest(test)
+        self.__conn.send(('start', (test.id(), timeouts.timeout_of(test))))
+        self.events.append(('startTest', test.id(), None))
+        self.__started = time.perf_counter()
+
+    def stopTest(self, test):  # noqa: N802
+        seconds = time.perf_counter() - self.__started
+        super().stopTest(test)
+        self.durations.append((*key_of(test), seconds))
+        self.events.append(('stopTest', test.id(), None))
+        self.__conn.send(('stop', self.flush()))
+
+    def flush(self):
+        """Return the events recorded so far, forgetting them."""
+        events, self.events = self.events, []
+        return events
+
+    def addError(self, test, err):  # noqa: N802
+        self.events.append(('addError', test.id(), self._exc_info_to_string(err, test)))
+
+    def addFailure(self, test, err):  # noqa: N802
+        self.events.append(('addFailure', test.id(), self._exc_info_to_string(err, test)))
+
+    def addSuccess(self, test):  # noqa: N802
+        self.events.append(('addSuccess', test.id(), None))
+
+    def addSkip(self, test, reason):  # noqa: N802
+        self.events.append(('addSkip', test.id(), reason))
+
+    def addExpectedFailure(self, test, err):  # noqa: N802
+        self.events.append(
+            ('addExpectedFailure', test.id(), self._exc_info_to_string(err, test)))
+
+    def addUnexpectedSuccess(self, test):  # noqa: N802
+        self.events.append(('addUnexpectedSuccess', test.id(), None))
+
+    def addSubTest(self, test, subtest, err):  # noqa: N802
+        if err is not None:
+            exc_type = RemoteFailure if issubclass(err[0], test.failureException) else RemoteError
+            text = self._exc_info_to_string(err, test)
+            self.events.append(('addSubTest', test.id(), (subtest.id(), exc_type, text)))
+
+
+def _worker(conn):
+    """Run the chunks of tests received from the parent process until told to stop."""
+    loader = unittest.TestLoader()
+    while True:
+        try:
+            unit = conn.recv()
+        except EOFError:
+            # The parent process is gone.
+            unit = None
+        if unit is None:
+            break
+        test_ids, tripped, exhausted = unit
+        failfast.trip(tripped)
+        timeouts.exhaust(exhausted)
+        result = _RecordingResult(conn)
+        loader.loadTestsFromNames(test_ids).run(result)
+        path = os.environ.get(DURATIONS_ENV_NAME)
+        if path and result.durations:
+            Durations(path).update(result.durations)
+        profiler = profiling.active_profiler()
+        if profiler is not None and profiler.records:
+            conn.send(('profile', profiler.records))
+            del profiler.records[:]
+        selection = manifest.active_manifest()
+        if selection is not None and (selection.passed or selection.failed):
+            conn.send(('manifest', selection.flush()))
+        spent = timeouts.flush_spent()
+        if spent:
+            conn.send(('budget', spent))
+        conn.send(('done', result.flush()))
+    conn.close()
+
+
+class _Pool():
+    """Pool of the worker processes which replaces the workers exited unexpectedly."""
+
+    def __init__(self, processes):
+        self.__processes = processes
+        self.__context = multiprocessing.get_context()
+        self.__workers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        for conn, worker in self.__workers.items():
+            try:
+                conn.send(None)
+            except OSError:  # pragma: no cover
+                pass
+            worker.process.join(1)
+            if worker.process.is_alive():  # pragma: no cover
+                worker.process.terminate()
+            conn.close()
+        self.__workers.clear()
+
+    def run(self, units):
+        """Iterate the index/events pairs of the units as the workers complete them."""
+        queue = collections.deque(enumerate(units))
+        events = collections.defaultdict(list)
+        while queue and len(self.__workers) < self.__processes:
+            self.__assign(self.__spawn(), queue.popleft())
+        while self.__workers:
+            for conn in wait(list(self.__workers), self.__time_left()):
+                worker = self.__workers[conn]
+                try:
+                    kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    if not self.__recover(conn, events[worker.index]):
+                        continue
+                    # The chunk was given up on, along with its worker.
+                    yield worker.index, events.pop(worker.index)
+                    if queue:
+                        self.__assign(self.__spawn(), queue.popleft())
+                    continue
+                if not self.__receive(worker, kind, payload, events[worker.index]):
+                    continue
+                yield worker.index, events.pop(worker.index)
+                if queue:
+                    self.__assign(worker, queue.popleft())
+                else:
+                    self.__retire(conn)
+            self.__kill_stuck(events)
+
+    def __time_left(self):
+        """Return the seconds until the earliest deadline of the running tests, if any."""
+        deadlines = [worker.deadline for worker in self.__workers.values()
+                     if worker.deadline is not None]
+        return max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+
+    def __kill_stuck(self, events):
+        """Kill and replace the workers whose tests ran past their deadlines."""
+        now = time.monotonic()
+        for conn, worker in list(self.__workers.items()):
+            if worker.deadline is not None and worker.deadline <= now:
+                worker.process.kill()
+                self.__recover(conn, events[worker.index],
+                               f'Worker process killed after the timeout of {worker.timeout}'
+                               ' seconds')
+
+    @staticmethod
+    def __receive(worker, kind, payload, events):
+        """Handle the message from the worker, return True if it completed the unit."""
+        if kind == 'start':
+            worker.start(*payload)
+        elif kind == 'profile':
+            # The workers profile only if this process does (and the same for the manifest).
+            profiler = profiling.active_profiler()
+            if profiler is not None:  # pragma: no branch
+                profiler.records.extend(payload)
+        elif kind == 'manifest':
+            selection = manifest.active_manifest()
+            if selection is not None:  # pragma: no branch
+                selection.update(*payload)
+        elif kind == 'budget':
+            timeouts.record_spent(payload)
+        else:
+            events.extend(payload)
+            if kind == 'stop':
+                worker.forget_started()
+        return kind == 'done'
+
+    def __spawn(self):
+        parent_conn, child_conn = self.__context.Pipe()
+        # Non-daemonic workers may run the tests which spawn processes of their own.
+        process = self.__context.Process(target=_worker, args=(child_conn,))
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        self.__workers[parent_conn] = worker
+        return worker
+
+    def __assign(self, worker, unit):
+        worker.index, test_ids = unit
+        worker.test_ids = list(test_ids)
+        worker.retries = 0
+        worker.forget_started()
+        worker.conn.send(
+            (test_ids, failfast.tripped_families(), timeouts.exhausted_families()))
+
+    def __retire(self, conn):
+        worker = self.__workers.pop(conn)
+        conn.send(None)
+        worker.process.join()
+        conn.close()
+
+    def __recover(self, conn, events, message=None):
+        """Report the test the worker died on and hand the rest of its chunk to a new one.
+
+        Return True if the chunk was given up on instead, as its workers died twice
+        with no test running (say, in a class fixture or importing the module), and
+        all its tests not run yet are reported as errors.
+        """
+        worker = self.__workers.pop(conn)
+        worker.process.join()
+        conn.close()
+        if message is None:
+            message = f'Worker process exited unexpectedly (exit code {worker.process.exitcode})'
+        if worker.started is not None:
+            events.extend(_error_events(worker.started, message))
+            worker.forget_started()
+        elif worker.retries:
+            for test_id in worker.test_ids:
+                events.extend(_error_events(test_id, message))
+            return True
+        else:
+            worker.retries += 1
+        replacement = self.__spawn()
+        self.__assign(replacement, (worker.index, worker.test_ids))
+        replacement.retries = worker.retries
+        return False
+
+
+def _error_events(test_id, message):
+    """Return the events reporting the error of the test which did not complete."""
+    return [('startTest', test_id, None), ('addError', test_id, message),
+            ('stopTest', test_id, None)]
+
+
+class _Worker():  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Worker process along with the chunk of tests it was assigned."""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.index = None
+        self.test_ids = []
+        self.retries = 0
+        self.started = None
+        self.timeout = None
+        self.deadline = None
+
+    def start(self, test_id, timeout):
+        """Mark the test as started, to be killed some time after its timeout, if any."""
+        self.started = test_id
+        self.timeout = timeout
+        if timeout is not None:
+            self.deadline = time.monotonic() + timeout + _KILL_GRACE_SECONDS
+
+    def forget_started(self):
+        """Mark the started test as no longer pending."""
+        if self.started in self.test_ids:
+            self.test_ids.remove(self.started)
+        self.started = None
+        self.timeout = None
+        self.deadline = None
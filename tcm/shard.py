@@ -0,0 +1,67 @@
+"""This module provides a deterministic selection of the generated test methods for a shard."""
+
+
+from collections import namedtuple
+import os
+import zlib
+
+
+SHARD_ENV_NAME = 'TCM_SHARD'
+
+
+class Shard(namedtuple('Shard', 'index, count')):
+    """1-based index of the shard along with the total number of shards."""
+
+    __slots__ = ()
+
+    def selects(self, class_name, method_name):
+        """Return True if the generated test method belongs to the shard."""
+        # Unlike hash(), CRC-32 does not depend on the interpreter run.
+        key = f'{class_name}.{method_name}'.encode('utf-8')
+        return zlib.crc32(key) % self.count == self.index - 1
+
+
+def parse_shard(text):
+    """Return the shard parsed from the "INDEX/COUNT" text, raise ValueError if invalid."""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        index = count = 0
+    if not 0 < index <= count:
+        raise ValueError(f'Invalid shard "{text}": expected INDEX/COUNT, 1 <= INDEX <= COUNT')
+    return Shard(index, count)
+
+
+def current_shard():
+    """Return the shard specified by the environment variable, None if it is not set."""
+    text = os.environ.get(SHARD_ENV_NAME)
+    return parse_shard(text) if text else None
+
+
+def balanced_selection(shard, class_name, family_name, names, durations):
+    """Return the set of the test method names of a family the shard selects.
+
+    The test methods with known durations are spread longest-first to the least
+    loaded shards, the others are selected by the hash of their names.  Balancing
+    every family on its own keeps the selection independent of the import order.
+    """
+    timed = []
+    selected = set()
+    for name in names:
+        seconds = durations.get((class_name, name))
+        if seconds is None:
+            if shard.selects(class_name, name):
+                selected.add(name)
+        else:
+            timed.append((seconds, name))
+
+    # Break the ties differently for different families not to favor the first shard.
+    offset = zlib.crc32(f'{class_name}.{family_name}'.encode('utf-8'))
+    order = [(offset + i) % shard.count for i in range(shard.count)]
+    loads = [0.0] * shard.count
+    for seconds, name in sorted(timed, key=lambda item: (-item[0], item[1])):
+        index = min(order, key=loads.__getitem__)
+        loads[index] += seconds
+        if index == shard.index - 1:
+            selected.add(name)
+    return selected
@@ -0,0 +1,110 @@
+"""This module provides the sources of the test method arguments consumed upon generation."""
+
+
+import abc
+from collections.abc import Mapping
+
+
+class Source(abc.ABC):  # pylint: disable=too-few-public-methods
+    """Base class for the argument sources consumed only when the test methods are generated."""
+
+    @abc.abstractmethod
+    def named_arguments(self):
+        """Iterate the arguments as name/value pairs."""
+
+
+class IndexedSource(Source):
+    """Base class for the sources of a known number of arguments looked up by index.
+
+    The arguments are not copied into the tables of the generated test methods but
+    looked up by name, so the source should keep them compactly.  By default, the
+    name is the 1-based index padded with leading zeroes to the length of the last
+    index, the same as for the positional arguments.
+    """
+
+    @abc.abstractmethod
+    def __len__(self):
+        """Return the number of the arguments."""
+
+    @abc.abstractmethod
+    def argument_at(self, index):
+        """Return the argument by its 0-based index."""
+
+    def name_at(self, index):
+        """Return the name of the argument by its 0-based index."""
+        return str(index + 1).zfill(len(str(len(self))))
+
+    def index_of(self, name):
+        """Return the 0-based index of the named argument, raise KeyError if there is no such."""
+        try:
+            index = int(name)
+        except ValueError:
+            raise KeyError(name) from None
+        if not 0 < index <= len(self) or str(index).zfill(len(str(len(self)))) != name:
+            raise KeyError(name)
+        return index - 1
+
+    def wrap_test_method(self, method, index, run):  # pylint: disable=unused-argument
+        """Return the test method generated for the 0-based index, possibly wrapped.
+
+        The run(test, argument) function runs the sample method with any argument.
+        """
+        return method
+
+    def named_arguments(self):
+        """Iterate the arguments as name/value pairs."""
+        for index in range(len(self)):
+            yield self.name_at(index), self.argument_at(index)
+
+
+class columns(IndexedSource):  # noqa: N801 / pylint: disable=invalid-name
+    """Source of the rows of a mapping of the column names to equal-length sequences.
+
+    The columns (lists, arrays, NumPy arrays and the like) are kept as they are, and
+    each row is built upon lookup as a dict of the column names to the values.
+    """
+
+    def __init__(self, data):
+        """Remember the columns, raise ValueError if their lengths differ."""
+        self.columns = dict(data)
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f'The columns must be of equal length, got {sorted(lengths)}')
+        self.__length = lengths.pop() if lengths else 0
+
+    def __len__(self):
+        """Return the number of the rows."""
+        return self.__length
+
+    def argument_at(self, index):
+        """Return the row by its 0-based index."""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def slices(self, start, stop):
+        """Return the mapping of the column names to the slices of the rows."""
+        return {name: column[start:stop] for name, column in self.columns.items()}
+
+
+class lazy(Source):  # noqa: N801 / pylint: disable=invalid-name,too-few-public-methods
+    """Source wrapping an iterable, a generator function, or a loader callable.
+
+    A callable is invoked without arguments to obtain the iterable.  Mapping keys
+    are taken as names, otherwise the name is the 1-based index of an item padded
+    with leading zeroes to the length of the last index (like the names of the
+    positional arguments), so the items are consumed before the first name.
+    """
+
+    def __init__(self, source):
+        """Remember the source without consuming it."""
+        self.__source = source
+
+    def named_arguments(self):
+        """Iterate the arguments as name/value pairs."""
+        items = self.__source() if callable(self.__source) else self.__source
+        if isinstance(items, Mapping):
+            yield from items.items()
+        else:
+            items = list(items)
+            width = len(str(len(items)))
+            for i, arg in enumerate(items, 1):
+                yield str(i).zfill(width), arg
@@ -0,0 +1,177 @@
+"""This module provides the registry of the argument tables shared by all test case classes."""
+
+
+from array import array
+from collections import namedtuple
+from collections import OrderedDict
+import hashlib
+import itertools
+import pickle
+import sys
+import weakref
+
+from .fingerprint import DIGEST_SIZE
+
+
+TableUsage = namedtuple('TableUsage', 'tables, cases, bytes')
+
+# Hashing the smaller tables costs more time than their copies take memory.
+_MIN_HASHED_CASES = 16
+
+
+class TableOwner():  # pylint: disable=too-few-public-methods
+    """Owner of the tables interned for a test case class, named after the latter.
+
+    The class (or its families) keeps the owner alive, and the tables are released
+    from the registry once no live owner uses them.
+    """
+
+    def __init__(self, name):
+        """Start with no tables."""
+        self.name = name
+        self.keys = []
+        _OWNERS.setdefault(name, weakref.WeakSet()).add(self)
+        weakref.finalize(self, _release, self.keys).atexit = False
+
+
+def intern_table(table, owner, by_content=False):
+    """Return the registered table identical to the table, registering the latter if new.
+
+    The table is either the captured arguments (a pair of the positional argument
+    tuple and the keyword argument dict) or the mapping of the names to the
+    arguments loaded from a value source.  The tables are identical if they hold
+    the same objects.  With "by_content" set, they are also identical if their items
+    pickle the same (as hashed one at a time) as those of a table registered with
+    "by_content" set, unless the tables are unpicklable or too small to be worth
+    hashing.  The owner is recorded as using the table.
+    """
+    key = _identity_key(table)
+    entry = _ENTRIES.get(key)
+    digest = None
+    if entry is None and by_content and _case_count(table) >= _MIN_HASHED_CASES:
+        digest = _content_digest(table)
+        entry = _ENTRIES.get(_BY_CONTENT.get(digest)) if digest is not None else None
+    if entry is None:
+        entry = _Entry(key, table, digest)
+        _ENTRIES[key] = entry
+        if digest is not None:
+            _BY_CONTENT[digest] = key
+    if entry.key not in owner.keys:
+        owner.keys.append(entry.key)
+        entry.users += 1
+    return entry.table
+
+
+def table_usage(owner=None):
+    """Return the tables, cases and bytes held by the live owners named so.
+
+    Absent the owner name, return the mapping of all the owner names to their usage.
+    The table shared by several owners counts for each of them.
+    """
+    if owner is None:
+        return OrderedDict((name, table_usage(name)) for name, owners in _OWNERS.items()
+                           if owners)
+    keys = OrderedDict()
+    for table_owner in _OWNERS.get(owner, ()):
+        keys.update(dict.fromkeys(table_owner.keys))
+    return _usage(keys)
+
+
+def total_usage():
+    """Return the tables, cases and bytes held by all the owners, counting every table once."""
+    return _usage(_ENTRIES)
+
+
+class _Entry():  # pylint: disable=too-few-public-methods
+    """Registered table along with its keys and the number of its owners."""
+
+    def __init__(self, key, table, digest):
+        self.key = key
+        self.table = table
+        self.digest = digest
+        self.users = 0
+
+
+_ENTRIES = {}
+_BY_CONTENT = {}
+_OWNERS = OrderedDict()
+
+
+def _release(keys):
+    """Forget the owner of the tables, releasing those no other owner uses."""
+    for key in keys:
+        entry = _ENTRIES[key]
+        entry.users -= 1
+        if entry.users:
+            continue
+        del _ENTRIES[key]
+        if entry.digest is not None:
+            del _BY_CONTENT[entry.digest]
+
+
+def _usage(keys):
+    """Return the usage of the registered tables of the keys."""
+    tables = [_ENTRIES[key].table for key in keys]
+    seen = set()
+    return TableUsage(
+        len(tables), sum(map(_case_count, tables)),
+        sum(_deep_size(table, seen) for table in tables))
+
+
+def _case_count(table):
+    if isinstance(table, tuple):
+        args, kwargs = table
+        return len(args) + len(kwargs)
+    return len(table)
+
+
+def _items(table):
+    """Iterate the name/argument pairs of the table (the positional ones named None)."""
+    if isinstance(table, tuple):
+        args, kwargs = table
+        return itertools.chain(((None, arg) for arg in args), kwargs.items())
+    return table.items()
+
+
+def _identity_key(table):
+    # The registered tables keep their items alive, so the ids are not reused while
+    # the tables are registered.  Digesting the names and the ids keeps the key of
+    # a fixed size regardless of the number of cases.
+    if isinstance(table, tuple):
+        args, kwargs = table
+        names = (len(args), *kwargs)
+        ids = itertools.chain(map(id, args), map(id, kwargs.values()))
+    else:
+        names = tuple(table)
+        ids = map(id, table.values())
+    hasher = hashlib.blake2b(repr(names).encode(), digest_size=DIGEST_SIZE)
+    hasher.update(array('Q', ids))
+    return hasher.digest()
+
+
+def _content_digest(table):
+    # Pickle one item at a time, never holding more than one of them pickled.
+    hasher = hashlib.blake2b(type(table).__name__.encode(), digest_size=DIGEST_SIZE)
+    try:
+        for item in _items(table):
+            hasher.update(pickle.dumps(item, protocol=4))
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return hasher.digest()
+
+
+def _deep_size(obj, seen):
+    """Return the size of the object and of the objects it refers to, not counted before."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(value, seen)
+                    for key, value in obj.items())
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__') and type(obj).__module__ != 'builtins':
+        # Skip the classes, functions and modules, counting only the instances.
+        size += _deep_size(vars(obj), seen)
+    return size
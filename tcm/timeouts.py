@@ -0,0 +1,185 @@
+"""This module provides the time limits of the generated test methods and of their families."""
+
+
+import contextlib
+import functools
+import signal
+import threading
+import time
+import unittest
+import weakref
+
+from .introspection import is_coroutine_function
+from .introspection import test_method_of
+from .introspection import wrap_within
+
+
+TIMEOUT_ATTR_NAME = 'tcm timeout'
+BUDGET_ATTR_NAME = 'tcm budget'
+
+
+class TimeoutException(Exception):
+    """Exception raised when a generated test method runs out of time."""
+
+
+def limit(method, seconds):
+    """Return the test method raising TimeoutException once it runs for that many seconds.
+
+    A coroutine test method is cancelled.  Otherwise, in the main thread, the test
+    method is interrupted by the SIGALRM signal where available; elsewhere it runs
+    in a watchdog thread which is abandoned (left to finish on its own) if it runs
+    out of time.
+    """
+    message = f'{method.__name__} timed out after {seconds} seconds'
+
+    if is_coroutine_function(method):
+        @functools.wraps(method)
+        async def _limited_coroutine(self):
+            import asyncio  # pylint: disable=import-outside-toplevel
+            try:
+                return await asyncio.wait_for(method(self), seconds)
+            except asyncio.TimeoutError:
+                raise TimeoutException(message) from None
+
+        limited = _limited_coroutine
+    else:
+        @functools.wraps(method)
+        def _limited(self):
+            if not _can_use_alarm():
+                return _run_in_thread(method, self, seconds, message)
+            return _run_with_alarm(method, self, seconds, message)
+
+        limited = _limited
+    setattr(limited, TIMEOUT_ATTR_NAME, seconds)
+    return limited
+
+
+def timeout_of(test):
+    """Return the timeout of the test method, None if it has none."""
+    return getattr(test_method_of(test), TIMEOUT_ATTR_NAME, None)
+
+
+class FamilyBudget():
+    """Total time of the test methods of a family skipping the rest once it is exhausted.
+
+    The budgets are registered by the family name (the qualified name of the sample
+    method) for the time spent in the worker processes to be accounted for.
+    """
+
+    def __init__(self, family, seconds):
+        """Start with no time spent."""
+        self.family = family
+        self.seconds = seconds
+        self.spent = 0.0
+        self.unreported = 0.0
+        _BUDGETS[family] = self
+
+    @property
+    def exhausted(self):
+        """Return True if the family took all of its time."""
+        return self.spent >= self.seconds
+
+    def guard(self, method):
+        """Return the test method skipped once the budget is exhausted, counting its time."""
+        guarded = wrap_within(method, lambda _: self.spending())
+        setattr(guarded, BUDGET_ATTR_NAME, self.family)
+        return guarded
+
+    def check(self):
+        """Raise SkipTest if the budget is exhausted."""
+        if self.exhausted:
+            raise unittest.SkipTest(
+                f'The time budget of {self.seconds} seconds of "{self.family}" is exhausted')
+
+    @contextlib.contextmanager
+    def spending(self):
+        """Raise SkipTest if the budget is spent, count the time within the context otherwise."""
+        self.check()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spend(time.perf_counter() - started)
+
+    def spend(self, seconds):
+        """Count the time spent by a test method of the family."""
+        self.spent += seconds
+        self.unreported += seconds
+
+
+_BUDGETS = weakref.WeakValueDictionary()
+
+
+def flush_spent():
+    """Return the mapping of the family names to the time spent since the last call."""
+    spent = {}
+    for family, budget in list(_BUDGETS.items()):
+        if budget.unreported:
+            spent[family] = budget.unreported
+            budget.unreported = 0.0
+    return spent
+
+
+def record_spent(spent):
+    """Count the time spent by the families (in another process)."""
+    for family, seconds in spent.items():
+        budget = _BUDGETS.get(family)
+        if budget is not None:
+            budget.spent += seconds
+
+
+def exhausted_families():
+    """Return the list of the names of the families whose budgets are exhausted."""
+    return sorted(family for family, budget in _BUDGETS.items() if budget.exhausted)
+
+
+def exhaust(families):
+    """Exhaust the budgets of the families (which were exhausted in another process)."""
+    for family in families:
+        budget = _BUDGETS.get(family)
+        if budget is not None:
+            budget.spent = max(budget.spent, budget.seconds)
+
+
+def _can_use_alarm():
+    """Return True if SIGALRM can interrupt the test method and no other timer is pending."""
+    if not hasattr(signal, 'setitimer'):
+        return False
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    return not signal.getitimer(signal.ITIMER_REAL)[0]
+
+
+def _run_with_alarm(method, test, seconds, message):
+    """Run the test method until it returns or the SIGALRM signal interrupts it."""
+    def _alarm(signum, frame):  # pylint: disable=unused-argument
+        raise TimeoutException(message)
+
+    previous = signal.signal(signal.SIGALRM, _alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        return method(test)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_in_thread(method, test, seconds, message):
+    """Run the test method in a daemon thread, giving up on it once it runs out of time."""
+    outcome = []
+
+    def _target():
+        try:
+            outcome.append((method(test), None))
+        except BaseException as exc:  # pylint: disable=broad-except
+            outcome.append((None, exc))
+
+    thread = threading.Thread(target=_target, name=f'tcm-{method.__name__}', daemon=True)
+    thread.start()
+    thread.join(seconds)
+    if not outcome:
+        raise TimeoutException(message)
+    value, exc = outcome[0]
+    if exc is not None:
+        raise exc
+    return value
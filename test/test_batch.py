@@ -0,0 +1,90 @@
+import unittest
+
+import tcm
+
+
+class BatchedFamilyTestCase(unittest.TestCase):
+    def test_sample_method_gets_column_slices(self):
+        calls = []
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(batch=4)
+            @tcm.values(tcm.columns({'x': list(range(10)), 'y': tuple(range(10))}))
+            def test(self, x, y):
+                calls.append((x, y))
+                return [a == b for a, b in zip(x, y)]
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 10)
+        self.assertTrue(result.wasSuccessful())
+        self.assertListEqual(calls, [
+            ([0, 1, 2, 3], (0, 1, 2, 3)), ([4, 5, 6, 7], (4, 5, 6, 7)), ([8, 9], (8, 9))])
+
+    def test_outcomes_are_reported_per_row(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.columns({'x': range(6)}))
+            @tcm.options(batch=3)
+            def test(self, x):
+                outcomes = [None, False, 'too big', KeyError('x'), True, unittest.SkipTest('6')]
+                return [outcomes[i] for i in x]
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.failures], ['test_2', 'test_3'])
+        self.assertIn('AssertionError: Row 2 failed', result.failures[0][1])
+        self.assertIn('AssertionError: too big', result.failures[1][1])
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.errors], ['test_4'])
+        self.assertIn("KeyError: 'x'", result.errors[0][1])
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.skipped], ['test_6'])
+
+    def test_sample_method_exception_is_reported_for_every_row_of_chunk(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(batch=2)
+            @tcm.values(tcm.columns({'x': range(5)}))
+            def test(self, x):
+                if 2 in x:
+                    raise ZeroDivisionError
+                if 4 in x:
+                    return [None, None]
+                return [None] * len(x)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.errors], ['test_3', 'test_4', 'test_5'])
+        self.assertIn('ZeroDivisionError', result.errors[0][1])
+        self.assertIn('ValueError: Expected 1 outcomes, got 2', result.errors[2][1])
+
+    def test_chunk_runs_again_for_row_run_again(self):
+        calls = []
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(batch=10)
+            @tcm.values(tcm.columns({'x': range(3)}))
+            def test(self, x):
+                calls.append(list(x))
+                return [True] * len(x)
+
+        GeneratedTestCase('test_2').run()
+        GeneratedTestCase('test_3').run()
+        GeneratedTestCase('test_3').run()
+        GeneratedTestCase('test_1').run()
+
+        self.assertListEqual(calls, [[0, 1, 2], [0, 1, 2]])
+
+    def test_batch_without_columns_will_raise(self):
+        with self.assertRaises(tcm.MetaclassException) as cm:
+            class GeneratedTestCase(tcm.TestCase):  # pylint: disable=unused-variable
+                @tcm.options(batch=2)
+                @tcm.values([1], [2])
+                def test(self, x):
+                    pass  # pragma: no cover
+
+        self.assertEqual(
+            cm.exception.args[0],
+            'The "batch" option of "test" requires a regular function with a tcm.columns source')
@@ -0,0 +1,56 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks import import_time
+from benchmarks import suite
+
+
+class BenchmarkSuiteTestCase(unittest.TestCase):
+    def test_quick_suite_writes_json_results(self):
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertEqual(suite.main(['--quick']), 0)
+
+        results = json.loads(stdout.getvalue())
+        self.assertSetEqual(
+            {result['name'] for result in results['results']},
+            {'class_creation', 'wrapper_call', 'end_to_end'})
+        self.assertListEqual(
+            [result['params']['form'] for result in results['results']
+             if result['name'] == 'wrapper_call'],
+            ['as_is', 'args', 'kwargs'])
+
+    def test_suite_writes_json_results_to_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'results.json')
+            self.assertEqual(suite.main(['--quick', '-o', path]), 0)
+            with open(path, encoding='utf-8') as file:
+                results = json.load(file)
+
+        self.assertSetEqual(
+            {result['name'] for result in results['results']},
+            {'class_creation', 'wrapper_call', 'end_to_end'})
+
+
+class ImportTimeBenchmarkTestCase(unittest.TestCase):
+    def test_import_time_statistics_are_printed(self):
+        for argv in ([], ['--baseline']):
+            with self.subTest(argv=argv):
+                with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                    status = import_time.main(
+                        ['--classes', '2', '--methods', '3', '--values', '4', '--repeat', '2',
+                         *argv])
+
+                self.assertEqual(status, 0)
+                self.assertRegex(
+                    stdout.getvalue(),
+                    r'^6 decorated methods, 24 test methods\nbest [0-9.]+ ms, median [0-9.]+ ms\n$')
+
+    def test_baseline_introspection_matches_the_signature(self):
+        # pylint: disable=protected-access
+        self.assertTrue(import_time._inspect_has_single_test_param(lambda self, value: None))
+        self.assertFalse(import_time._inspect_has_single_test_param(lambda self, *args: None))
+        self.assertFalse(import_time._inspect_has_single_test_param(lambda self, x, y: None))
@@ -0,0 +1,203 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import cache
+from tcm import fingerprint
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'cache.db')
+        self.cache = cache.enable(self.path)
+        self.addCleanup(cache.disable)
+
+    def test_passed_test_methods_are_skipped_next_time(self):
+        def make_class():
+            class GeneratedTestCase(tcm.TestCase):
+                @tcm.values(1, 2, 3)
+                def test(self, value):
+                    self.assertLess(value, 3)
+
+                @tcm.values(1, 2)
+                def test_subtests(self, value):
+                    with self.subTest():
+                        self.assertEqual(value, 1)
+
+                @unittest.expectedFailure
+                @tcm.values(1)
+                def test_expected(self, value):
+                    self.assertEqual(value, 0)
+
+            return GeneratedTestCase
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class()).run(result)
+
+        self.assertEqual(len(result.failures), 2)
+        self.assertListEqual(result.skipped, [])
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class()).run(result)
+
+        self.assertListEqual(
+            [(test.id().split('.')[-1], reason) for test, reason in result.skipped],
+            [('test_1', 'cached pass'), ('test_2', 'cached pass'),
+             ('test_subtests_1', 'cached pass')])
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.failures],
+            ['test_3', 'test_subtests_2 (<subtest>)'])
+        self.assertEqual(len(result.expectedFailures), 1)
+
+    def test_changed_closure_or_argument_makes_test_method_run(self):
+        def make_class(limit, table):
+            class GeneratedTestCase(tcm.TestCase):
+                @tcm.values(*table)
+                def test(self, value):
+                    self.assertLess(value, limit)
+
+                @tcm.values(0)
+                def test_constant(self, value):
+                    self.assertEqual(value, 0)
+
+            return GeneratedTestCase
+
+        unittest.TestLoader().loadTestsFromTestCase(make_class(3, (1, 2, 3))).run(
+            unittest.TestResult())
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class(4, (1, 2, 3))).run(result)
+
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.skipped], ['test_constant_1'])
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class(4, (1, 2, 0))).run(result)
+
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.skipped],
+            ['test_1', 'test_2', 'test_constant_1'])
+
+    def test_same_named_classes_of_other_modules_run(self):
+        def make_class(module):
+            class GeneratedTestCase(tcm.TestCase):
+                __module__ = module
+
+                @tcm.values(1, 2)
+                def test(self, value):
+                    self.assertTrue(value)
+
+            return GeneratedTestCase
+
+        unittest.TestLoader().loadTestsFromTestCase(make_class('tcm_first')).run(
+            unittest.TestResult())
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class('tcm_second')).run(result)
+
+        self.assertEqual(result.testsRun, 2)
+        self.assertListEqual(result.skipped, [])
+
+    def test_test_methods_failing_to_tear_down_run_again(self):
+        def make_class():
+            class GeneratedTestCase(tcm.TestCase):
+                def tearDown(self):
+                    raise RuntimeError('no teardown')
+
+                @tcm.values(1, 2)
+                def test(self, value):
+                    self.assertTrue(value)
+
+            return GeneratedTestCase
+
+        for _ in range(2):
+            result = unittest.TestResult()
+            unittest.TestLoader().loadTestsFromTestCase(make_class()).run(result)
+
+            self.assertEqual(len(result.errors), 2)
+            self.assertListEqual(result.skipped, [])
+
+    def test_disabled_cache_runs_everything(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(1, 2)
+            def test(self, value):
+                self.assertTrue(value)
+
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(unittest.TestResult())
+        cache.disable()
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertIsNone(cache.active_cache())
+        self.assertEqual(result.testsRun, 2)
+        self.assertListEqual(result.skipped, [])
+
+    def test_least_recently_used_keys_are_evicted(self):
+        store = cache.ResultCache(self.path, max_entries=2)
+        store.add(b'a')
+        store.add(b'b')
+        self.assertIn(b'a', store)
+        store.add(b'c')
+        store.evict()
+
+        self.assertIn(b'a', store)
+        self.assertNotIn(b'b', store)
+        self.assertIn(b'c', store)
+        store.close()
+
+    def test_excess_keys_are_evicted_every_thousand_additions(self):
+        store = cache.ResultCache(self.path, max_entries=10)
+        for i in range(1000):
+            store.add(str(i).encode())
+
+        self.assertNotIn(b'0', store)
+        self.assertIn(b'999', store)
+        store.close()
+
+    def test_cache_is_enabled_by_the_environment(self):
+        cache.disable()
+        env = {cache.CACHE_ENV_NAME: self.path, cache.CACHE_SIZE_ENV_NAME: '5'}
+        with mock.patch.dict(os.environ, env):
+            cache._enable_from_environment()  # pylint: disable=protected-access
+
+        self.assertEqual(cache.active_cache().path, self.path)
+        self.assertEqual(cache.active_cache().max_entries, 5)
+
+
+class FingerprintTestCase(unittest.TestCase):
+    def test_function_fingerprint_depends_on_code_and_closure(self):
+        def make(value, addend):
+            def func(arg=addend):
+                return arg + value  # pragma: no cover
+            return func
+
+        self.assertEqual(fingerprint.function_fingerprint(make(1, 2)),
+                         fingerprint.function_fingerprint(make(1, 2)))
+        self.assertNotEqual(fingerprint.function_fingerprint(make(1, 2)),
+                            fingerprint.function_fingerprint(make(2, 2)))
+        self.assertNotEqual(fingerprint.function_fingerprint(make(1, 2)),
+                            fingerprint.function_fingerprint(make(1, 3)))
+        self.assertNotEqual(fingerprint.function_fingerprint(lambda: 1),
+                            fingerprint.function_fingerprint(lambda: 2))
+
+    def test_function_fingerprint_covers_nested_code_and_empty_cells(self):
+        def make(bound):
+            def func():
+                return value  # pragma: no cover / pylint: disable=possibly-used-before-assignment
+            if bound:
+                value = None
+            return func
+
+        self.assertEqual(fingerprint.function_fingerprint(make(False)),
+                         fingerprint.function_fingerprint(make(True)))
+        self.assertNotEqual(fingerprint.function_fingerprint(lambda: lambda: 1),
+                            fingerprint.function_fingerprint(lambda: lambda: 2))
+
+    def test_value_fingerprint_falls_back_to_repr(self):
+        self.assertEqual(fingerprint.value_fingerprint((1, 'a')),
+                         fingerprint.value_fingerprint((1, 'a')))
+        self.assertEqual(len(fingerprint.value_fingerprint(lambda: None)),
+                         fingerprint.DIGEST_SIZE)
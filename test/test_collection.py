@@ -0,0 +1,165 @@
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from tcm import collection
+from tcm import runner
+
+
+SAMPLE_MODULE = """
+import unittest
+
+import tcm
+
+
+class SampleTestCase(tcm.TestCase):
+    @tcm.values(*range(12))
+    def test_value(self, value):
+        pass
+
+    @tcm.values(tcm.lazy(lambda: {'a': 1, 'b': 2}))
+    def test_lazy(self, value):
+        pass
+
+    def test_plain(self):
+        pass
+
+    not_a_test = 1
+    test_attribute = 2
+
+
+class PlainTestCase(unittest.TestCase):
+    def test(self):
+        pass
+"""
+
+
+class CollectTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        package = os.path.join(self.tmpdir.name, 'tcm_collected')
+        os.mkdir(package)
+        for path in ('__init__.py', 'test_first.py', 'helper.py', 'sub/__init__.py',
+                     'sub/test_second.py', 'data/test_third.py'):
+            os.makedirs(os.path.dirname(os.path.join(package, path)), exist_ok=True)
+            self.write(os.path.join(package, path), SAMPLE_MODULE if 'test' in path else '')
+        sys.path.insert(0, self.tmpdir.name)
+        self.addCleanup(sys.path.remove, self.tmpdir.name)
+        self.addCleanup(self.forget_modules)
+        importlib.invalidate_caches()
+        self.package = package
+
+    @staticmethod
+    def write(path, text):
+        with open(path, 'w', encoding='utf-8') as module:
+            module.write(textwrap.dedent(text))
+
+    @staticmethod
+    def forget_modules():
+        for name in list(sys.modules):
+            if name.startswith('tcm_collected'):
+                del sys.modules[name]
+
+    def test_discovered_ids_match_the_loaded_tests(self):
+        test_ids = collection.collect(
+            start_directory=self.package, top_level_directory=self.tmpdir.name)
+
+        self.forget_modules()
+        suite = unittest.TestLoader().discover(self.package, top_level_dir=self.tmpdir.name)
+        # pylint: disable=protected-access
+        self.assertListEqual(test_ids, [test.id() for test in runner._iterate_tests(suite)])
+        self.assertEqual(len(test_ids), 2 * 16)
+
+    def test_test_methods_are_not_generated(self):
+        collection.collect(['tcm_collected.test_first'])
+
+        cls = sys.modules['tcm_collected.test_first'].SampleTestCase
+        self.assertNotIn('test_value_01', vars(cls))
+        self.assertNotIn('test_lazy_a', vars(cls))
+        self.assertFalse(collection.collecting())
+
+    def test_test_methods_of_named_tests_are_not_generated(self):
+        test_ids = collection.collect(['tcm_collected.test_first.SampleTestCase.test_value_01'])
+
+        self.assertListEqual(test_ids, ['tcm_collected.test_first.SampleTestCase.test_value_01'])
+        cls = sys.modules['tcm_collected.test_first'].SampleTestCase
+        self.assertNotIn('test_value_01', vars(cls))
+
+    def test_named_tests_are_listed(self):
+        test_ids = collection.collect([
+            'tcm_collected.sub.test_second.PlainTestCase',
+            'tcm_collected.test_first.SampleTestCase.test_lazy_b',
+            'tcm_collected.test_first.SampleTestCase.test_value'])
+
+        self.assertListEqual(test_ids, [
+            'tcm_collected.sub.test_second.PlainTestCase.test',
+            'tcm_collected.test_first.SampleTestCase.test_lazy_b'])
+
+    def test_unknown_name_will_raise(self):
+        with self.assertRaises(collection.CollectionException) as cm:
+            collection.collect(['tcm_collected_unknown.Test'])
+
+        self.assertEqual(cm.exception.args[0], 'No module found for "tcm_collected_unknown.Test"')
+
+    def test_unmodified_modules_are_not_imported_again(self):
+        cache_path = os.path.join(self.tmpdir.name, 'collection.json')
+        names = ['tcm_collected.test_first', 'tcm_collected.sub.test_second']
+        test_ids = collection.collect(names, cache_path=cache_path)
+        self.forget_modules()
+
+        self.assertListEqual(collection.collect(names, cache_path=cache_path), test_ids)
+        self.assertNotIn('tcm_collected.test_first', sys.modules)
+
+        path = os.path.join(self.package, 'test_first.py')
+        self.write(path, SAMPLE_MODULE.replace('range(12)', 'range(3)'))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        self.assertEqual(len(collection.collect(names, cache_path=cache_path)), 16 + 7)
+        self.assertIn('tcm_collected.test_first', sys.modules)
+
+    def test_changed_selection_files_make_modules_imported_again(self):
+        cache_path = os.path.join(self.tmpdir.name, 'collection.json')
+        durations = os.path.join(self.tmpdir.name, 'durations.db')
+        names = ['tcm_collected.test_first']
+        with mock.patch.dict(os.environ, {'TCM_DURATIONS': durations}):
+            collection.collect(names, cache_path=cache_path)
+            self.forget_modules()
+            collection.collect(names, cache_path=cache_path)
+            self.assertNotIn('tcm_collected.test_first', sys.modules)
+
+            self.write(durations, '')
+            collection.collect(names, cache_path=cache_path)
+
+        self.assertIn('tcm_collected.test_first', sys.modules)
+
+    def test_top_level_directory_is_added_to_the_path(self):
+        sys.path.remove(self.tmpdir.name)
+
+        test_ids = collection.collect(
+            start_directory=self.package, top_level_directory=self.tmpdir.name)
+
+        self.assertEqual(sys.path[0], self.tmpdir.name)
+        self.assertEqual(len(test_ids), 2 * 16)
+
+    def test_foreign_cache_is_ignored(self):
+        cache_path = os.path.join(self.tmpdir.name, 'collection.json')
+        self.write(cache_path, '{"version": 0, "modules": {"tcm_collected.test_first": []}}')
+
+        test_ids = collection.collect(['tcm_collected.test_first'], cache_path=cache_path)
+
+        self.assertEqual(len(test_ids), 16)
+
+    def test_main_lists_the_test_ids(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = runner.main(['--collect-only', 'tcm_collected.sub.test_second.PlainTestCase'])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(stdout.getvalue(), 'tcm_collected.sub.test_second.PlainTestCase.test\n')
@@ -0,0 +1,95 @@
+import itertools
+import unittest
+
+import tcm
+
+
+class ProductTestCase(unittest.TestCase):
+    def test_combinations_are_named_by_value_indexes(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.product(x=['a', 'b'], y=range(10)))
+            def test(self, x, y):
+                return x, y
+
+        names = list(unittest.TestLoader().getTestCaseNames(GeneratedTestCase))
+
+        self.assertEqual(len(names), 20)
+        self.assertListEqual(names[:3], ['test_x1_y01', 'test_x1_y02', 'test_x1_y03'])
+        self.assertTupleEqual(GeneratedTestCase().test_x2_y10(), ('b', 9))
+
+    def test_combinations_are_ordered_like_itertools_product(self):
+        source = tcm.product(a='xyz', b_c=range(4), d=[None, True])
+        combinations = list(itertools.product('xyz', range(4), [None, True]))
+
+        self.assertEqual(len(source), len(combinations))
+        for index, (a, b_c, d) in enumerate(combinations):
+            self.assertDictEqual(source.argument_at(index), {'a': a, 'b_c': b_c, 'd': d})
+            self.assertEqual(source.index_of(source.name_at(index)), index)
+
+    def test_invalid_names_are_not_found(self):
+        source = tcm.product(a='xyz', b=range(12))
+
+        for name in ('a1', 'a1_b1', 'a0_b01', 'a4_b01', 'a1_b13', 'b01_a1', 'a1_b01_'):
+            with self.subTest(name=name):
+                with self.assertRaises(KeyError):
+                    source.index_of(name)
+
+    def test_missing_axes_will_raise(self):
+        with self.assertRaises(ValueError) as cm:
+            tcm.product()
+
+        self.assertEqual(cm.exception.args[0], 'At least one axis is required')
+
+
+class NwiseTestCase(unittest.TestCase):
+    def assert_covers(self, source, strength):
+        rows = [source.argument_at(index) for index in range(len(source))]
+        for axes in itertools.combinations(source.axes, strength):
+            expected = set(itertools.product(*(source.axes[axis] for axis in axes)))
+            self.assertSetEqual({tuple(row[axis] for axis in axes) for row in rows}, expected)
+
+    def test_pairwise_covers_every_pair(self):
+        source = tcm.pairwise(**{f'p{i}': range(4) for i in range(9)})
+
+        self.assert_covers(source, 2)
+        self.assertLess(len(source), 4 ** 9 // 1000)
+
+    def test_nwise_covers_every_tuple(self):
+        source = tcm.nwise(3, a=range(3), b='xy', c=range(3), d='uvw', e=[None])
+
+        self.assert_covers(source, 3)
+        self.assertLess(len(source), 3 * 2 * 3 * 3)
+
+    def test_covering_array_is_stable(self):
+        def names():
+            source = tcm.pairwise(a=range(3), b=range(3), c=range(3), d=range(3))
+            return [source.name_at(index) for index in range(len(source))]
+
+        self.assertListEqual(names(), names())
+        self.assertEqual(len(set(names())), len(names()))
+
+    def test_rows_are_found_by_name(self):
+        source = tcm.pairwise(a=range(3), b=range(3), c=range(3))
+
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(source)
+            def test(self, a, b, c):
+                return a, b, c
+
+        self.assertTupleEqual(GeneratedTestCase().test_a1_b1_c1(), (0, 0, 0))
+        self.assertEqual(
+            len(unittest.TestLoader().getTestCaseNames(GeneratedTestCase)), len(source))
+
+    def test_strength_beyond_axes_makes_product(self):
+        source = tcm.nwise(5, a=range(3), b=range(2))
+
+        self.assertEqual(len(source), 6)
+
+    def test_empty_axis_makes_no_rows(self):
+        self.assertEqual(len(tcm.pairwise(a=range(3), b=[])), 0)
+
+    def test_invalid_strength_will_raise(self):
+        with self.assertRaises(ValueError) as cm:
+            tcm.nwise(0, a=range(3))
+
+        self.assertEqual(cm.exception.args[0], 'The strength must be positive, got 0')
@@ -0,0 +1,156 @@
+import asyncio
+import unittest
+
+import tcm
+from tcm import cache
+from tcm import profiling
+
+
+@unittest.skipUnless(hasattr(tcm, 'AsyncTestCase'), 'requires IsolatedAsyncioTestCase')
+class AsyncTestCaseTestCase(unittest.TestCase):
+    def test_coroutine_test_methods_are_awaited(self):
+        seen = []
+
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.values(1, 2, kw=3)
+            async def test(self, value):
+                await asyncio.sleep(0)
+                seen.append(value)
+                self.assertLess(value, 3)
+
+            @tcm.values((1, 2), {'x': 3, 'y': 3})
+            async def test_unpacked(self, x, y):
+                seen.append((x, y))
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 5)
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.failures], ['test_kw'])
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.errors], [])
+        self.assertListEqual(sorted(seen, key=str), [(1, 2), (3, 3), 1, 2, 3])
+
+    def test_indexed_source_rows_are_awaited(self):
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.values(tcm.columns({'x': [1, 2], 'y': [1, 3]}))
+            async def test(self, x, y):
+                await asyncio.sleep(0)
+                self.assertEqual(x, y)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 2)
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.failures], ['test_2'])
+
+    def test_concurrent_family_runs_at_most_limit_at_a_time(self):
+        running = []
+        peaks = []
+
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.options(concurrency=3)
+            @tcm.values(*range(8))
+            async def test(self, value):
+                running.append(value)
+                peaks.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(value)
+                if value == 5:
+                    raise ValueError(value)
+                if value == 6:
+                    self.skipTest('six')
+                self.assertNotEqual(value, 7)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 8)
+        self.assertEqual(len(peaks), 8)
+        self.assertEqual(max(peaks), 3)
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.errors], ['test_6'])
+        self.assertIn('ValueError: 5', result.errors[0][1])
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.failures], ['test_8'])
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.skipped], ['test_7'])
+
+    def test_concurrent_family_runs_again_in_another_run(self):
+        calls = []
+
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.values(1, 2)
+            @tcm.options(concurrency=2)
+            async def test(self, value):
+                calls.append(value)
+
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(unittest.TestResult())
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertListEqual(sorted(calls), [1, 1, 2, 2])
+
+    def test_concurrent_family_runs_only_the_scheduled_test_methods(self):
+        calls = []
+
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.options(concurrency=4)
+            @tcm.values(*range(10))
+            async def test(self, value):
+                calls.append(value)
+
+        result = unittest.TestResult()
+        unittest.TestSuite([GeneratedTestCase('test_03'), GeneratedTestCase('test_06')]).run(result)
+
+        self.assertEqual(result.testsRun, 2)
+        self.assertTrue(result.wasSuccessful())
+        self.assertListEqual(sorted(calls), [2, 5])
+
+    def test_concurrent_family_is_instrumented(self):
+        profiler = profiling.enable()
+        self.addCleanup(profiling.disable)
+        cache.enable(':memory:')
+        self.addCleanup(cache.disable)
+
+        def make_class():
+            class GeneratedTestCase(tcm.AsyncTestCase):
+                @tcm.options(concurrency=2)
+                @tcm.values(1, 2)
+                async def test(self, value):
+                    self.assertEqual(value, 1)
+
+            return GeneratedTestCase
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class()).run(result)
+
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.failures], ['test_2'])
+        self.assertListEqual(
+            sorted(record.name for record in profiler.records), ['test_1', 'test_2'])
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(make_class()).run(result)
+
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.failures], ['test_2'])
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.skipped], ['test_1'])
+
+
+class ConcurrencyOptionTestCase(unittest.TestCase):
+    def test_concurrency_of_regular_function_will_raise(self):
+        with self.assertRaises(tcm.MetaclassException) as cm:
+            class GeneratedTestCase(tcm.TestCase):  # pylint: disable=unused-variable
+                @tcm.options(concurrency=2)
+                @tcm.values(1, 2)
+                def test(self, value):
+                    pass  # pragma: no cover
+
+        self.assertEqual(
+            cm.exception.args[0],
+            'The "concurrency" option of "test" requires a coroutine function')
+
+    def test_invalid_coroutine_test_arg_will_raise(self):
+        with self.assertRaises(tcm.MetaclassException) as cm:
+            class GeneratedTestCase(tcm.TestCase):  # pylint: disable=unused-variable
+                @tcm.values(1)
+                async def test(self, x, y):
+                    pass  # pragma: no cover
+
+        self.assertEqual(cm.exception.args[0], 'Invalid test arg: 1')
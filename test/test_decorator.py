@@ -2,6 +2,7 @@ import unittest
 
 import tcm
 from tcm.decorator import ATTR_NAME
+from tcm.decorator import OPTIONS_ATTR_NAME
 
 
 class DecoratorTestCase(unittest.TestCase):
@@ -45,7 +46,7 @@ class DecoratorTestCase(unittest.TestCase):
 
     def test_single_positional_callable_argument_will_raise(self):
         with self.assertRaises(tcm.DecoratorException) as cm:
-            @tcm.values(_dummy_callable)
+            @tcm.values(_dummy_callable)  # pragma: no cover
             def test():  # pylint: disable=unused-variable
                 pass  # pragma: no cover
 
@@ -141,6 +142,61 @@ class DecoratorTestCase(unittest.TestCase):
         self.assertEqual(cm.exception.args[0], 'The object already has the "tcm values" attribute')
 
 
+class OptionsTestCase(unittest.TestCase):
+    def test_options_are_stored(self):
+        @tcm.options(concurrency=4)
+        def test():
+            pass  # pragma: no cover
+
+        self.assertEqual(getattr(test, OPTIONS_ATTR_NAME).concurrency, 4)
+
+    def test_unknown_options_will_raise(self):
+        with self.assertRaises(tcm.DecoratorException) as cm:
+            tcm.options(concurrency=1, zeta=1, alpha=2)
+
+        self.assertEqual(cm.exception.args[0], 'Unknown option(s): alpha, zeta')
+
+    def test_invalid_concurrency_will_raise(self):
+        for concurrency in (0, -1, 1.5, True, '2'):
+            with self.subTest(concurrency=concurrency):
+                with self.assertRaises(tcm.DecoratorException) as cm:
+                    tcm.options(concurrency=concurrency)
+                self.assertEqual(
+                    cm.exception.args[0], 'The "concurrency" option must be a positive integer')
+
+    def test_invalid_timeouts_will_raise(self):
+        for name in ('timeout', 'budget'):
+            for seconds in (0, -0.5, True, '2'):
+                with self.subTest(name=name, seconds=seconds):
+                    with self.assertRaises(tcm.DecoratorException) as cm:
+                        tcm.options(**{name: seconds})
+                    self.assertEqual(
+                        cm.exception.args[0], f'The "{name}" option must be a positive number')
+        for case_timeouts in ([1], {'1': 0}):
+            with self.subTest(case_timeouts=case_timeouts):
+                with self.assertRaises(tcm.DecoratorException) as cm:
+                    tcm.options(case_timeouts=case_timeouts)
+                self.assertEqual(
+                    cm.exception.args[0],
+                    'The "case_timeouts" option must map the case names to positive numbers')
+
+    def test_multiple_options_decorators_will_raise(self):
+        with self.assertRaises(tcm.DecoratorException) as cm:
+            @tcm.options()
+            @tcm.options()
+            def test():  # pylint: disable=unused-variable
+                pass  # pragma: no cover
+
+        self.assertEqual(
+            cm.exception.args[0], 'The object already has the "tcm options" attribute')
+
+    def test_noncallable_object_will_raise(self):
+        with self.assertRaises(tcm.DecoratorException) as cm:
+            tcm.options()(None)
+
+        self.assertEqual(cm.exception.args[0], 'The object must be callable')
+
+
 def _zilch(_func):
     return None
 
@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import durations
+from tcm.shard import balanced_selection
+from tcm.shard import Shard
+from tcm.shard import SHARD_ENV_NAME
+
+
+class DurationsTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'durations.db')
+
+    def test_missing_database_is_empty(self):
+        self.assertDictEqual(durations.Durations(self.path).load(), {})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_durations_are_averaged_upon_update(self):
+        database = durations.Durations(self.path)
+        database.update([('C', 'test_1', 1.0), ('C', 'test_2', 2.0)])
+        database.update([('C', 'test_1', 3.0), ('D', 'test_1', 0.5)])
+
+        self.assertDictEqual(database.load(), {
+            ('C', 'test_1'): 2.0,
+            ('C', 'test_2'): 2.0,
+            ('D', 'test_1'): 0.5,
+        })
+
+    def test_concurrent_updates_are_safe(self):
+        processes = [
+            multiprocessing.Process(target=_update, args=(self.path, i)) for i in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual(len(durations.Durations(self.path).load()), 400)
+
+    def test_environment_database_is_loaded_once(self):
+        durations.Durations(self.path).update([('C', 'test_1', 1.0)])
+
+        with mock.patch.dict(os.environ, {durations.DURATIONS_ENV_NAME: self.path}):
+            loaded = durations.current_durations()
+            durations.Durations(self.path).update([('C', 'test_2', 1.0)])
+            self.assertIs(durations.current_durations(), loaded)
+        self.assertDictEqual(loaded, {('C', 'test_1'): 1.0})
+
+        with mock.patch.dict(os.environ, {durations.DURATIONS_ENV_NAME: ''}):
+            self.assertIsNone(durations.current_durations())
+
+
+class BalancedSelectionTestCase(unittest.TestCase):
+    def test_shards_are_balanced_by_durations(self):
+        names = [f'test_{i}' for i in range(1, 21)]
+        recorded = {('C', name): float(i) for i, name in enumerate(names[:-5], 1)}
+        shards = [balanced_selection(Shard(i, 3), 'C', 'test', names, recorded)
+                  for i in range(1, 4)]
+
+        self.assertSetEqual(set.union(*shards), set(names))
+        self.assertEqual(sum(map(len, shards)), len(names))
+        loads = [sum(recorded.get(('C', name), 0) for name in shard) for shard in shards]
+        self.assertLessEqual(max(loads) - min(loads), 15)
+        for name in names[-5:]:
+            self.assertEqual(
+                [name in shard for shard in shards],
+                [Shard(i, 3).selects('C', name) for i in range(1, 4)])
+
+    def test_metaclass_balances_the_shards_by_durations(self):
+        def make_class():
+            class GeneratedTestCase(tcm.TestCase, deferred=True):
+                @tcm.values(*range(8))
+                def test(self, value):
+                    pass  # pragma: no cover
+
+            return GeneratedTestCase
+
+        qualname = (f'{__name__}.{type(self).__qualname__}.{self._testMethodName}'
+                    '.<locals>.make_class.<locals>.GeneratedTestCase')
+        recorded = {(qualname, 'test_1'): 10.0}
+        recorded.update({(qualname, f'test_{i}'): 1.0 for i in range(2, 9)})
+        selections = []
+        for index in (1, 2):
+            with mock.patch.dict(os.environ, {SHARD_ENV_NAME: f'{index}/2'}), \
+                    mock.patch('tcm.metaclass.current_durations', return_value=recorded):
+                cls = make_class()
+            selections.append([name for name in dir(cls) if name.startswith('test_')])
+
+        self.assertIn(['test_1'], selections)
+        self.assertIn(['test_2', 'test_3', 'test_4', 'test_5', 'test_6', 'test_7', 'test_8'],
+                      selections)
+
+
+def _update(path, index):
+    durations.Durations(path).update(
+        [('C', f'test_{index}_{i}', 1.0) for i in range(100)])
@@ -0,0 +1,107 @@
+import os
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import failfast
+
+
+class FamilyBreakerTestCase(unittest.TestCase):
+    def test_rest_of_family_is_skipped_after_failures(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(fail_fast=2)
+            @tcm.values(*range(10))
+            def test(self, value):
+                if value == 0:
+                    self.skipTest('zero')
+                self.assertEqual(value, 2)
+
+            @tcm.values(*range(3))
+            def test_other(self, value):
+                self.assertEqual(value, -1)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 13)
+        self.assertEqual(len(result.failures), 2 + 3)
+        family = f'{__name__}.{GeneratedTestCase.__qualname__}.test'
+        self.assertListEqual(
+            [(test.id().split('.')[-1], reason) for test, reason in result.skipped],
+            [('test_01', 'zero')] + [
+                (f'test_{i:02}', f'2 test methods generated from "{family}" failed')
+                for i in range(5, 11)])
+
+    def test_errors_and_failed_subtests_count(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(fail_fast=2)
+            @tcm.values(1, 2, 3)
+            def test(self, value):
+                if value == 1:
+                    with self.subTest():
+                        self.fail()
+                else:
+                    raise RuntimeError(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(len(result.skipped), 1)
+
+    def test_environment_sets_limit_of_all_families(self):
+        with mock.patch.dict(os.environ, {failfast.FAIL_FAST_ENV_NAME: '1'}):
+            class GeneratedTestCase(tcm.TestCase):
+                @tcm.values(1, 2, 3)
+                def test(self, value):
+                    self.fail(value)
+
+                @tcm.options(fail_fast=2)
+                @tcm.values(1, 2, 3)
+                def test_own(self, value):
+                    self.fail(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.failures), 1 + 2)
+        self.assertEqual(len(result.skipped), 2 + 1)
+
+    def test_expected_failures_are_not_counted(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @unittest.expectedFailure
+            @tcm.options(fail_fast=1)
+            @tcm.values(1, 2)
+            def test(self, value):
+                self.fail(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.expectedFailures), 2)
+
+    def test_tripped_families_are_exchanged(self):
+        breaker = failfast.FamilyBreaker('module.Class.test_exchanged', 3)
+
+        failfast.record_failure('module.Class.test_exchanged')
+        failfast.record_failure('module.Class.test_unknown')
+        self.assertNotIn('module.Class.test_exchanged', failfast.tripped_families())
+
+        failfast.trip(['module.Class.test_exchanged', 'module.Class.test_unknown'])
+        self.assertIn('module.Class.test_exchanged', failfast.tripped_families())
+        self.assertEqual(breaker.failures, 3)
+
+    @unittest.skipUnless(hasattr(tcm, 'AsyncTestCase'), 'requires IsolatedAsyncioTestCase')
+    def test_coroutine_test_methods_are_guarded(self):
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.options(fail_fast=1)
+            @tcm.values(1, 2)
+            async def test(self, value):
+                self.fail(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertEqual(len(result.skipped), 1)
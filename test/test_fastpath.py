@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import sys
+import unittest
+
+import tcm
+from tcm.fastpath import bound_copy
+
+
+class BoundCopyTestCase(unittest.TestCase):
+    # pylint: disable=unused-argument,no-member
+    def test_arguments_are_bound_as_defaults(self):
+        def one(self, value):
+            """Docstring."""
+            return value
+
+        def two(self, x, y):
+            return x, y
+
+        def defaults(self, x, y=2, *, z=3):
+            return x, y, z
+
+        cases = (
+            (one, [1, 2], True, [1, 2]),
+            (two, (1, 2), False, (1, 2)),
+            (two, [1, 2], False, (1, 2)),
+            (two, {'y': 2, 'x': 1}, False, (1, 2)),
+            (defaults, (1,), False, (1, 2, 3)),
+            (defaults, {'x': 1, 'z': 4}, False, (1, 2, 4)),
+        )
+        for func, arg, as_is, expected in cases:
+            with self.subTest(func=func.__name__, arg=arg):
+                copy = bound_copy(func, arg, as_is)
+                self.assertEqual(copy(None), expected)
+                self.assertEqual(copy.__qualname__, func.__qualname__)
+                self.assertEqual(copy.__doc__, func.__doc__)
+                self.assertIs(copy.__code__, func.__code__)
+        self.assertTupleEqual(defaults.__defaults__, (2,))
+        self.assertDictEqual(defaults.__kwdefaults__, {'z': 3})
+
+    def test_mismatching_arguments_are_not_bound(self):
+        def two(self, x, y):
+            return None  # pragma: no cover
+
+        def keyword_only(self, x, *, y):
+            return None  # pragma: no cover
+
+        def variadic(self, x, **kwargs):
+            return None  # pragma: no cover
+
+        @functools.wraps(two)
+        def decorated(self, x, y):
+            return None  # pragma: no cover
+
+        cases = (
+            (two, (1,)), (two, (1, 2, 3)), (two, {'x': 1}), (two, {'x': 1, 'y': 2, 'z': 3}),
+            (two, 1), (variadic, (1,)), (keyword_only, (1,)),
+            (functools.partial(two, None), (1, 2)), (decorated, (1, 2)),
+        )
+        for func, arg in cases:
+            with self.subTest(arg=arg):
+                self.assertIsNone(bound_copy(func, arg, False))
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'requires positional-only parameters')
+    def test_positional_only_parameters_are_not_bound_by_keyword(self):
+        namespace = {}
+        exec('def positional_only(self, x, /): return x', namespace)  # pylint: disable=exec-used
+        func = namespace['positional_only']
+        self.assertIsNone(bound_copy(func, {'x': 1}, False))
+        self.assertEqual(bound_copy(func, (1,), False)(None), 1)
+
+    def test_closure_and_attributes_are_kept(self):
+        offset = 10
+
+        @unittest.expectedFailure
+        def closure(self, value):
+            return value + offset
+
+        copy = bound_copy(closure, 1, True)
+        self.assertEqual(copy(None), 11)
+        self.assertTrue(copy.__unittest_expecting_failure__)
+
+    def test_coroutine_functions_are_copied(self):
+        async def coroutine(self, x, y):
+            return x + y
+
+        copy = bound_copy(coroutine, (1, 2), False)
+        self.assertEqual(asyncio.run(copy(None)), 3)
+
+
+class FastTestCaseTestCase(unittest.TestCase):
+    def test_fast_test_methods_run_like_wrappers(self):
+        calls = []
+
+        class Sample(unittest.TestCase, metaclass=tcm.TestCaseMeta, fast=True):
+            @tcm.values((1, 2), (3, 4))
+            def test_args(self, x, y):
+                calls.append((x, y))
+
+            @tcm.values(1, [2], 3)
+            def test_as_is(self, value):
+                calls.append(value)
+
+            @tcm.values(ok=(5, 6), mismatch=(5,))
+            def test_mismatch(self, x, y):
+                calls.append((x, y))
+
+        self.assertIs(Sample.test_args_1.__code__, Sample.test_args_2.__code__)
+        self.assertEqual(Sample.test_as_is_2.__name__, 'test_as_is_2')
+        self.assertFalse(hasattr(Sample.test_args_1, '__wrapped__'))
+        self.assertTrue(hasattr(Sample.test_mismatch_mismatch, '__wrapped__'))
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(Sample).run(result)
+        self.assertEqual(result.testsRun, 7)
+        self.assertEqual(len(result.errors), 1)
+        self.assertListEqual(calls, [(1, 2), (3, 4), 1, [2], 3, (5, 6)])
@@ -0,0 +1,194 @@
+import os
+import struct
+import tempfile
+import unittest
+
+import tcm
+from tcm import cache
+
+
+class MappedFileTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    @staticmethod
+    def names(test_case_class):
+        return list(unittest.TestLoader().getTestCaseNames(test_case_class))
+
+    def test_mapped_file_without_parser_will_raise_upon_instantiation(self):
+        # pylint: disable=protected-access,abstract-class-instantiated
+        class IncompleteSource(tcm.files._MappedFile):  # pylint: disable=abstract-method
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteSource(self.write('rows.txt', b''))
+
+    def test_jsonl_rows_are_named_by_line_numbers(self):
+        lines = [b'{"x": %d, "y": %d}' % (i, i * i) for i in range(10)]
+        path = self.write('rows.jsonl', b'\n'.join(lines[:5]) + b'\r\n\n' + b'\n'.join(lines[5:]))
+        source = tcm.jsonl_file(path)
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(source)
+            def test(self, x, y):
+                return x, y
+
+        names = self.names(GeneratedTestCase)
+
+        self.assertListEqual(names[:6], [f'test_{i:02}' for i in (1, 2, 3, 4, 5, 7)])
+        self.assertEqual(names[-1], 'test_11')
+        self.assertTupleEqual(GeneratedTestCase().test_07(), (5, 25))
+        self.assertTupleEqual(GeneratedTestCase().test_11(), (9, 81))
+        self.assertEqual(source.index_of('07'), 5)
+        for name in ('6', '06', '7', '12', 'x'):
+            with self.subTest(name=name):
+                with self.assertRaises(KeyError):
+                    source.index_of(name)
+
+    def test_rows_are_read_when_test_methods_run(self):
+        path = self.write('rows.jsonl', b'{"x": 1}\n{"x": 2}\n')
+        source = tcm.jsonl_file(path)
+        parsed = []
+        parse = source._parse  # pylint: disable=protected-access
+
+        def _parse(data):
+            parsed.append(bytes(data))
+            return parse(data)
+
+        source._parse = _parse  # pylint: disable=protected-access
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(source)
+            def test(self, row):
+                return row['x']
+
+        self.assertListEqual(self.names(GeneratedTestCase), ['test_1', 'test_2'])
+        self.assertListEqual(parsed, [])
+        self.assertEqual(GeneratedTestCase().test_2(), 2)
+        self.assertListEqual(parsed, [b'{"x": 2}'])
+
+    def test_jsonl_rows_are_named_by_key(self):
+        path = self.write('rows.jsonl', b'{"id": "b", "v": 1}\n{"id": "a", "v": 2}\n')
+
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(tcm.jsonl_file(path, key='id'))
+            def test(self, row):
+                return row['v']
+
+        self.assertListEqual(self.names(GeneratedTestCase), ['test_a', 'test_b'])
+        self.assertEqual(GeneratedTestCase().test_a(), 2)
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_c'))
+
+    def test_duplicate_keys_will_raise(self):
+        path = self.write('rows.jsonl', b'{"id": 1}\n{"id": 1}\n')
+
+        with self.assertRaises(ValueError) as cm:
+            len(tcm.jsonl_file(path, key='id'))
+
+        self.assertEqual(cm.exception.args[0], f'Duplicate "id" keys in "{path}"')
+
+    def test_csv_rows_are_dicts_with_header(self):
+        path = self.write('rows.csv', b'name,value\n"a,b",1\r\nc,2\n')
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.csv_file(path))
+            def test(self, name, value):
+                return name, value
+
+            @tcm.values(tcm.csv_file(path, key='name'))
+            def test_keyed(self, row):
+                return row
+
+            @tcm.values(tcm.csv_file(path, key=1, header=False))
+            def test_plain(self, row):
+                return row
+
+        self.assertListEqual(self.names(GeneratedTestCase), [
+            'test_2', 'test_3', 'test_keyed_a,b', 'test_keyed_c',
+            'test_plain_1', 'test_plain_2', 'test_plain_value'])
+        self.assertTupleEqual(GeneratedTestCase().test_2(), ('a,b', '1'))
+        self.assertDictEqual(GeneratedTestCase().test_keyed_c(), {'name': 'c', 'value': '2'})
+        self.assertListEqual(GeneratedTestCase().test_plain_value(), ['name', 'value'])
+
+    def test_binary_records_are_unpacked(self):
+        layout = struct.Struct('<if')
+        data = b''.join(layout.pack(i, i / 2) for i in range(12))
+        path = self.write('rows.bin', b'HEAD' + data)
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.binary_file(path, '<if', offset=4))
+            def test(self, number, half):
+                return number, half
+
+            @tcm.values(tcm.binary_file(path, '<if', fields=('n', 'h'), key='n', offset=4))
+            def test_keyed(self, n, h):
+                return n, h
+
+        names = self.names(GeneratedTestCase)
+
+        self.assertListEqual(names[:2], ['test_01', 'test_02'])
+        self.assertIn('test_keyed_11', names)
+        self.assertEqual(len(names), 24)
+        self.assertTupleEqual(GeneratedTestCase().test_12(), (11, 5.5))
+        self.assertTupleEqual(GeneratedTestCase().test_keyed_3(), (3, 1.5))
+        self.assertEqual(tcm.binary_file(path, '<if', offset=4).index_of('03'), 2)
+        self.assertEqual(tcm.binary_file(path, '<if', key=0, offset=4).index_of('3'), 3)
+
+    def test_binary_file_of_partial_record_will_raise(self):
+        path = self.write('rows.bin', b'\0' * 7)
+
+        with self.assertRaises(ValueError) as cm:
+            len(tcm.binary_file(path, '<i'))
+
+        self.assertEqual(
+            cm.exception.args[0],
+            f'The size of "{path}" past the offset is not a multiple of 4 bytes')
+
+    def test_missing_file_is_reported_by_a_generated_test_method(self):
+        path = os.path.join(self.tmpdir, 'missing.jsonl')
+
+        for deferred in (False, True):
+            class GeneratedTestCase(tcm.TestCase, deferred=deferred):
+                @tcm.values(tcm.jsonl_file(path))
+                def test(self, row):
+                    return row  # pragma: no cover
+
+            self.assertFalse(hasattr(GeneratedTestCase, 'test_1'))
+            self.assertListEqual(self.names(GeneratedTestCase), ['test_source_error'])
+            with self.assertRaises(FileNotFoundError):
+                GeneratedTestCase().test_source_error()
+
+    def test_empty_files_have_no_rows(self):
+        path = self.write('empty', b'')
+
+        self.assertEqual(len(tcm.jsonl_file(path)), 0)
+        self.assertEqual(len(tcm.csv_file(path)), 0)
+        self.assertEqual(len(tcm.binary_file(path, '<i')), 0)
+
+    def test_cached_rows_are_skipped(self):
+        path = self.write('rows.jsonl', b'1\n2\n')
+        cache.enable(os.path.join(self.tmpdir, 'cache.db'))
+        self.addCleanup(cache.disable)
+
+        def run():
+            class GeneratedTestCase(tcm.TestCase):
+                @tcm.values(tcm.jsonl_file(path))
+                def test(self, value):
+                    self.assertEqual(value, 1)
+
+            result = unittest.TestResult()
+            unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+            return result
+
+        self.assertEqual(len(run().failures), 1)
+        result = run()
+        self.assertEqual(len(result.failures), 1)
+        self.assertEqual(len(result.skipped), 1)
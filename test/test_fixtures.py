@@ -0,0 +1,121 @@
+import unittest
+
+import tcm
+from tcm import fixtures
+
+
+class FamilyFixtureTestCase(unittest.TestCase):
+    def test_fixture_is_shared_by_family(self):
+        log = []
+
+        class GeneratedTestCase(tcm.TestCase):
+            @classmethod
+            def setUpFamily(cls, family):  # noqa: N802
+                log.append(('setUp', family))
+                cls.fixture = family.upper()
+
+            @classmethod
+            def tearDownFamily(cls, family):  # noqa: N802
+                log.append(('tearDown', family))
+                del cls.fixture
+
+            @classmethod
+            def tearDownClass(cls):
+                log.append(('tearDownClass', None))
+
+            @tcm.values(1, 2, 3)
+            def test_a(self, value):
+                log.append((self.fixture, value))
+
+            @tcm.values(1, 2)
+            def test_b(self, value):
+                log.append((self.fixture, value))
+
+            def test_c(self):
+                log.append(('plain', None))
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertListEqual(log, [
+            ('setUp', 'test_a'), ('TEST_A', 1), ('TEST_A', 2), ('TEST_A', 3),
+            ('tearDown', 'test_a'), ('setUp', 'test_b'), ('TEST_B', 1), ('TEST_B', 2),
+            ('plain', None), ('tearDownClass', None), ('tearDown', 'test_b'),
+        ])
+
+    def test_fixture_error_is_reported_for_every_test_of_family(self):
+        log = []
+
+        class GeneratedTestCase(tcm.TestCase):
+            @classmethod
+            def setUpFamily(cls, family):  # noqa: N802
+                log.append(family)
+                if family == 'test_a':
+                    raise RuntimeError('no fixture')
+
+            @classmethod
+            def tearDownFamily(cls, family):  # noqa: N802
+                log.append(f'~{family}')
+
+            @tcm.values(1, 2)
+            def test_a(self, value):
+                pass  # pragma: no cover
+
+            @tcm.values(1, 2)
+            def test_b(self, value):
+                pass
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 4)
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.errors], ['test_a_1', 'test_a_2'])
+        self.assertIn('RuntimeError: no fixture', result.errors[1][1])
+        self.assertListEqual(log, ['test_a', 'test_b', '~test_b'])
+
+    def test_skipped_tests_do_not_set_fixture_up(self):
+        log = []
+
+        class GeneratedTestCase(tcm.TestCase):
+            @classmethod
+            def setUpFamily(cls, family):  # noqa: N802
+                log.append(family)  # pragma: no cover
+
+            @unittest.skip('not now')
+            @tcm.values(1, 2)
+            def test(self, value):
+                pass  # pragma: no cover
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.skipped), 2)
+        self.assertListEqual(log, [])
+
+    def test_error_is_reported_to_default_result(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @classmethod
+            def setUpFamily(cls, family):  # noqa: N802
+                raise RuntimeError(family)
+
+            @tcm.values(1)
+            def test(self, value):
+                pass  # pragma: no cover
+
+        result = GeneratedTestCase('test_1').run()
+
+        self.assertEqual(len(result.errors), 1)
+
+    def test_leaving_no_family_does_nothing(self):
+        log = []
+
+        class GeneratedTestCase(tcm.TestCase):
+            @classmethod
+            def tearDownFamily(cls, family):  # noqa: N802
+                log.append(family)  # pragma: no cover
+
+        fixtures.leave_family(GeneratedTestCase)
+
+        self.assertListEqual(log, [])
@@ -0,0 +1,88 @@
+import functools
+import inspect
+import sys
+import unittest
+
+from tcm.introspection import has_single_test_param
+from tcm.introspection import starting_line_number
+
+
+def _decorated(func):
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        return func(*args, **kwargs)  # pragma: no cover
+
+    return _wrapper
+
+
+class IntrospectionTestCase(unittest.TestCase):
+    # pylint: disable=unused-argument
+    def test_single_test_param_agrees_with_signature(self):
+        def one(self, a):
+            pass  # pragma: no cover
+
+        def two(self, a, b):
+            pass  # pragma: no cover
+
+        def default(self, a=1):
+            pass  # pragma: no cover
+
+        def var_positional(self, *args):
+            pass  # pragma: no cover
+
+        def var_keyword(self, **kwargs):
+            pass  # pragma: no cover
+
+        def keyword_only(self, *, a):
+            pass  # pragma: no cover
+
+        cases = (
+            (one, True), (two, False), (default, True), (var_positional, False),
+            (var_keyword, False), (keyword_only, False),
+        )
+        for func, expected in cases:
+            with self.subTest(func=func.__name__):
+                self.assertIs(has_single_test_param(func), expected)
+                self.assertIs(has_single_test_param(_decorated(func)), expected)
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'requires positional-only parameters')
+    def test_positional_only_test_param_is_not_single(self):
+        namespace = {}
+        exec('def positional_only(self, a, /): pass', namespace)  # pylint: disable=exec-used
+        exec('def self_positional_only(self, /, a): pass', namespace)  # pylint: disable=exec-used
+        self.assertFalse(has_single_test_param(namespace['positional_only']))
+        self.assertTrue(has_single_test_param(namespace['self_positional_only']))
+
+    def test_signature_is_used_for_callables_without_code(self):
+        self.assertTrue(has_single_test_param(functools.partial(lambda x, self, a: None, 0)))
+
+    def test_single_test_param_is_memoized_per_code_object(self):
+        def make():
+            def sample(self, a):
+                pass  # pragma: no cover
+
+            return sample
+
+        first, second = make(), make()
+        self.assertIsNot(first, second)
+        self.assertIs(first.__code__, second.__code__)
+        self.assertTrue(has_single_test_param(first))
+        self.assertTrue(has_single_test_param(second))
+
+    def test_starting_line_number_agrees_with_getsourcelines(self):
+        def plain(self):
+            pass  # pragma: no cover
+
+        @_decorated
+        @_decorated
+        def decorated(self):
+            pass  # pragma: no cover
+
+        for func in (plain, decorated):
+            with self.subTest(func=func.__name__):
+                _, expected = inspect.getsourcelines(func)
+                self.assertEqual(starting_line_number(func), expected)
+
+    def test_starting_line_number_of_class(self):
+        _, expected = inspect.getsourcelines(IntrospectionTestCase)
+        self.assertEqual(starting_line_number(IntrospectionTestCase), expected)
@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import manifest
+
+
+def _make_class(limit, table=(1, 2, 3), deferred=False):
+    class GeneratedTestCase(tcm.TestCase, deferred=deferred):
+        @tcm.values(*table)
+        def test(self, value):
+            self.assertLess(value, limit)
+
+        @tcm.values(1, 2)
+        def test_subtests(self, value):
+            with self.subTest():
+                self.assertEqual(value, 1)
+
+        @tcm.values(tcm.lazy(lambda: [1, 2]))
+        def test_lazy(self, value):
+            self.assertLess(value, limit)
+
+        @tcm.values(tcm.columns({'value': [1, 2]}))
+        def test_indexed(self, row):
+            self.assertLess(row['value'], limit)
+
+        @unittest.expectedFailure
+        @tcm.values(1)
+        def test_expected(self, value):
+            self.assertEqual(value, 0)
+
+    return GeneratedTestCase
+
+
+class ManifestTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'manifest')
+        self.addCleanup(manifest.disable)
+
+    def run_class(self, *args, **kwargs):
+        selection = manifest.enable(self.path)
+        test_case_class = _make_class(*args, **kwargs)
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(test_case_class).run(result)
+        selection.dump()
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+        return sorted(test.id().split('.')[-1] for test in tests)
+
+    def run_made_class(self, make):
+        selection = manifest.enable(self.path)
+        tests = unittest.TestLoader().loadTestsFromTestCase(make())
+        names = [test.id().split('.')[-1] for test in tests]
+        tests.run(unittest.TestResult())
+        selection.dump()
+        return names
+
+    def test_passed_test_methods_are_not_generated_next_time(self):
+        self.assertListEqual(self.run_class(3), [
+            'test_1', 'test_2', 'test_3', 'test_expected_1', 'test_indexed_1', 'test_indexed_2',
+            'test_lazy_1', 'test_lazy_2', 'test_subtests_1', 'test_subtests_2'])
+        self.assertEqual(os.path.getsize(self.path), 8 + 16 * 7)
+
+        self.assertListEqual(self.run_class(3), ['test_3', 'test_expected_1', 'test_subtests_2'])
+        self.assertListEqual(self.run_class(3), ['test_3', 'test_expected_1', 'test_subtests_2'])
+
+    def test_changed_closure_or_argument_makes_test_method_run(self):
+        self.run_class(2)
+
+        # Only the sample method with no closure stays the same.
+        self.assertListEqual(self.run_class(3), [
+            'test_1', 'test_2', 'test_3', 'test_expected_1', 'test_indexed_1', 'test_indexed_2',
+            'test_lazy_1', 'test_lazy_2', 'test_subtests_2'])
+        self.assertListEqual(self.run_class(3, table=(1, 2, 0)),
+                             ['test_3', 'test_expected_1', 'test_subtests_2'])
+        self.assertListEqual(self.run_class(3, table=(1, 2, 0)),
+                             ['test_expected_1', 'test_subtests_2'])
+
+    def test_deferred_test_methods_are_selected(self):
+        self.run_class(3)
+
+        self.assertListEqual(self.run_class(3, deferred=True),
+                             ['test_3', 'test_expected_1', 'test_subtests_2'])
+        self.assertFalse(hasattr(_make_class(3, deferred=True), 'test_1'))
+
+    @unittest.skipUnless(hasattr(tcm, 'AsyncTestCase'), 'requires IsolatedAsyncioTestCase')
+    def test_coroutine_test_methods_are_selected(self):
+        def make():
+            class AsyncTestCase(tcm.AsyncTestCase):
+                @tcm.values(1, 2)
+                async def test(self, value):
+                    self.assertEqual(value, 1)
+
+            return AsyncTestCase
+
+        self.assertListEqual(self.run_made_class(make), ['test_1', 'test_2'])
+        self.assertListEqual(self.run_made_class(make), ['test_2'])
+
+    def test_same_named_classes_of_other_modules_are_selected(self):
+        def make(module):
+            class GeneratedTestCase(tcm.TestCase):
+                __module__ = module
+
+                @tcm.values(1, 2)
+                def test(self, value):
+                    self.assertTrue(value)
+
+            return GeneratedTestCase
+
+        self.assertListEqual(self.run_made_class(lambda: make('tcm_first')), ['test_1', 'test_2'])
+        self.assertListEqual(self.run_made_class(lambda: make('tcm_first')), [])
+        self.assertListEqual(self.run_made_class(lambda: make('tcm_second')), ['test_1', 'test_2'])
+
+    def test_test_methods_failing_to_tear_down_are_selected(self):
+        def make():
+            class GeneratedTestCase(tcm.TestCase):
+                def tearDown(self):
+                    raise RuntimeError('no teardown')
+
+                @tcm.values(1, 2)
+                def test(self, value):
+                    self.assertTrue(value)
+
+            return GeneratedTestCase
+
+        self.assertListEqual(self.run_made_class(make), ['test_1', 'test_2'])
+        self.assertListEqual(self.run_made_class(make), ['test_1', 'test_2'])
+
+    def test_foreign_file_selects_everything(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a manifest')
+
+        self.assertEqual(len(self.run_class(3)), 10)
+        self.assertEqual(len(self.run_class(3)), 3)
+
+    def test_manifest_is_enabled_by_the_environment(self):
+        with mock.patch.dict(os.environ, {manifest.MANIFEST_ENV_NAME: self.path}):
+            manifest._enable_from_environment()  # pylint: disable=protected-access
+
+        self.assertEqual(manifest.active_manifest().path, self.path)
+
+    def test_outcomes_from_other_processes_are_merged(self):
+        selection = manifest.Manifest(self.path)
+        selection.update({b'a' * 16, b'b' * 16}, set())
+        selection.update({b'c' * 16}, {b'b' * 16})
+        self.assertSetEqual(selection.passed, {b'a' * 16, b'c' * 16})
+        selection.dump()
+        self.assertTupleEqual(selection.flush(), ({b'a' * 16, b'c' * 16}, {b'b' * 16}))
+        self.assertSetEqual(selection.passed, set())
+
+        selection = manifest.Manifest(self.path)
+        self.assertFalse(selection.selects(b'a' * 16))
+        self.assertTrue(selection.selects(b'b' * 16))
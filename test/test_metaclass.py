@@ -1,8 +1,11 @@
 import inspect
 import unittest
+from unittest import mock
 
 import tcm
+from tcm import metaclass
 from tcm.decorator import ATTR_NAME
+from tcm.metaclass import SAMPLE_ATTR_NAME
 
 
 class MetaclassTestCase(unittest.TestCase):
@@ -60,6 +63,21 @@ class MetaclassTestCase(unittest.TestCase):
         self.assertEqual(gtc.test_many_01(), 0)
         self.assertEqual(gtc.test_many_10(), 9)
 
+    def test_generated_test_methods_know_the_name_of_their_sample_method(self):
+        for deferred, fast in ((False, False), (False, True), (True, False)):
+            class GeneratedTestCase(tcm.TestCase, deferred=deferred, fast=fast):
+                @tcm.values(1)
+                def test_a(self, value):
+                    pass  # pragma: no cover
+
+                @tcm.options(timeout=5)
+                @tcm.values(1)
+                def test_b(self, value):
+                    pass  # pragma: no cover
+
+            self.assertEqual(getattr(GeneratedTestCase.test_a_1, SAMPLE_ATTR_NAME), 'test_a')
+            self.assertEqual(getattr(GeneratedTestCase.test_b_1, SAMPLE_ATTR_NAME), 'test_b')
+
     def test_values_are_passed_as_is_for_single_arg_test_method(self):
         class GeneratedTestCase(tcm.TestCase):
             @tcm.values(
@@ -195,3 +213,149 @@ class MetaclassTestCase(unittest.TestCase):
 
         # Make sure _SpoiledTestCase does not exist.
         self.assertSetEqual(set(locals()), {'self', 'cm', '_source', 'base'})
+
+
+class DeferredMetaclassTestCase(unittest.TestCase):
+    # pylint: disable=no-member
+
+    def test_test_methods_are_not_generated_upon_class_creation(self):
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(*range(10), kw=-1)
+            def test(self, value):
+                """Dummy docstring."""
+                return value  # pragma: no cover
+
+        self.assertFalse(any(key.startswith('test_') for key in vars(GeneratedTestCase)))
+
+        names = unittest.TestLoader().getTestCaseNames(GeneratedTestCase)
+
+        self.assertListEqual(
+            list(names),
+            ['test_01', 'test_02', 'test_03', 'test_04', 'test_05',
+             'test_06', 'test_07', 'test_08', 'test_09', 'test_10', 'test_kw'])
+
+    def test_test_methods_are_generated_upon_lookup(self):
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(*range(10), kw=-1)
+            def test(self, value):
+                """Dummy docstring."""
+                return value
+
+        self.assertEqual(GeneratedTestCase.test_03.__name__, 'test_03')
+        self.assertEqual(GeneratedTestCase.test_03.__doc__, 'Dummy docstring.')
+        self.assertIn('test_03', vars(GeneratedTestCase))
+        self.assertNotIn('test_04', vars(GeneratedTestCase))
+
+        gtc = GeneratedTestCase()
+
+        self.assertEqual(gtc.test_04(), 3)
+        self.assertEqual(gtc.test_kw(), -1)
+        self.assertEqual(GeneratedTestCase('test_10').test_10(), 9)
+
+        self.assertFalse(hasattr(GeneratedTestCase, 'test'))
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_3'))
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_11'))
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_00'))
+        self.assertFalse(hasattr(gtc, 'test_xyz'))
+
+    def test_lazy_source_is_consumed_once(self):
+        consumed = []
+
+        def loader():
+            consumed.append(True)
+            return ['a', 'b', 'c']
+
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(tcm.lazy(loader))
+            def test(self, value):
+                return value
+
+        self.assertListEqual(consumed, [])
+        self.assertListEqual(
+            [name for name in dir(GeneratedTestCase) if name.startswith('test_')],
+            ['test_1', 'test_2', 'test_3'])
+        self.assertEqual(GeneratedTestCase().test_2(), 'b')
+        self.assertListEqual(consumed, [True])
+
+    def test_deferred_test_methods_are_inherited(self):
+        class BaseTestCase(tcm.TestCase, deferred=True):
+            @tcm.values('a', 'b')
+            def test(self, value):
+                return value
+
+        class DerivedTestCase(BaseTestCase):
+            pass
+
+        self.assertEqual(DerivedTestCase('test_2').test_2(), 'b')
+        self.assertIn('test_2', vars(BaseTestCase))
+
+    def test_suite_runs_the_deferred_test_methods(self):
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(1, 2, 3)
+            def test(self, value):
+                self.assertNotEqual(value, 2)
+
+        suite = unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase)
+        result = unittest.TestResult()
+        suite.run(result)
+
+        self.assertEqual(result.testsRun, 3)
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.failures], ['test_2'])
+
+    def test_duplicate_test_method_name_will_raise(self):
+        with self.assertRaises(tcm.MetaclassException) as cm:
+            class _SpoiledTestCase(tcm.TestCase, deferred=True):
+                @tcm.values('abc')
+                def test(self, value):
+                    pass  # pragma: no cover
+
+                def test_1(self):
+                    pass  # pragma: no cover
+
+        self.assertRegex(
+            cm.exception.args[0], r'^Duplicate "test_1" attribute at lines \d+ and \d+$')
+
+    def test_attributes_sharing_the_prefix_of_a_family_are_kept(self):
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(1, 2)
+            def test(self, value):
+                pass  # pragma: no cover
+
+            def test_other(self):
+                pass  # pragma: no cover
+
+        self.assertListEqual(
+            list(unittest.TestLoader().getTestCaseNames(GeneratedTestCase)),
+            ['test_1', 'test_2', 'test_other'])
+
+    def test_names_of_families_not_sharing_a_prefix_are_not_listed(self):
+        # pylint: disable=protected-access
+        with mock.patch.object(metaclass._Family, 'names') as names:
+            class GeneratedTestCase(tcm.TestCase, deferred=True):
+                @tcm.values(*range(100))
+                def test_a(self, value):
+                    pass  # pragma: no cover
+
+                @tcm.values(*range(100))
+                def test_b(self, value):
+                    pass  # pragma: no cover
+
+        names.assert_not_called()
+        self.assertTrue(hasattr(GeneratedTestCase, 'test_b_100'))
+
+    def test_duplicate_names_of_two_families_will_raise(self):
+        with self.assertRaises(tcm.MetaclassException) as cm:
+            class _SpoiledTestCase(tcm.TestCase, deferred=True):
+                @tcm.values(b_1=1)
+                def test_a(self, value):
+                    pass  # pragma: no cover
+
+                @tcm.values(2)
+                def test_a_b(self, value):
+                    pass  # pragma: no cover
+
+        _source, base = inspect.getsourcelines(
+            DeferredMetaclassTestCase.test_duplicate_names_of_two_families_will_raise)
+        self.assertEqual(
+            cm.exception.args[0],
+            f'Duplicate "test_a_b_1" attribute at lines {base + 3} and {base + 7}')
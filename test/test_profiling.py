@@ -0,0 +1,121 @@
+import atexit
+import csv
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import profiling
+
+
+class ProfilingTestCase(unittest.TestCase):
+    # pylint: disable=no-member
+
+    def setUp(self):
+        self.profiler = profiling.enable()
+        self.addCleanup(profiling.disable)
+
+    def make_class(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(1, 2, 3)
+            def test_list(self, size):
+                return [None] * (size * 10000)
+
+            @tcm.values(a=1)
+            def test_other(self, value):
+                return value
+
+        return GeneratedTestCase
+
+    def test_generated_test_methods_are_instrumented(self):
+        cls = self.make_class()
+
+        self.assertEqual(cls.test_list_2.__name__, 'test_list_2')
+        self.assertEqual(cls().test_other_a(), 1)
+        self.assertEqual(len(cls().test_list_3()), 30000)
+
+        self.assertListEqual(
+            [(record.family, record.name) for record in self.profiler.records],
+            [('ProfilingTestCase.make_class.<locals>.GeneratedTestCase.test_other', 'test_other_a'),
+             ('ProfilingTestCase.make_class.<locals>.GeneratedTestCase.test_list', 'test_list_3')])
+        record = self.profiler.records[1]
+        self.assertGreaterEqual(record.wall_time, 0)
+        self.assertGreaterEqual(record.cpu_time, 0)
+        self.assertIsNone(record.peak_memory)
+
+    def test_disabled_profiler_leaves_test_methods_intact(self):
+        profiling.disable()
+        cls = self.make_class()
+
+        self.assertEqual(cls.test_other_a.__wrapped__.__name__, 'test_other')
+        self.assertIsNone(profiling.active_profiler())
+        cls().test_other_a()
+        self.assertListEqual(self.profiler.records, [])
+
+    def test_peak_memory_is_recorded_if_asked_for(self):
+        tracing = tracemalloc.is_tracing()
+        profiling.enable(memory=True)
+        if not tracing:  # pragma: no branch
+            self.addCleanup(tracemalloc.stop)
+
+        self.make_class()().test_list_3()
+
+        self.assertGreater(self.profiler.records[0].peak_memory, 30000 * 8)
+
+    def test_profiler_is_enabled_by_the_environment(self):
+        profiling.disable()
+        tracing = tracemalloc.is_tracing()
+        env = {profiling.PROFILE_ENV_NAME: 'profile.json', profiling.PROFILE_MEMORY_ENV_NAME: '1'}
+        with mock.patch.dict(os.environ, env):
+            profiling._enable_from_environment()  # pylint: disable=protected-access
+        if not tracing:  # pragma: no branch
+            self.addCleanup(tracemalloc.stop)
+        profiler = profiling.active_profiler()
+        atexit.unregister(profiler.dump)
+
+        self.assertIsNot(profiler, self.profiler)
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_slowest_test_methods_are_reported_per_family(self):
+        self.profiler.records.extend([
+            profiling.Record('C.test_a', 'test_a_1', 0.1, 0.1, None),
+            profiling.Record('C.test_a', 'test_a_2', 0.3, 0.2, None),
+            profiling.Record('C.test_b', 'test_b_1', 0.2, 0.2, 100),
+            profiling.Record('C.test_a', 'test_a_3', 0.2, 0.2, None),
+        ])
+
+        slowest = self.profiler.slowest(2)
+
+        self.assertListEqual(list(slowest), ['C.test_a', 'C.test_b'])
+        self.assertListEqual([record.name for record in slowest['C.test_a']],
+                             ['test_a_2', 'test_a_3'])
+        self.assertEqual(
+            self.profiler.format_slowest(1),
+            'Slowest 1 cases per sample method (wall/CPU seconds, peak bytes):\n'
+            'C.test_a:\n'
+            '    0.300000 0.200000 - test_a_2\n'
+            'C.test_b:\n'
+            '    0.200000 0.200000 100 test_b_1\n')
+
+    def test_records_are_dumped_as_json_or_csv(self):
+        self.profiler.records.append(profiling.Record('C.test', 'test_1', 0.5, 0.25, None))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'profile.json')
+            self.profiler.dump(path)
+            with open(path, encoding='utf-8') as file:
+                self.assertListEqual(json.load(file), [{
+                    'family': 'C.test', 'name': 'test_1',
+                    'wall_time': 0.5, 'cpu_time': 0.25, 'peak_memory': None,
+                }])
+
+            path = os.path.join(tmpdir, 'profile.csv')
+            self.profiler.dump(path)
+            with open(path, encoding='utf-8', newline='') as file:
+                self.assertListEqual(list(csv.reader(file)), [
+                    ['family', 'name', 'wall_time', 'cpu_time', 'peak_memory'],
+                    ['C.test', 'test_1', '0.5', '0.25', ''],
+                ])
@@ -0,0 +1,172 @@
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+try:
+    import pytest
+    import tcm.pytest_plugin  # noqa: F401 / pylint: disable=unused-import
+except ImportError:  # pragma: no cover
+    pytest = None
+
+
+SAMPLE_MODULE = """
+import unittest
+
+import pytest
+
+import tcm
+
+
+class SampleTestCase(tcm.TestCase):
+    @classmethod
+    def setUpFamily(cls, family):
+        print('setUpFamily', family)
+
+    @tcm.values(*range(3))
+    def test_value(self, value):
+        self.assertNotEqual(value, 2)
+
+    @tcm.values(tcm.lazy(lambda: {'a': 1, 'b': 2}))
+    def test_lazy(self, value):
+        pass
+
+    def test_regular(self):
+        pass
+
+
+@pytest.mark.xdist_group('own')
+class GroupedTestCase(tcm.TestCase):
+    @tcm.values(1, 2)
+    def test(self, value):
+        pass
+
+
+class BrokenTestCase(tcm.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        raise RuntimeError('broken')
+
+    @tcm.values(1)
+    def test(self, value):
+        pass  # pragma: no cover
+
+
+class HiddenTestCase(tcm.TestCase):
+    __test__ = False
+
+    @tcm.values(1, 2)
+    def test(self, value):
+        pass  # pragma: no cover
+
+
+class PlainTestCase(unittest.TestCase):
+    def test(self):
+        pass
+"""
+
+
+class _Recorder():
+    def __init__(self):
+        self.groups = {}
+        self.outcomes = {}
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            marker = item.get_closest_marker('xdist_group')
+            self.groups[item.nodeid] = marker and (marker.kwargs.get('name') or marker.args[0])
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'call':
+            self.outcomes[report.nodeid] = report.outcome
+        elif report.failed:
+            self.outcomes[report.nodeid] = f'{report.when} {report.outcome}'
+
+
+@unittest.skipIf(pytest is None, 'requires pytest 8.2 or higher')
+class PytestPluginTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        with open(os.path.join(self.tmpdir.name, 'test_tcm_plugin_sample.py'), 'w',
+                  encoding='utf-8') as module:
+            module.write(textwrap.dedent(SAMPLE_MODULE))
+        self.addCleanup(sys.modules.pop, 'test_tcm_plugin_sample', None)
+
+    def run_pytest(self, *args, plugin=('-p', 'tcm.pytest_plugin')):
+        recorder = _Recorder()
+        with mock.patch.dict(os.environ, {'PYTEST_DISABLE_PLUGIN_AUTOLOAD': '1'}), \
+                mock.patch.object(sys, 'path', list(sys.path)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            status = pytest.main(
+                ['-p', 'no:cacheprovider', *plugin, '--rootdir', self.tmpdir.name, *args,
+                 self.tmpdir.name],
+                plugins=[recorder])
+        return status, recorder
+
+    def test_test_methods_keep_their_names_unless_the_plugin_is_enabled(self):
+        _, recorder = self.run_pytest('--collect-only', plugin=())
+
+        self.assertIn('test_tcm_plugin_sample.py::SampleTestCase::test_value_1', recorder.groups)
+        self.assertNotIn('test_tcm_plugin_sample.py::SampleTestCase::test_value[1]',
+                         recorder.groups)
+
+    def test_families_are_collected_as_parametrized_test_methods(self):
+        status, recorder = self.run_pytest()
+
+        self.assertEqual(status, pytest.ExitCode.TESTS_FAILED)
+        module = 'test_tcm_plugin_sample.py'
+        self.assertDictEqual(recorder.outcomes, {
+            f'{module}::SampleTestCase::test_lazy[a]': 'passed',
+            f'{module}::SampleTestCase::test_lazy[b]': 'passed',
+            f'{module}::SampleTestCase::test_regular': 'passed',
+            f'{module}::SampleTestCase::test_value[1]': 'passed',
+            f'{module}::SampleTestCase::test_value[2]': 'passed',
+            f'{module}::SampleTestCase::test_value[3]': 'failed',
+            f'{module}::GroupedTestCase::test[1]': 'passed',
+            f'{module}::GroupedTestCase::test[2]': 'passed',
+            f'{module}::BrokenTestCase::test[1]': 'setup failed',
+            f'{module}::PlainTestCase::test': 'passed',
+        })
+        self.assertListEqual(list(recorder.outcomes), list(recorder.groups))
+
+    def test_families_are_grouped_for_xdist(self):
+        _, recorder = self.run_pytest('--collect-only')
+
+        module = 'test_tcm_plugin_sample.py'
+        self.assertEqual(recorder.groups[f'{module}::SampleTestCase::test_value[2]'],
+                         f'{module}::SampleTestCase::test_value')
+        self.assertEqual(recorder.groups[f'{module}::SampleTestCase::test_lazy[a]'],
+                         f'{module}::SampleTestCase::test_lazy')
+        self.assertIsNone(recorder.groups[f'{module}::SampleTestCase::test_regular'])
+        self.assertEqual(recorder.groups[f'{module}::GroupedTestCase::test[1]'], 'own')
+
+    def test_families_are_selected_by_keyword(self):
+        _, recorder = self.run_pytest('-k', 'test_value and not 3')
+
+        self.assertListEqual(
+            [nodeid.split('::')[-1] for nodeid in recorder.outcomes],
+            ['test_value[1]', 'test_value[2]'])
+
+    def test_generated_test_methods_are_collected_by_family(self):
+        with mock.patch.object(sys, 'path', [self.tmpdir.name, *sys.path]):
+            module = importlib.import_module('test_tcm_plugin_sample')
+        self.assertIn('test_value_1', vars(module.SampleTestCase))
+
+        _, recorder = self.run_pytest()
+
+        self.assertEqual(len(recorder.outcomes), 10)
+        self.assertEqual(
+            recorder.groups['test_tcm_plugin_sample.py::SampleTestCase::test_value[1]'],
+            'test_tcm_plugin_sample.py::SampleTestCase::test_value')
+
+    def test_test_methods_are_generated_when_they_run(self):
+        self.run_pytest('--collect-only')
+
+        cls = sys.modules['test_tcm_plugin_sample'].SampleTestCase
+        self.assertNotIn('test_value_1', vars(cls))
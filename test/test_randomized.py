@@ -0,0 +1,122 @@
+import os
+import unittest
+from unittest import mock
+
+import tcm
+from tcm.randomized import _shrink_candidates
+
+
+def _integers(rng):
+    return rng.randint(-1000, 1000)
+
+
+def _lists(rng):
+    return [rng.randint(0, 1000) for _ in range(rng.randint(0, 8))]
+
+
+class RandomizedSourceTestCase(unittest.TestCase):
+    def test_arguments_are_named_and_drawn_by_seed_and_index(self):
+        source = tcm.randomized(_integers, 12, seed=7)
+
+        names = [name for name, _ in source.named_arguments()]
+        self.assertEqual(names[0], 'seed7_01')
+        self.assertEqual(names[-1], 'seed7_12')
+        self.assertEqual(source.index_of('seed7_03'), 2)
+        self.assertEqual(source.argument_at(2), tcm.randomized(_integers, 3, seed=7).argument_at(2))
+        self.assertNotEqual([source.argument_at(i) for i in range(12)],
+                            [tcm.randomized(_integers, 12, seed=8).argument_at(i)
+                             for i in range(12)])
+        for name in ('seed8_03', 'seed7_3', 'seed7_13', 'seed7_00', '03'):
+            with self.subTest(name=name):
+                with self.assertRaises(KeyError):
+                    source.index_of(name)
+
+    def test_seed_defaults_to_environment_variable(self):
+        with mock.patch.dict(os.environ, {'TCM_SEED': '42'}):
+            self.assertEqual(tcm.randomized(_integers, 1).seed, 42)
+        with mock.patch.dict(os.environ, {'TCM_SEED': ''}):
+            self.assertEqual(tcm.randomized(_integers, 1).seed, 0)
+
+    def test_single_case_is_drawn_alone_by_name(self):
+        strategy = mock.Mock(side_effect=_integers)
+
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(tcm.randomized(strategy, 1000, seed=5))
+            def test(self, value):
+                self.assertIsInstance(value, int)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromName('test_seed5_0777', GeneratedTestCase).run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(result.testsRun, 1)
+        self.assertEqual(strategy.call_count, 1)
+
+    def test_failing_argument_is_shrunk(self):
+        custom = tcm.randomized(_integers, 5, shrink=lambda value: [value + 1], max_shrinks=3)
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.randomized(_lists, 20, seed=3, shrink=True))
+            def test_sum(self, values):
+                self.assertLess(sum(values), 500)
+
+            @tcm.values(custom)
+            def test_custom(self, value):
+                self.assertLess(value, -2000)
+
+            @tcm.values(tcm.randomized(_integers, 5, shrink=True))
+            def test_skipped(self, value):
+                if not value:
+                    self.skipTest('zero')
+                self.fail(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        shrunk = [test.params['shrunk'] for test, _ in result.failures if hasattr(test, 'params')]
+        self.assertIn([500], shrunk)
+        self.assertTrue(all(sum(values) >= 500 for values in shrunk if isinstance(values, list)))
+        self.assertIn(custom.argument_at(0) + 3, shrunk)
+        self.assertNotIn('During handling', ''.join(text for _, text in result.failures))
+        self.assertEqual(sum(test.params.get('shrunk') in (-1, 1) for test, _ in result.failures
+                             if hasattr(test, 'params')), 5)
+        self.assertListEqual(result.skipped, [])
+
+    def test_skipped_or_unshrinkable_arguments_are_reported_as_is(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.randomized(_integers, 2, shrink=True))
+            def test_skipped(self, value):
+                self.skipTest(value)
+
+            @tcm.values(tcm.randomized(_integers, 2, shrink=lambda value: []))
+            def test_unshrinkable(self, value):
+                self.fail(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.skipped), 2)
+        self.assertListEqual(
+            [test.id().split('.')[-1] for test, _ in result.failures],
+            ['test_unshrinkable_seed0_1', 'test_unshrinkable_seed0_2'])
+
+    def test_shrinking_stops_after_max_runs(self):
+        fails = mock.Mock(return_value=False)
+        source = tcm.randomized(_integers, 1, shrink=lambda value: range(10), max_shrinks=4)
+
+        self.assertEqual(source.minimize(5, fails), 5)
+        self.assertEqual(fails.call_count, 4)
+
+    def test_shrink_candidates_are_simpler(self):
+        cases = (
+            (True, [False]), (False, []), (0, []),
+            (13, [0, 7, 10, 12]), (-5, [0, -3, -4]),
+            (2.5, [0.0, 2.0, 1.25]), (4.0, [0.0, 2.0]), (float('inf'), [0.0]), (0.0, []),
+            ('abc', ['', 'a', 'bc', 'ac', 'ab']), ((), []),
+            ([2], [[], [0], [1]]),
+            ({'a': 2, 'b': 'x'}, [{'a': 0, 'b': 'x'}, {'a': 1, 'b': 'x'}, {'a': 2, 'b': ''}]),
+            (None, []),
+        )
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertListEqual(list(_shrink_candidates(value)), expected)
@@ -0,0 +1,166 @@
+import functools
+import io
+import json
+import unittest
+from xml.etree import ElementTree
+
+import tcm
+from tcm.reporting import _TopCounter
+from tcm.reporting import StreamingResult
+
+
+CLASS_NAME = '_make_class.<locals>.SampleTestCase'
+
+
+def _make_class():
+    class SampleTestCase(tcm.TestCase):
+        @tcm.values(*range(6))
+        def test_value(self, value):
+            self.assertLess(value, 2, 'too large')
+
+        @tcm.values(1, 2)
+        def test_error(self, value):
+            raise RuntimeError('boom')
+
+        @tcm.values(1, 2)
+        def test_subtests(self, value):
+            with self.subTest(value=value):
+                self.assertEqual(value, 1)
+
+        @unittest.skip('not now')
+        def test_skipped(self):
+            pass  # pragma: no cover
+
+        @unittest.expectedFailure
+        def test_expected_failure(self):
+            self.fail()
+
+        @unittest.expectedFailure
+        def test_unexpected_success(self):
+            pass
+
+    return SampleTestCase
+
+
+def _run(junit=False, kept=100, verbosity=0):
+    output = io.StringIO()
+    stream = io.StringIO()
+    runner = unittest.TextTestRunner(
+        stream, verbosity=verbosity,
+        resultclass=functools.partial(StreamingResult, output=output, junit=junit, kept=kept))
+    result = runner.run(unittest.TestLoader().loadTestsFromTestCase(_make_class()))
+    return result, output.getvalue(), stream.getvalue()
+
+
+class StreamingResultTestCase(unittest.TestCase):
+    def test_outcomes_are_streamed_as_json_lines(self):
+        result, output, _ = _run()
+
+        records = [json.loads(line) for line in output.splitlines()]
+        summary = records.pop()['summary']
+        self.assertEqual(len(records), 13)
+        self.assertEqual(result.testsRun, 13)
+        self.assertDictEqual(
+            {record['test'].split('.')[-1]: record['outcome'] for record in records
+             if record['test'].endswith(('value_1', 'value_3', 'skipped', 'failure', 'success'))},
+            {'test_value_1': 'success', 'test_value_3': 'failure', 'test_skipped': 'skipped',
+             'test_expected_failure': 'expected failure',
+             'test_unexpected_success': 'unexpected success'})
+        self.assertDictEqual(summary['families'][f'{CLASS_NAME}.test_value'],
+                             {'success': 2, 'failure': 4})
+        self.assertDictEqual(summary['families'][f'{CLASS_NAME}.test_subtests'],
+                             {'success': 1, 'failure': 1})
+        self.assertEqual(summary['signatures'][0][1], 4)
+        self.assertRegex(summary['signatures'][0][0],
+                         r'^AssertionError \(File ".*", line \d+, in test_value\)$')
+
+    def test_identical_tracebacks_are_written_once_per_family(self):
+        _, output, _ = _run()
+
+        errors = [json.loads(line) for line in output.splitlines()
+                  if '"error"' in line and 'summary' not in line]
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0]['digest'], errors[1]['digest'])
+        self.assertIn('RuntimeError: boom', errors[0]['traceback'])
+        self.assertNotIn('traceback', errors[1])
+
+    def test_outcomes_are_streamed_as_junit_xml(self):
+        _, output, _ = _run(junit=True)
+
+        suite = ElementTree.fromstring(output).find('testsuite')
+        cases = {case.get('name'): case for case in suite.iter('testcase')}
+        self.assertEqual(len(cases), 13)
+        self.assertEqual(cases['test_value_3'].find('failure').get('message'),
+                         'AssertionError: 2 not less than 2 : too large')
+        self.assertIn('RuntimeError: boom', cases['test_error_1'].find('error').text)
+        self.assertIn('Same traceback as', cases['test_error_2'].find('error').text)
+        self.assertEqual(cases['test_skipped'].find('skipped').get('message'), 'not now')
+        self.assertIsNotNone(cases['test_subtests_2 (value=2)'].find('failure'))
+        self.assertEqual(cases['test_subtests_2 (value=2)'].get('classname'),
+                         f'{__name__}.{CLASS_NAME}')
+
+    def test_only_counts_and_first_outcomes_are_kept(self):
+        result, _, stream = _run(kept=1)
+
+        self.assertFalse(result.wasSuccessful())
+        self.assertEqual(len(result.failures), 5)
+        self.assertEqual(len(list(result.failures)), 1)
+        self.assertEqual(len(result.errors), 2)
+        self.assertIn('FAILED (failures=5, errors=2, skipped=1, expected failures=1,'
+                      ' unexpected successes=1)', stream)
+        self.assertIn(f'{CLASS_NAME}.test_value: 4 of 6 failed', stream)
+        self.assertIn('Top 3 failure signatures:', stream)
+        self.assertIn('5 errors and failures not shown', stream)
+
+    def test_no_output_keeps_the_summary(self):
+        result = StreamingResult(io.StringIO(), True, 0, top=1)
+        self.assertEqual(result.format_summary(), '')
+
+        result.startTestRun()
+        unittest.TestLoader().loadTestsFromTestCase(_make_class()).run(result)
+        result.stopTestRun()
+
+        self.assertEqual(len(result.summary()['signatures']), 1)
+        self.assertEqual(len(result.families), 3)
+
+    def test_subtest_errors_are_summarized_per_family(self):
+        class SampleTestCase(tcm.TestCase):
+            @tcm.values(1, 2)
+            def test_passing(self, value):
+                pass
+
+            @tcm.values(1)
+            def test_subtest_error(self, value):
+                with self.subTest():
+                    raise RuntimeError(value)
+
+        result = StreamingResult(io.StringIO(), True, 0)
+        unittest.TestLoader().loadTestsFromTestCase(SampleTestCase).run(result)
+
+        self.assertEqual(len(result.errors), 1)
+        summary = result.format_summary()
+        self.assertIn('SampleTestCase.test_subtest_error: 1 of 1 failed', summary)
+        self.assertNotIn('test_passing', summary)
+
+    def test_oldest_digests_are_forgotten(self):
+        class SampleTestCase(tcm.TestCase):
+            @tcm.values(*range(102))
+            def test(self, value):
+                self.fail(value % 101)
+
+        output = io.StringIO()
+        result = StreamingResult(io.StringIO(), True, 0, output=output, kept=1)
+        unittest.TestLoader().loadTestsFromTestCase(SampleTestCase).run(result)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(records[0]['digest'], records[101]['digest'])
+        self.assertIn('traceback', records[101])
+
+    def test_top_counter_keeps_the_frequent_keys(self):
+        counter = _TopCounter(2)
+        for key in 'aaabcaad':
+            counter.add(key)
+
+        self.assertListEqual(counter.most_common(1), [('a', 5)])
+        self.assertEqual(len(counter.counts), 2)
+        self.assertDictEqual(dict(counter.counts), {'a': 5, 'd': 3})
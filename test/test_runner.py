@@ -0,0 +1,510 @@
+import contextlib
+import importlib
+import io
+import json
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import textwrap
+import tracemalloc
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import cache
+from tcm import manifest
+from tcm import profiling
+from tcm import runner
+from tcm.durations import Durations
+
+
+SAMPLE_MODULE = """
+import contextlib
+import os
+import time
+import unittest
+from unittest import mock
+
+import tcm
+
+
+class SampleTestCase(tcm.TestCase):
+    @tcm.values(*range(20))
+    def test_value(self, value):
+        self.assertNotEqual(value, 13)
+
+    def test_error(self):
+        raise RuntimeError('boom')
+
+    @unittest.skip('not now')
+    def test_skipped(self):
+        pass
+
+    @unittest.expectedFailure
+    def test_expected_failure(self):
+        self.fail()
+
+    def test_subtests(self):
+        for i in range(3):
+            with self.subTest(i=i):
+                self.assertLess(i, 2)
+
+    def test_pid(self):
+        with open(os.environ['TCM_SAMPLE_PIDS'], 'a') as pids:
+            pids.write(f'{os.getpid()}\\n')
+
+
+class ShardedTestCase(tcm.TestCase):
+    @tcm.values(*range(16))
+    def test(self, value):
+        pass
+
+
+class CrashingTestCase(tcm.TestCase):
+    def test_1(self):
+        pass
+
+    def test_2(self):
+        os._exit(3)
+
+    def test_3(self):
+        pass
+
+
+if hasattr(tcm, 'AsyncTestCase'):
+    class ConcurrentTestCase(tcm.AsyncTestCase):
+        @tcm.options(concurrency=4)
+        @tcm.values(*range(12))
+        async def test(self, value):
+            with open(os.environ['TCM_SAMPLE_PIDS'], 'a') as log:
+                log.write(f'{value}\\n')
+
+
+class UnexpectedSuccessTestCase(tcm.TestCase):
+    @unittest.expectedFailure
+    def test(self):
+        pass
+
+
+class ExitingSetUpClassTestCase(tcm.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os._exit(4)
+
+    @tcm.values(1, 2, 3)
+    def test(self, value):
+        pass
+
+
+class FailFastTestCase(tcm.TestCase):
+    @tcm.options(fail_fast=2)
+    @tcm.values(*range(12))
+    def test(self, value):
+        self.fail(value)
+
+
+class StuckTestCase(tcm.TestCase):
+    @tcm.options(timeout=0.1)
+    @tcm.values(1, 2)
+    def test(self, value):
+        while value == 1:
+            with contextlib.suppress(tcm.TimeoutException):
+                time.sleep(10)
+
+
+class BudgetTestCase(tcm.TestCase):
+    @tcm.options(budget=0.15)
+    @tcm.values(*range(6))
+    def test(self, value):
+        time.sleep(0.1)
+
+
+class FamilyFixtureTestCase(tcm.TestCase):
+    @classmethod
+    def setUpFamily(cls, family):
+        with open(os.environ['TCM_SAMPLE_PIDS'], 'a') as log:
+            log.write(f'setUp {family}\\n')
+
+    @classmethod
+    def tearDownFamily(cls, family):
+        with open(os.environ['TCM_SAMPLE_PIDS'], 'a') as log:
+            log.write(f'tearDown {family}\\n')
+
+    @tcm.values(*range(10))
+    def test(self, value):
+        pass
+
+
+class BrokenSetUpClassTestCase(tcm.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        raise RuntimeError('no setup')
+
+    def test(self):
+        pass
+"""
+
+
+class ParallelSuiteTestCase(unittest.TestCase):  # pylint: disable=too-many-public-methods
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        path = os.path.join(self.tmpdir.name, 'tcm_sample_tests.py')
+        with open(path, 'w', encoding='utf-8') as module:
+            module.write(textwrap.dedent(SAMPLE_MODULE))
+        sys.path.insert(0, self.tmpdir.name)
+        self.addCleanup(sys.path.remove, self.tmpdir.name)
+        self.addCleanup(sys.modules.pop, 'tcm_sample_tests', None)
+        importlib.invalidate_caches()
+        os.environ['TCM_SAMPLE_PIDS'] = os.path.join(self.tmpdir.name, 'pids')
+        self.addCleanup(os.environ.pop, 'TCM_SAMPLE_PIDS')
+
+    def run_suite(self, names, **kwargs):
+        tests = unittest.TestLoader().loadTestsFromNames(names)
+        result = unittest.TestResult()
+        tcm.ParallelSuite(tests, **kwargs).run(result)
+        return result
+
+    def test_outcomes_are_merged_in_order(self):
+        result = self.run_suite(['tcm_sample_tests.SampleTestCase'], processes=3, chunksize=2)
+
+        self.assertEqual(result.testsRun, 25)
+        self.assertListEqual(
+            [test.id() for test, _ in result.failures],
+            ['tcm_sample_tests.SampleTestCase.test_subtests (i=2)',
+             'tcm_sample_tests.SampleTestCase.test_value_14'])
+        self.assertIn('AssertionError: 13 == 13', result.failures[1][1])
+        self.assertListEqual(
+            [test.id() for test, _ in result.errors],
+            ['tcm_sample_tests.SampleTestCase.test_error'])
+        self.assertIn('RuntimeError: boom', result.errors[0][1])
+        self.assertListEqual([reason for _, reason in result.skipped], ['not now'])
+        self.assertEqual(len(result.expectedFailures), 1)
+
+    def test_tests_run_in_worker_processes(self):
+        result = self.run_suite(
+            ['tcm_sample_tests.SampleTestCase.test_pid'] * 2, processes=2, chunksize=1)
+
+        self.assertTrue(result.wasSuccessful())
+        with open(os.environ['TCM_SAMPLE_PIDS'], encoding='utf-8') as pids:
+            self.assertNotIn(str(os.getpid()), pids.read().split())
+
+    def test_crashed_worker_is_replaced(self):
+        result = self.run_suite(['tcm_sample_tests.CrashingTestCase'], processes=1)
+
+        self.assertEqual(result.testsRun, 3)
+        self.assertListEqual(
+            [(test.id(), text) for test, text in result.errors],
+            [('tcm_sample_tests.CrashingTestCase.test_2',
+              'tcm.runner.RemoteError: \nWorker process exited unexpectedly (exit code 3)\n')])
+
+    def test_chunk_crashing_its_workers_before_any_test_is_given_up_on(self):
+        for names in (['tcm_sample_tests.ExitingSetUpClassTestCase'],
+                      ['tcm_sample_tests.ExitingSetUpClassTestCase',
+                       'tcm_sample_tests.ShardedTestCase.test_01']):
+            with self.subTest(names=names):
+                result = self.run_suite(names, processes=1, chunksize=3)
+
+                self.assertEqual(result.testsRun, len(names) + 2)
+                self.assertListEqual(
+                    [(test.id(), text) for test, text in result.errors],
+                    [(f'tcm_sample_tests.ExitingSetUpClassTestCase.test_{i}',
+                      'tcm.runner.RemoteError: \nWorker process exited unexpectedly'
+                      ' (exit code 4)\n')
+                     for i in range(1, 4)])
+
+    def test_unexpected_successes_are_reported(self):
+        result = self.run_suite(['tcm_sample_tests.UnexpectedSuccessTestCase'], processes=1)
+
+        self.assertEqual(result.testsRun, 1)
+        self.assertListEqual(
+            [test.id() for test in result.unexpectedSuccesses],
+            ['tcm_sample_tests.UnexpectedSuccessTestCase.test'])
+
+    def test_worker_stops_once_the_parent_process_is_gone(self):
+        conn = mock.Mock()
+        conn.recv.side_effect = EOFError
+
+        runner._worker(conn)  # pylint: disable=protected-access
+
+        conn.send.assert_not_called()
+        conn.close.assert_called_once_with()
+
+    @unittest.skipUnless(hasattr(tcm, 'AsyncTestCase'), 'requires IsolatedAsyncioTestCase')
+    def test_concurrent_families_run_only_the_tests_of_the_chunk(self):
+        result = self.run_suite(['tcm_sample_tests.ConcurrentTestCase'], processes=2, chunksize=3)
+
+        self.assertEqual(result.testsRun, 12)
+        self.assertTrue(result.wasSuccessful())
+        with open(os.environ['TCM_SAMPLE_PIDS'], encoding='utf-8') as log:
+            self.assertListEqual(sorted(map(int, log.read().split())), list(range(12)))
+
+    def test_tripped_families_are_skipped_in_all_workers(self):
+        result = self.run_suite(
+            ['tcm_sample_tests.FailFastTestCase'], processes=2, chunksize=3)
+
+        self.assertEqual(result.testsRun, 12)
+        self.assertEqual(len(result.failures), 4)
+        self.assertEqual(len(result.skipped), 8)
+        self.assertSetEqual(
+            {reason for _, reason in result.skipped},
+            {'2 test methods generated from "tcm_sample_tests.FailFastTestCase.test" failed'})
+
+    def test_stuck_worker_is_killed_after_the_timeout(self):
+        result = self.run_suite(['tcm_sample_tests.StuckTestCase'], processes=1)
+
+        self.assertEqual(result.testsRun, 2)
+        self.assertListEqual(
+            [(test.id(), text) for test, text in result.errors],
+            [('tcm_sample_tests.StuckTestCase.test_1',
+              'tcm.runner.RemoteError: \nWorker process killed after the timeout of 0.1'
+              ' seconds\n')])
+
+    def test_exhausted_budgets_are_skipped_in_all_workers(self):
+        result = self.run_suite(['tcm_sample_tests.BudgetTestCase'], processes=2, chunksize=1)
+
+        self.assertEqual(result.testsRun, 6)
+        self.assertGreaterEqual(len(result.skipped), 3)
+        self.assertSetEqual(
+            {reason for _, reason in result.skipped},
+            {'The time budget of 0.15 seconds of "tcm_sample_tests.BudgetTestCase.test"'
+             ' is exhausted'})
+
+    def test_family_fixture_is_set_up_once_per_chunk(self):
+        result = self.run_suite(
+            ['tcm_sample_tests.FamilyFixtureTestCase'], processes=2, chunksize=5)
+
+        self.assertTrue(result.wasSuccessful())
+        with open(os.environ['TCM_SAMPLE_PIDS'], encoding='utf-8') as log:
+            self.assertListEqual(sorted(log.read().splitlines()), [
+                'setUp test', 'setUp test', 'tearDown test', 'tearDown test'])
+
+    def test_class_fixture_errors_are_reported(self):
+        result = self.run_suite(['tcm_sample_tests.BrokenSetUpClassTestCase'], processes=1)
+
+        self.assertEqual(result.testsRun, 0)
+        self.assertEqual(
+            result.errors[0][0].id(),
+            'setUpClass (tcm_sample_tests.BrokenSetUpClassTestCase)')
+
+    def test_nonaddressable_tests_run_locally(self):
+        class LocalTestCase(unittest.TestCase):
+            def test(self):
+                self.assertEqual(os.getpid(), pid)
+
+        def plain_test(result):
+            result.testsRun += 1
+
+        pid = os.getpid()
+        tests = [LocalTestCase('test'), plain_test,
+                 *unittest.TestLoader().loadTestsFromNames(['tcm_sample_tests.Missing'])]
+        result = unittest.TestResult()
+        tcm.ParallelSuite(tests, processes=2).run(result)
+
+        self.assertEqual(result.testsRun, 3)
+        self.assertListEqual(result.failures, [])
+        self.assertListEqual(
+            [test.id() for test, _ in result.errors], ['unittest.loader._FailedTest.Missing'])
+
+    def test_main_runs_named_tests(self):
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(['-j', '2', 'tcm_sample_tests.SampleTestCase.test_value_01'])
+
+        self.assertEqual(status, 0)
+        self.assertIn('Ran 1 test', stream.getvalue())
+
+    def test_main_discovers_tests_and_stops_on_failure(self):
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(
+                ['-s', self.tmpdir.name, '-p', 'tcm_sample_*.py', '-j', '1', '-c', '1', '-f', '-v'])
+
+        self.assertEqual(status, 1)
+        self.assertIn('setUpClass (tcm_sample_tests.BrokenSetUpClassTestCase) ... ERROR',
+                      stream.getvalue())
+        self.assertNotIn('CrashingTestCase', stream.getvalue())
+
+    def test_main_passes_shard_to_the_test_modules(self):
+        self.addCleanup(os.environ.pop, 'TCM_SHARD', None)
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(['--shard', '1/4', '-j', '2', 'tcm_sample_tests.ShardedTestCase'])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(os.environ['TCM_SHARD'], '1/4')
+        self.assertRegex(stream.getvalue(), r'Ran [1-9] tests')
+
+    def test_main_passes_seed_to_the_test_modules(self):
+        self.addCleanup(os.environ.pop, 'TCM_SEED', None)
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(['--seed', '7', '-j', '2', 'tcm_sample_tests.ShardedTestCase'])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(os.environ['TCM_SEED'], '7')
+
+    def test_main_passes_fail_fast_family_to_the_test_modules(self):
+        self.addCleanup(os.environ.pop, 'TCM_FAIL_FAST', None)
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(
+                ['--fail-fast-family', '3', '-j', '2', 'tcm_sample_tests.ShardedTestCase'])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(os.environ['TCM_FAIL_FAST'], '3')
+
+    def test_main_skips_the_cached_passes(self):
+        self.addCleanup(cache.disable)
+        self.addCleanup(os.environ.pop, 'TCM_CACHE', None)
+        path = os.path.join(self.tmpdir.name, 'cache.db')
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            for _ in range(2):
+                sys.modules.pop('tcm_sample_tests', None)
+                status = runner.main(
+                    ['--cache', path, '-j', '2', 'tcm_sample_tests.ShardedTestCase'])
+                self.assertEqual(status, 0)
+
+        self.assertEqual(os.environ['TCM_CACHE'], path)
+        self.assertIn('OK (skipped=16)', stream.getvalue())
+
+    def test_main_collects_the_profile_from_worker_processes(self):
+        self.addCleanup(profiling.disable)
+        self.addCleanup(os.environ.pop, 'TCM_PROFILE', None)
+        path = os.path.join(self.tmpdir.name, 'profile.json')
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(['--profile', path, '-j', '2', 'tcm_sample_tests.ShardedTestCase'])
+
+        self.assertEqual(status, 0)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(len(json.load(file)), 16)
+        self.assertIn('Slowest 10 cases per sample method', stream.getvalue())
+        self.assertIn('\nShardedTestCase.test:\n', stream.getvalue())
+
+    def test_main_records_the_peak_memory_if_asked_for(self):
+        self.addCleanup(profiling.disable)
+        self.addCleanup(os.environ.pop, 'TCM_PROFILE', None)
+        self.addCleanup(os.environ.pop, 'TCM_PROFILE_MEMORY', None)
+        if not tracemalloc.is_tracing():  # pragma: no branch
+            self.addCleanup(tracemalloc.stop)
+        path = os.path.join(self.tmpdir.name, 'profile.json')
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(['--profile', path, '--profile-memory', '-j', '2',
+                                  'tcm_sample_tests.ShardedTestCase'])
+
+        self.assertEqual(status, 0)
+        with open(path, encoding='utf-8') as file:
+            self.assertTrue(all(record['peak_memory'] is not None for record in json.load(file)))
+
+    def test_main_selects_the_test_methods_by_the_manifest(self):
+        self.addCleanup(manifest.disable)
+        self.addCleanup(os.environ.pop, 'TCM_MANIFEST', None)
+        path = os.path.join(self.tmpdir.name, 'manifest')
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            for expected in ('Ran 25 tests', 'Ran 6 tests', 'Ran 6 tests'):
+                sys.modules.pop('tcm_sample_tests', None)
+                status = runner.main(
+                    ['--manifest', path, '-j', '2', 'tcm_sample_tests.SampleTestCase'])
+                self.assertEqual(status, 1)
+                self.assertIn(expected, stream.getvalue())
+                stream.seek(0)
+                stream.truncate()
+
+        self.assertEqual(os.path.getsize(path), 8 + 16 * 19)
+
+    def test_main_streams_the_report(self):
+        path = os.path.join(self.tmpdir.name, 'report.jsonl')
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            status = runner.main(['--report', path, '-j', '2', 'tcm_sample_tests.SampleTestCase'])
+
+        self.assertEqual(status, 1)
+        self.assertIn('Top 3 failure signatures:', stream.getvalue())
+        with open(path, encoding='utf-8') as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(len(records), 26)
+        self.assertDictEqual(records[-1]['summary']['families']['SampleTestCase.test_value'],
+                             {'success': 19, 'failure': 1})
+
+    def test_main_records_the_durations(self):
+        self.addCleanup(os.environ.pop, 'TCM_DURATIONS', None)
+        path = os.path.join(self.tmpdir.name, 'durations.db')
+        stream = io.StringIO()
+        with contextlib.redirect_stderr(stream):
+            for _ in range(2):
+                status = runner.main(
+                    ['--durations', path, '-j', '2', 'tcm_sample_tests.ShardedTestCase'])
+                self.assertEqual(status, 0)
+
+        recorded = Durations(path).load()
+        self.assertEqual(len(recorded), 16)
+        self.assertIn(('tcm_sample_tests.ShardedTestCase', 'test_01'), recorded)
+
+    def test_module_runs_main(self):
+        with mock.patch('tcm.runner.main', return_value=3), \
+                self.assertRaises(SystemExit) as cm:
+            runpy.run_module('tcm', run_name='__main__')
+
+        self.assertEqual(cm.exception.code, 3)
+
+    def test_longest_tests_are_dispatched_first_and_reported_in_order(self):
+        tests = unittest.TestLoader().loadTestsFromNames(['tcm_sample_tests.ShardedTestCase'])
+        name = 'tcm_sample_tests.ShardedTestCase'
+        recorded = {(name, f'test_{i:02}'): 0.1 for i in range(1, 16)}
+        recorded.update({(name, 'test_03'): 2.0, (name, 'test_16'): 1.0})
+        suite = tcm.ParallelSuite(tests, processes=2, chunksize=1, durations=recorded)
+        dispatched = []
+        run = runner._Pool.run  # pylint: disable=protected-access
+
+        def spy(pool, units):
+            dispatched.extend(unit[0] for unit in units)
+            return run(pool, units)
+
+        result = unittest.TestResult()
+        started = []
+        result.startTest = lambda test: started.append(test.id())
+        with mock.patch.object(runner._Pool, 'run', spy):  # pylint: disable=protected-access
+            suite.run(result)
+
+        self.assertListEqual(
+            dispatched[:2],
+            ['tcm_sample_tests.ShardedTestCase.test_03',
+             'tcm_sample_tests.ShardedTestCase.test_16'])
+        self.assertListEqual(
+            started, [f'tcm_sample_tests.ShardedTestCase.test_{i:02}' for i in range(1, 17)])
+
+    def test_longest_first_order_keeps_the_families_together(self):
+        tests = unittest.TestLoader().loadTestsFromNames(['tcm_sample_tests.SampleTestCase'])
+        # pylint: disable=protected-access
+        tests = {test.id(): test for test in runner._iterate_tests(tests)}
+        name = 'tcm_sample_tests.SampleTestCase'
+        recorded = {(name, 'test_value_01'): 5.0,
+                    (name, 'test_error'): 4.5,
+                    (name, 'test_value_02'): 1.0,
+                    ('other.SampleTestCase', 'test_error'): 9.0}
+
+        names = [test_id.split('.')[-1] for test_id in runner._longest_first(tests, recorded)]
+
+        self.assertEqual(names[0], 'test_value_01')
+        self.assertEqual(names[19], 'test_value_02')
+        self.assertTrue(all(name.startswith('test_value_') for name in names[:20]))
+        self.assertEqual(names[20], 'test_error')
+
+
+class LazyImportTestCase(unittest.TestCase):
+    def test_package_imports_the_optional_parts_upon_first_use(self):
+        code = ('import sys, tcm; print(sorted('
+                "{'asyncio', 'csv', 'mmap', 'multiprocessing', 'sqlite3', 'xml.sax'}"
+                ' & set(sys.modules)))')
+        process = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE,
+                                 check=True, universal_newlines=True)
+
+        self.assertEqual(process.stdout, '[]\n')
+        self.assertIs(tcm.ParallelSuite, runner.ParallelSuite)
+        self.assertFalse(hasattr(tcm, 'NoSuchThing'))
@@ -0,0 +1,69 @@
+import os
+import unittest
+from unittest import mock
+
+import tcm
+from tcm.shard import parse_shard
+from tcm.shard import Shard
+from tcm.shard import SHARD_ENV_NAME
+
+
+class ShardTestCase(unittest.TestCase):
+    def test_shard_is_parsed(self):
+        self.assertTupleEqual(parse_shard('3/16'), Shard(3, 16))
+        self.assertTupleEqual(parse_shard('1/1'), Shard(1, 1))
+
+    def test_invalid_shard_will_raise(self):
+        for text in ('', '3', '0/2', '3/2', '-1/2', '1/2/3', 'a/b'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError) as cm:
+                    parse_shard(text)
+                self.assertEqual(
+                    cm.exception.args[0],
+                    f'Invalid shard "{text}": expected INDEX/COUNT, 1 <= INDEX <= COUNT')
+
+    def test_shards_partition_the_generated_test_methods(self):
+        def make_class():
+            class GeneratedTestCase(tcm.TestCase):
+                @tcm.values(*range(100))
+                def test(self, value):
+                    pass  # pragma: no cover
+
+                def test_plain(self):
+                    pass  # pragma: no cover
+
+            return GeneratedTestCase
+
+        all_names = set(unittest.TestLoader().getTestCaseNames(make_class()))
+        shards = []
+        for index in range(1, 5):
+            with mock.patch.dict(os.environ, {SHARD_ENV_NAME: f'{index}/4'}):
+                names = set(unittest.TestLoader().getTestCaseNames(make_class()))
+            self.assertIn('test_plain', names)
+            shards.append(names - {'test_plain'})
+
+        self.assertSetEqual(set.union(*shards), all_names - {'test_plain'})
+        self.assertEqual(sum(map(len, shards)), 100)
+        for names in shards:
+            self.assertGreater(len(names), 10)
+
+    def test_deferred_test_methods_of_other_shards_are_not_found(self):
+        with mock.patch.dict(os.environ, {SHARD_ENV_NAME: '2/2'}):
+            class GeneratedTestCase(tcm.TestCase, deferred=True):
+                @tcm.values(*range(10))
+                def test(self, value):
+                    return value
+
+        names = [name for name in dir(GeneratedTestCase) if name.startswith('test_')]
+        others = sorted({f'test_{i:02}' for i in range(1, 11)} - set(names))
+
+        self.assertTrue(names)
+        self.assertTrue(others)
+        self.assertEqual(GeneratedTestCase(names[0]).run().testsRun, 1)
+        self.assertFalse(hasattr(GeneratedTestCase, others[0]))
+
+    def test_selection_is_stable(self):
+        shard = Shard(3, 16)
+
+        self.assertTrue(shard.selects('GeneratedTestCase', 'test_01'))
+        self.assertFalse(shard.selects('GeneratedTestCase', 'test_02'))
@@ -0,0 +1,222 @@
+import unittest
+
+import tcm
+from tcm.metaclass import PENDING_ATTR_NAME
+
+
+class LazySourceTestCase(unittest.TestCase):
+    # pylint: disable=no-member
+
+    def test_source_is_not_consumed_upon_class_creation(self):
+        consumed = []
+
+        def loader():
+            consumed.append(True)
+            return ['a', 'b']
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(loader))
+            def test(self, value):
+                return value
+
+        self.assertListEqual(consumed, [])
+        self.assertIn(PENDING_ATTR_NAME, vars(GeneratedTestCase))
+        self.assertNotIn('test_1', vars(GeneratedTestCase))
+
+        names = unittest.TestLoader().getTestCaseNames(GeneratedTestCase)
+
+        self.assertListEqual(consumed, [True])
+        self.assertListEqual(list(names), ['test_1', 'test_2'])
+        self.assertEqual(GeneratedTestCase().test_2(), 'b')
+
+    def test_generator_function_is_consumed_upon_attribute_lookup(self):
+        def generate():
+            yield from range(12)
+
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(generate))
+            def test(self, value):
+                return value
+
+        self.assertEqual(GeneratedTestCase.test_12.__name__, 'test_12')
+        self.assertEqual(GeneratedTestCase().test_12(), 11)
+        self.assertDictEqual(vars(GeneratedTestCase)[PENDING_ATTR_NAME], {})
+
+    def test_item_names_are_padded_like_positional_arguments(self):
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(tcm.lazy(range(10)))
+            def test(self, value):
+                return value
+
+        names = unittest.TestLoader().getTestCaseNames(GeneratedTestCase)
+
+        self.assertListEqual(list(names), [f'test_{i:02}' for i in range(1, 11)])
+        self.assertEqual(GeneratedTestCase().test_02(), 1)
+
+    def test_iterable_is_consumed_upon_instance_creation(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(iter([('a', 1), ('b', 2)])))
+            def test(self, x, y):
+                return x, y
+
+        gtc = GeneratedTestCase('test_2')
+
+        self.assertTupleEqual(gtc.test_2(), ('b', 2))
+
+    def test_mapping_keys_are_taken_as_names(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(lambda: {'first': 1, 'second': {'x': 2}}))
+            def test(self, x):
+                return x
+
+        self.assertEqual(GeneratedTestCase().test_first(), 1)
+        self.assertDictEqual(GeneratedTestCase().test_second(), {'x': 2})
+
+    def test_lookup_of_unrelated_attribute_leaves_source_pending(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(range(3)))
+            def test_value(self, value):
+                pass  # pragma: no cover
+
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_value'))
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_other_1'))
+        self.assertIn('test_value', vars(GeneratedTestCase)[PENDING_ATTR_NAME])
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_value_4'))
+        self.assertTrue(hasattr(GeneratedTestCase, 'test_value_3'))
+
+    def test_pending_test_methods_are_inherited(self):
+        class BaseTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(['a']))
+            def test(self, value):
+                return value
+
+        class DerivedTestCase(BaseTestCase):
+            pass
+
+        self.assertEqual(DerivedTestCase().test_1(), 'a')
+        self.assertIn('test_1', vars(BaseTestCase))
+
+    def test_duplicate_generated_name_will_raise_upon_expansion(self):
+        class SpoiledTestCase(tcm.TestCase):
+            @tcm.values(tcm.lazy(['abc']))
+            def test(self, value):
+                pass  # pragma: no cover
+
+            def test_1(self):
+                pass  # pragma: no cover
+
+        for _ in range(2):
+            with self.assertRaises(tcm.MetaclassException) as cm:
+                dir(SpoiledTestCase)
+
+            self.assertRegex(
+                cm.exception.args[0], r'^Duplicate "test_1" attribute at lines \d+ and \d+$')
+
+    def test_source_error_is_raised_by_a_generated_test_method(self):
+        def loader():
+            raise RuntimeError('no values')
+
+        for deferred in (False, True):
+            class GeneratedTestCase(tcm.TestCase, deferred=deferred):
+                @tcm.values(tcm.lazy(loader))
+                def test(self, value):
+                    pass  # pragma: no cover
+
+                def test_other(self):
+                    pass
+
+            self.assertFalse(hasattr(GeneratedTestCase, 'test_1'))
+            names = unittest.TestLoader().getTestCaseNames(GeneratedTestCase)
+            self.assertListEqual(list(names), ['test_other', 'test_source_error'])
+
+            result = unittest.TestResult()
+            unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+            self.assertEqual(result.testsRun, 2)
+            self.assertEqual(len(result.errors), 1)
+            self.assertIn('RuntimeError: no values', result.errors[0][1])
+
+    def test_source_mixed_with_other_arguments_will_raise(self):
+        with self.assertRaises(tcm.DecoratorException) as cm:
+            tcm.values(tcm.lazy([]), 1)
+
+        self.assertEqual(cm.exception.args[0], 'A value source must be the only argument')
+
+        with self.assertRaises(tcm.DecoratorException) as cm:
+            tcm.values(kw=tcm.lazy([]))
+
+        self.assertEqual(cm.exception.args[0], 'A value source must be the only argument')
+
+    def test_base_source_is_abstract(self):
+        with self.assertRaises(TypeError):
+            tcm.Source()  # pylint: disable=abstract-class-instantiated
+
+
+class ColumnsSourceTestCase(unittest.TestCase):
+    # pylint: disable=no-member
+
+    def test_rows_are_named_like_positional_arguments(self):
+        source = tcm.columns({'x': range(10), 'y': [i * i for i in range(10)]})
+
+        self.assertEqual(len(source), 10)
+        self.assertListEqual(
+            list(source.named_arguments())[:2],
+            [('01', {'x': 0, 'y': 0}), ('02', {'x': 1, 'y': 1})])
+        self.assertEqual(source.index_of('10'), 9)
+        for name in ('0', '1', '11', '+1', ' 1', 'x'):
+            with self.subTest(name=name):
+                with self.assertRaises(KeyError):
+                    source.index_of(name)
+
+    def test_columns_of_different_length_will_raise(self):
+        with self.assertRaises(ValueError) as cm:
+            tcm.columns({'x': [1, 2], 'y': [1], 'z': [1]})
+
+        self.assertEqual(cm.exception.args[0], 'The columns must be of equal length, got [1, 2]')
+
+    def test_rows_are_looked_up_without_a_table(self):
+        class Column(list):
+            lookups = 0
+
+            def __getitem__(self, index):
+                Column.lookups += 1
+                return super().__getitem__(index)
+
+        class GeneratedTestCase(tcm.TestCase, deferred=True):
+            @tcm.values(tcm.columns({'a': Column(range(100)), 'b': Column(range(100, 200))}))
+            def test(self, a, b):
+                return a + b
+
+        self.assertEqual(GeneratedTestCase().test_042(), 41 + 141)
+        self.assertEqual(Column.lookups, 2)
+        self.assertEqual(len(unittest.TestLoader().getTestCaseNames(GeneratedTestCase)), 100)
+        self.assertFalse(hasattr(GeneratedTestCase, 'test_42'))
+
+    def test_rows_are_generated_upon_first_use(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.columns({'value': ['a', 'b']}))
+            def test(self, value):
+                return value
+
+        self.assertNotIn('test_1', vars(GeneratedTestCase))
+        self.assertDictEqual(GeneratedTestCase().test_2(), {'value': 'b'})
+
+    def test_empty_columns_generate_nothing(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.values(tcm.columns({}))
+            def test(self, value):
+                pass  # pragma: no cover
+
+        self.assertListEqual(list(unittest.TestLoader().getTestCaseNames(GeneratedTestCase)), [])
+
+    def test_base_indexed_source_is_abstract(self):
+        with self.assertRaises(TypeError):
+            tcm.IndexedSource()  # pylint: disable=abstract-class-instantiated
+
+    def test_incomplete_indexed_source_will_raise_upon_instantiation(self):
+        class IncompleteSource(tcm.IndexedSource):  # pylint: disable=abstract-method
+            def __len__(self):
+                return 1  # pragma: no cover
+
+        with self.assertRaises(TypeError):
+            IncompleteSource()  # pylint: disable=abstract-class-instantiated
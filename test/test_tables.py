@@ -0,0 +1,209 @@
+from collections import OrderedDict
+import gc
+import pickle
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import tables
+
+
+def _make_class(*args, shared=False, **kwargs):
+    class GeneratedTestCase(tcm.TestCase, shared=shared):
+        @tcm.values(*args, **kwargs)
+        def test(self, value):
+            self.assertIsNotNone(value)  # pragma: no cover
+
+    return GeneratedTestCase
+
+
+def _table(last):
+    return [[i] for i in range(20)], {'last': last}
+
+
+def _owner(cls):
+    return f'{__name__}.{cls.__qualname__}'
+
+
+class InternTableTestCase(unittest.TestCase):
+    def setUp(self):
+        self.owners = {}
+
+    def owner(self, name):
+        return self.owners.setdefault(name, tables.TableOwner(name))
+
+    def test_tables_pickled_the_same_are_stored_once_by_content(self):
+        first = tables.intern_table(_table(1), self.owner('two tables'), by_content=True)
+        second = tables.intern_table(_table(1), self.owner('one table'), by_content=True)
+        third = tables.intern_table(_table(2), self.owner('two tables'), by_content=True)
+
+        self.assertIs(second, first)
+        self.assertIsNot(third, first)
+        self.assertEqual(tables.table_usage('two tables').tables, 2)
+        self.assertEqual(tables.table_usage('one table').cases, 21)
+
+    def test_tables_are_compared_by_content_only_if_both_opt_in(self):
+        first = tables.intern_table(_table(1), self.owner('first'))
+        second = tables.intern_table(_table(1), self.owner('second'), by_content=True)
+        third = tables.intern_table(_table(1), self.owner('third'))
+
+        self.assertIsNot(second, first)
+        self.assertIsNot(third, second)
+
+    def test_items_are_pickled_one_at_a_time(self):
+        table = _table(1)
+        with mock.patch('tcm.tables.pickle.dumps', wraps=pickle.dumps) as dumps:
+            tables.intern_table(table, self.owner('hashed'), by_content=True)
+
+        self.assertEqual(dumps.call_count, 21)
+        self.assertEqual(dumps.call_args_list[0][0][0], (None, [0]))
+
+    def test_small_tables_are_compared_by_identity(self):
+        first = tables.intern_table(([[1]], {}), self.owner('first'), by_content=True)
+        second = tables.intern_table(([[1]], {}), self.owner('second'), by_content=True)
+
+        self.assertIsNot(second, first)
+
+    def test_tables_holding_the_same_objects_are_stored_once(self):
+        items = [[1], [2]]
+        first = tables.intern_table((tuple(items), {}), self.owner('first'))
+        with mock.patch('tcm.tables._content_digest') as content_digest:
+            second = tables.intern_table((tuple(items), {}), self.owner('second'), True)
+
+        self.assertIs(second, first)
+        content_digest.assert_not_called()
+
+    def test_unpicklable_tables_are_compared_by_identity(self):
+        def func():
+            pass  # pragma: no cover
+
+        first = tables.intern_table(
+            ((func,) * 20, {'last': lambda: None}), self.owner('first'), by_content=True)
+        second = tables.intern_table(
+            ((func,) * 20, {'last': lambda: None}), self.owner('second'), by_content=True)
+
+        self.assertIsNot(second, first)
+
+    def test_mappings_differ_from_captured_arguments(self):
+        kwargs = {str(i): i for i in range(20)}
+        first = tables.intern_table(OrderedDict(kwargs), self.owner('mapping'), by_content=True)
+        second = tables.intern_table(
+            ((), dict(kwargs)), self.owner('captured arguments'), by_content=True)
+
+        self.assertIsNot(second, first)
+        self.assertEqual(tables.table_usage('mapping').cases, 20)
+
+    def test_identity_keys_are_of_fixed_size(self):
+        # pylint: disable=protected-access
+        small = tables._identity_key(([1], {}))
+        large = tables._identity_key((list(range(10000)), {'last': 1}))
+
+        self.assertEqual(len(large), len(small))
+        self.assertNotEqual(tables._identity_key(OrderedDict(last=1)),
+                            tables._identity_key(((), {'last': 1})))
+
+    def test_tables_are_released_along_with_their_owners(self):
+        gc.collect()
+        before = tables.total_usage().tables
+        first = self.owner('released first')
+        table = tables.intern_table(_table('released'), first, by_content=True)
+        tables.intern_table(_table('released'), self.owner('released second'), by_content=True)
+        del table, first, self.owners['released first']
+        gc.collect()
+
+        self.assertEqual(tables.total_usage().tables, before + 1)
+        self.assertNotIn('released first', tables.table_usage())
+
+        del self.owners['released second']
+        gc.collect()
+
+        self.assertEqual(tables.total_usage().tables, before)
+        other = tables.intern_table(_table('released'), self.owner('third'), by_content=True)
+        self.assertEqual(tables.table_usage('third').tables, 1)
+        self.assertEqual(other[1], {'last': 'released'})
+
+
+class TableUsageTestCase(unittest.TestCase):
+    def test_shared_classes_share_the_tables_pickled_the_same(self):
+        before = tables.total_usage()
+        args, kwargs = _table('class')
+        first = _make_class(*args, shared=True, **kwargs)
+        args, kwargs = _table('class')
+        second = _make_class(*args, shared=True, **kwargs)
+
+        self.assertEqual(tables.total_usage().tables, before.tables + 1)
+        self.assertEqual(tables.total_usage().cases, before.cases + 21)
+        usage = tables.table_usage(_owner(first))
+        self.assertEqual(usage.tables, 1)
+        self.assertEqual(usage.cases, 21)
+        self.assertGreater(usage.bytes, 0)
+        # pylint: disable=no-member
+        self.assertIs(first.test_01.__closure__[0].cell_contents,
+                      second.test_01.__closure__[0].cell_contents)
+
+    def test_classes_do_not_share_the_tables_by_default(self):
+        args, kwargs = _table('default')
+        first = _make_class(*args, **kwargs)
+        args, kwargs = _table('default')
+        second = _make_class(*args, **kwargs)
+
+        # pylint: disable=no-member
+        self.assertIsNot(first.test_01.__closure__[0].cell_contents,
+                         second.test_01.__closure__[0].cell_contents)
+
+    def test_tables_of_freed_classes_are_released(self):
+        gc.collect()
+        before = tables.total_usage().tables
+        cls = _make_class(*range(20))
+        self.assertEqual(tables.total_usage().tables, before + 1)
+
+        del cls
+        gc.collect()
+
+        self.assertEqual(tables.total_usage().tables, before)
+
+    def test_loaded_tables_are_shared(self):
+        def _load():
+            return {str(i): [i + 1] for i in range(20)}
+
+        class GeneratedTestCase(tcm.TestCase, deferred=True, shared=True):
+            @tcm.values(tcm.lazy(_load))
+            def test(self, value):
+                self.assertTrue(value)
+
+            @tcm.values(tcm.lazy(_load))
+            def test_again(self, value):
+                self.assertTrue(value)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        usage = tables.table_usage(_owner(GeneratedTestCase))
+        self.assertEqual(usage.tables, 1)
+        self.assertEqual(usage.cases, 20)
+
+    def test_unknown_owner_holds_nothing(self):
+        self.assertEqual(tables.table_usage('unknown'), tables.TableUsage(0, 0, 0))
+
+    def test_shared_objects_are_counted_once_per_owner(self):
+        item = list(range(1000))
+        shared = tables.TableOwner('shared objects')
+        single = tables.TableOwner('single object')
+        tables.intern_table(((item, item), {}), shared)
+        tables.intern_table(((item,), {}), shared)
+        tables.intern_table(((item,), {}), single)
+
+        usage = tables.table_usage('shared objects')
+        self.assertEqual(usage.cases, 3)
+        self.assertLess(usage.bytes, 2 * tables.table_usage('single object').bytes)
+
+    def test_instances_are_counted_along_with_their_attributes(self):
+        class Item():  # pylint: disable=too-few-public-methods
+            def __init__(self):
+                self.payload = list(range(1000))
+
+        owner = tables.TableOwner('instances')
+        tables.intern_table(((Item(),), {}), owner)
+
+        self.assertGreater(tables.table_usage('instances').bytes, 1000 * 8)
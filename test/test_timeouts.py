@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+import tcm
+from tcm import timeouts
+
+
+def _sleep(test, seconds=0):
+    time.sleep(seconds)
+    return test
+
+
+def _hang(test):
+    return _sleep(test, 10)
+
+
+class LimitTestCase(unittest.TestCase):
+    def test_slow_method_is_interrupted_by_the_alarm(self):
+        limited = timeouts.limit(_hang, 0.05)
+
+        started = time.perf_counter()
+        with self.assertRaises(tcm.TimeoutException) as cm:
+            limited(self)
+
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertEqual(cm.exception.args[0], '_hang timed out after 0.05 seconds')
+        self.assertEqual(getattr(limited, timeouts.TIMEOUT_ATTR_NAME), 0.05)
+
+    def test_fast_method_returns(self):
+        self.assertIs(timeouts.limit(_sleep, 5)(self), self)
+
+    def test_watchdog_thread_is_used_without_interval_timers(self):
+        with mock.patch.object(timeouts, 'signal', types.SimpleNamespace()):
+            self.assertIs(timeouts.limit(_sleep, 5)(self), self)
+            with self.assertRaises(tcm.TimeoutException):
+                timeouts.limit(_hang, 0.05)(self)
+
+    def test_watchdog_thread_is_used_outside_of_the_main_thread(self):
+        outcomes = []
+
+        def _target():
+            for method in (_hang, _sleep):
+                try:
+                    outcomes.append(timeouts.limit(method, 0.05)(1))
+                except tcm.TimeoutException as exc:
+                    outcomes.append(exc.args[0])
+            try:
+                timeouts.limit(lambda test: 1 / test, 5)(0)
+            except ZeroDivisionError as exc:
+                outcomes.append(type(exc))
+
+        thread = threading.Thread(target=_target)
+        thread.start()
+        thread.join()
+
+        self.assertListEqual(
+            outcomes, ['_hang timed out after 0.05 seconds', 1, ZeroDivisionError])
+
+    def test_case_timeouts_override_the_family_timeout(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(timeout=0.05, case_timeouts={'fast': 5})
+            @tcm.values(fast=0.1, slow=10)
+            def test(self, seconds):
+                time.sleep(seconds)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 2)
+        self.assertListEqual([test.id().split('.')[-1] for test, _ in result.errors],
+                             ['test_slow'])
+        self.assertIn('TimeoutException: test_slow timed out after 0.05 seconds',
+                      result.errors[0][1])
+        self.assertEqual(timeouts.timeout_of(GeneratedTestCase('test_fast')), 5)
+        self.assertIsNone(timeouts.timeout_of(self))
+
+    def test_case_timeouts_leave_the_other_cases_unlimited(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(case_timeouts={'1': 5})
+            @tcm.values(1, 2)
+            def test(self, value):
+                pass  # pragma: no cover
+
+        self.assertEqual(timeouts.timeout_of(GeneratedTestCase('test_1')), 5)
+        self.assertIsNone(timeouts.timeout_of(GeneratedTestCase('test_2')))
+
+    @unittest.skipUnless(hasattr(tcm, 'AsyncTestCase'), 'requires IsolatedAsyncioTestCase')
+    def test_coroutine_test_methods_are_cancelled(self):
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.options(timeout=0.05)
+            @tcm.values(0, 10)
+            async def test(self, seconds):
+                await asyncio.sleep(seconds)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn('TimeoutException: test_2 timed out', result.errors[0][1])
+
+
+class FamilyBudgetTestCase(unittest.TestCase):
+    def test_rest_of_family_is_skipped_once_the_budget_is_exhausted(self):
+        class GeneratedTestCase(tcm.TestCase):
+            @tcm.options(budget=0.1)
+            @tcm.values(*[0.06] * 5)
+            def test(self, seconds):
+                time.sleep(seconds)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(result.testsRun, 5)
+        family = f'{__name__}.{GeneratedTestCase.__qualname__}.test'
+        self.assertListEqual(
+            [(test.id().split('.')[-1], reason) for test, reason in result.skipped],
+            [(f'test_{i}', f'The time budget of 0.1 seconds of "{family}" is exhausted')
+             for i in range(3, 6)])
+
+    def test_spent_time_is_exchanged(self):
+        budget = timeouts.FamilyBudget('module.Class.test_exchanged', 3)
+        budget.spend(1)
+
+        self.assertEqual(timeouts.flush_spent()['module.Class.test_exchanged'], 1)
+        self.assertNotIn('module.Class.test_exchanged', timeouts.flush_spent())
+
+        timeouts.record_spent({'module.Class.test_exchanged': 1, 'module.Class.test_unknown': 5})
+        self.assertNotIn('module.Class.test_exchanged', timeouts.exhausted_families())
+        self.assertEqual(budget.spent, 2)
+
+        timeouts.exhaust(['module.Class.test_exchanged', 'module.Class.test_unknown'])
+        self.assertIn('module.Class.test_exchanged', timeouts.exhausted_families())
+        self.assertEqual(budget.spent, 3)
+
+    @unittest.skipUnless(hasattr(tcm, 'AsyncTestCase'), 'requires IsolatedAsyncioTestCase')
+    def test_coroutine_test_methods_are_budgeted(self):
+        class GeneratedTestCase(tcm.AsyncTestCase):
+            @tcm.options(budget=0.05)
+            @tcm.values(0.06, 0.06)
+            async def test(self, seconds):
+                await asyncio.sleep(seconds)
+
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(GeneratedTestCase).run(result)
+
+        self.assertEqual(len(result.skipped), 1)